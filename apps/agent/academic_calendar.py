@@ -0,0 +1,103 @@
+from datetime import date
+from typing import Optional, Tuple
+
+# 학년도 안에서의 학기 순서
+TERMS = ["1학기", "여름학기", "2학기", "겨울학기"]
+
+# 계절학기를 제외한 정규학기
+REGULAR_TERMS = ("1학기", "2학기")
+
+
+def normalize_term(text: str) -> Optional[str]:
+    """'2 학기', '2학기', '하계' 같은 표기를 TERMS 중 하나로 맞춥니다."""
+    compact = "".join(text.split())
+    if "여름" in compact or "하계" in compact:
+        return "여름학기"
+    if "겨울" in compact or "동계" in compact:
+        return "겨울학기"
+    if compact.startswith("1"):
+        return "1학기"
+    if compact.startswith("2"):
+        return "2학기"
+    return None
+
+
+def get_current_semester(today: Optional[date] = None) -> Tuple[int, str]:
+    """
+    오늘 날짜 기준 (학년도, 학기)
+    3~6월 1학기, 7~8월 여름학기, 9~12월 2학기, 1~2월은 전 학년도 겨울학기
+    """
+    today = today or date.today()
+    if today.month <= 2:
+        return today.year - 1, "겨울학기"
+    if today.month <= 6:
+        return today.year, "1학기"
+    if today.month <= 8:
+        return today.year, "여름학기"
+    return today.year, "2학기"
+
+
+def get_latest_regular_semester(today: Optional[date] = None) -> Tuple[int, str]:
+    """
+    오늘 날짜 기준 가장 최근 정규학기 (진행 중인 정규학기, 계절학기 기간이면 직전 정규학기)
+    "이번 학기"라고 하면 보통 계절학기가 아니라 이 학기를 뜻함
+    """
+    year, term = get_current_semester(today)
+    if term == "여름학기":
+        return year, "1학기"
+    if term == "겨울학기":
+        return year, "2학기"
+    return year, term
+
+
+def is_current_semester(year: int, term: str, today: Optional[date] = None) -> bool:
+    return (year, term) == get_current_semester(today)
+
+
+def semester_label(year: int, term: str) -> str:
+    return f"{year}학년도 {term}"
+
+
+def compare_semesters(a: Tuple[int, str], b: Tuple[int, str]) -> int:
+    """a가 b보다 이전 학기면 음수, 같으면 0, 이후면 양수"""
+    return (a[0] - b[0]) * len(TERMS) + TERMS.index(a[1]) - TERMS.index(b[1])
+
+
+def is_grade_release_period(today: Optional[date] = None) -> bool:
+    """성적이 올라오는 학기말 기간 (6/10~7/10, 12/10~1/10)"""
+    today = today or date.today()
+    return (
+        (today.month == 6 and today.day >= 10)
+        or (today.month == 7 and today.day <= 10)
+        or (today.month == 12 and today.day >= 10)
+        or (today.month == 1 and today.day <= 10)
+    )
+
+
+def get_grade_release_semester(today: Optional[date] = None) -> Optional[Tuple[int, str]]:
+    """
+    성적 공개 기간에 성적이 올라오는 정규학기 (기간이 아니면 None)
+    1/1~1/10에는 달력상 현재 학기가 겨울학기지만 성적은 전 학년도 2학기가 올라옴
+    """
+    today = today or date.today()
+    if not is_grade_release_period(today):
+        return None
+    if today.month in (6, 7):
+        return today.year, "1학기"
+    if today.month == 12:
+        return today.year, "2학기"
+    return today.year - 1, "2학기"
+
+
+def is_grade_pending_semester(year: int, term: str, today: Optional[date] = None) -> bool:
+    """성적이 아직 바뀔 수 있는 학기 (현재 학기 또는 성적 공개 중인 학기)"""
+    return is_current_semester(year, term, today) or (year, term) == get_grade_release_semester(today)
+
+
+def is_course_change_period(today: Optional[date] = None) -> bool:
+    """수강신청 정정으로 시간표가 바뀌는 개강 직후 기간 (2/15~3/21, 8/15~9/21)"""
+    today = today or date.today()
+    return (
+        (today.month in (2, 8) and today.day >= 15)
+        or (today.month in (3, 9) and today.day <= 21)
+    )
@@ -0,0 +1,190 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
+
+from apps.agent.academic_calendar import (
+    TERMS,
+    compare_semesters,
+    get_current_semester,
+    get_grade_release_semester,
+    is_course_change_period,
+    is_grade_release_period,
+)
+from apps.user_api.domain.academic_data.entity import AcademicData
+from apps.user_api.domain.academic_data.service import (
+    delete_academic_data,
+    get_academic_data,
+    get_academic_data_list,
+    save_academic_data,
+)
+from lib.database import get_db
+
+# 사용자별 학사 데이터 캐시 (DB, academic_data 테이블)
+# 채팅 도구와 스케줄러가 같은 계정의 데이터를 공유하고, 브라우저 워커 프로세스와 API 프로세스도 같은 값을 봅니다.
+DATA_GRADES = "GRADES"
+DATA_GRADE_STATUS = "GRADE_STATUS"
+DATA_TIMETABLE = "TIMETABLE"
+DATA_ACADEMIC_RECORD = "ACADEMIC_RECORD"
+DATA_SCHOLARSHIP = "SCHOLARSHIP"
+
+# 지난 학기 성적/시간표처럼 바뀌지 않는 데이터
+FINAL_TTL = timedelta(days=365)
+
+# 현재 학기 성적: 평소 30분, 성적이 올라오는 학기말에는 10분
+CURRENT_GRADES_TTL = timedelta(minutes=30)
+GRADE_RELEASE_GRADES_TTL = timedelta(minutes=10)
+
+# 현재/다음 학기 시간표: 평소 하루, 수강 정정 기간에는 1시간
+TIMETABLE_TTL = timedelta(days=1)
+COURSE_CHANGE_TIMETABLE_TTL = timedelta(hours=1)
+
+# 학적정보, 장학금 수혜 내역
+ACADEMIC_RECORD_TTL = timedelta(days=1)
+SCHOLARSHIP_TTL = timedelta(days=1)
+
+
+class CachedData:
+    def __init__(self, data: Any, semester: Optional[Tuple[int, str]], fetched_at: datetime, expires_at: datetime):
+        self.data = data
+        self.semester = semester
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+    @property
+    def expired(self) -> bool:
+        return datetime.now() >= self.expires_at
+
+    def as_of(self) -> str:
+        """응답에 붙이는 조회 시각 표시"""
+        return format_as_of(self.fetched_at)
+
+
+def format_as_of(fetched_at: datetime) -> str:
+    return f"(데이터 기준: {fetched_at:%Y-%m-%d %H:%M})"
+
+
+def get_account_key(usaint_id: str) -> str:
+    """학번이 그대로 남지 않도록 해시로 변환"""
+    return hashlib.sha256(usaint_id.encode()).hexdigest()[:16]
+
+
+def _semester_key(semester: Optional[Tuple[int, str]]) -> str:
+    return f"{semester[0]}-{semester[1]}" if semester else ""
+
+
+def _parse_semester_key(key: str) -> Optional[Tuple[int, str]]:
+    if not key:
+        return None
+    year, term = key.split("-", 1)
+    return int(year), term
+
+
+def get_ttl(data_type: str, semester: Optional[Tuple[int, str]] = None) -> timedelta:
+    """데이터 종류와 학사 일정에 따른 만료 시간"""
+    current = get_current_semester()
+    if data_type == DATA_GRADES:
+        # 성적 공개 중인 학기는 달력상 지난 학기여도 공개 기간이 끝날 때까지 짧은 TTL
+        if semester and semester == get_grade_release_semester():
+            return GRADE_RELEASE_GRADES_TTL
+        if semester and compare_semesters(semester, current) < 0:
+            return FINAL_TTL
+        return GRADE_RELEASE_GRADES_TTL if is_grade_release_period() else CURRENT_GRADES_TTL
+    if data_type == DATA_TIMETABLE:
+        if semester and compare_semesters(semester, current) < 0:
+            return FINAL_TTL
+        return COURSE_CHANGE_TIMETABLE_TTL if is_course_change_period() else TIMETABLE_TTL
+    if data_type == DATA_ACADEMIC_RECORD:
+        return ACADEMIC_RECORD_TTL
+    if data_type == DATA_SCHOLARSHIP:
+        return SCHOLARSHIP_TTL
+    return FINAL_TTL
+
+
+def _to_cached(entry: AcademicData) -> CachedData:
+    return CachedData(
+        json.loads(entry.payload), _parse_semester_key(entry.semester), entry.fetched_at, entry.expires_at
+    )
+
+
+def get_cached_data(
+    usaint_id: str,
+    data_type: str,
+    semester: Optional[Tuple[int, str]] = None,
+    allow_expired: bool = False,
+) -> Optional[CachedData]:
+    """캐시된 데이터를 반환합니다. 없거나 만료되었으면 None (allow_expired면 만료된 값도 반환)"""
+    db = next(get_db())
+    try:
+        entry = get_academic_data(db, get_account_key(usaint_id), data_type, _semester_key(semester))
+        if entry is None or (entry.is_expired(datetime.now()) and not allow_expired):
+            return None
+        return _to_cached(entry)
+    except Exception as e:
+        print(f"[AcademicDataCache] 캐시 조회 실패 ({data_type}): {e}")
+        return None
+    finally:
+        db.close()
+
+
+def get_cached_data_list(usaint_id: str, data_type: str) -> List[CachedData]:
+    """학기별로 저장된 데이터를 모두 반환합니다. (만료 여부와 무관, 오래된 학기 먼저)"""
+    db = next(get_db())
+    try:
+        entries = [_to_cached(entry) for entry in get_academic_data_list(db, get_account_key(usaint_id), data_type)]
+    except Exception as e:
+        print(f"[AcademicDataCache] 캐시 목록 조회 실패 ({data_type}): {e}")
+        return []
+    finally:
+        db.close()
+
+    return sorted(
+        entries,
+        key=lambda cached: (cached.semester[0], TERMS.index(cached.semester[1])) if cached.semester else (0, 0),
+    )
+
+
+def set_cached_data(
+    usaint_id: str,
+    data_type: str,
+    data: Any,
+    semester: Optional[Tuple[int, str]] = None,
+    ttl: Optional[timedelta] = None,
+    fetched_at: Optional[datetime] = None,
+) -> CachedData:
+    """데이터를 저장합니다. ttl이 없으면 get_ttl 정책을 사용"""
+    fetched_at = fetched_at or datetime.now()
+    expires_at = fetched_at + (ttl or get_ttl(data_type, semester))
+    cached = CachedData(data, semester, fetched_at, expires_at)
+
+    db = next(get_db())
+    try:
+        save_academic_data(
+            db,
+            get_account_key(usaint_id),
+            data_type,
+            _semester_key(semester),
+            json.dumps(data, ensure_ascii=False, default=str),
+            fetched_at,
+            expires_at,
+        )
+    except Exception as e:
+        # 캐시 저장 실패는 조회 결과에 영향을 주지 않음
+        print(f"[AcademicDataCache] 캐시 저장 실패 ({data_type}): {e}")
+    finally:
+        db.close()
+
+    return cached
+
+
+def invalidate_cached_data(usaint_id: str, data_type: str, semester: Optional[Tuple[int, str]] = None):
+    """semester가 없으면 해당 종류 전체를 삭제합니다."""
+    db = next(get_db())
+    try:
+        delete_academic_data(
+            db, get_account_key(usaint_id), data_type, _semester_key(semester) if semester else None
+        )
+    except Exception as e:
+        print(f"[AcademicDataCache] 캐시 삭제 실패 ({data_type}): {e}")
+    finally:
+        db.close()
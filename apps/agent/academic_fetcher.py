@@ -0,0 +1,237 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+from apps.agent.academic_calendar import get_latest_regular_semester, normalize_term, semester_label
+from apps.agent.academic_data_cache import (
+    DATA_ACADEMIC_RECORD,
+    DATA_SCHOLARSHIP,
+    DATA_TIMETABLE,
+    format_as_of,
+    get_cached_data,
+    set_cached_data,
+)
+from apps.agent.action_lock import PRIORITY_INTERACTIVE
+from apps.agent.semester_nav import move_to_semester, parse_semester, read_displayed_semester
+from apps.agent.session import Session, session_manager
+from apps.agent.table_extractor import ExtractedTable, extract_tables, format_table
+from apps.agent.usaint import _get_frame, _navigate_to
+
+TIMETABLE_MENU_TITLE = "개인수업시간표조회"
+ACADEMIC_RECORD_MENU_TITLE = "학적정보 조회 및 수정"
+SCHOLARSHIP_MENU_TITLE = "장학금수혜내역조회"
+
+# 시간표 표를 찾기 위한 요일 헤더
+WEEKDAYS = ["월", "화", "수", "목", "금", "토"]
+
+# 화면의 라벨/값 쌍을 읽는 스크립트 (학적정보처럼 표가 아닌 입력 필드 화면)
+# - 라벨은 label 요소, aria-label, title, 바로 앞 요소 순으로 찾음
+# - 같은 라벨이 여러 번 나오면 첫 값 사용
+_FIELD_SCRIPT = """
+() => {
+    const clean = (value) => (value || '').replace(/\\s+/g, ' ').trim();
+    const text = (el) => clean(el ? (el.innerText || el.textContent) : '');
+    const fields = {};
+
+    document.querySelectorAll('input:not([type="hidden"]), textarea, select').forEach((input) => {
+        if (input.type === 'checkbox' || input.type === 'radio') return;
+        const value = clean(input.tagName === 'SELECT' ? input.selectedOptions?.[0]?.text : input.value);
+        if (!value) return;
+        const label = clean(
+            text(input.labels?.[0]) || input.getAttribute('aria-label') || input.title || text(input.previousElementSibling)
+        ).replace(/[:：*]$/, '').trim();
+        if (label && !(label in fields)) fields[label] = value;
+    });
+
+    return fields;
+}
+"""
+
+
+class SemesterArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    semester: Optional[str] = Field(
+        default=None, description="조회할 학기 (예: '2025-2', '2024학년도 여름학기'). 비우면 최근 정규학기 (계절학기 제외)"
+    )
+
+
+class SessionArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+
+
+def _is_timetable(table: ExtractedTable) -> bool:
+    """요일 헤더가 세 개 이상 있는 표를 시간표로 판단"""
+    compact = ["".join(header.split()) for header in table.headers]
+    return sum(any(header.startswith(day) for header in compact) for day in WEEKDAYS) >= 3
+
+
+async def fetch_timetable(session: Session, session_id_str: str, year: int, term: str) -> Dict:
+    """
+    개인수업시간표 화면으로 이동해 목표 학기로 맞춘 뒤 시간표 표를 읽습니다.
+    {"semester": (학년도, 학기) 또는 None, "moved": bool, "tables": [ExtractedTable]}
+    """
+    async with session.action_lock.hold("fetch_timetable", PRIORITY_INTERACTIVE):
+        await _navigate_to(session_id_str, TIMETABLE_MENU_TITLE)
+        moved = await move_to_semester(session, year, term)
+        displayed = (await read_displayed_semester(session))["semester"]
+        tables = [table for table in await extract_tables(session) if _is_timetable(table)]
+
+    return {"semester": displayed, "moved": moved, "tables": tables}
+
+
+@tool(args_schema=SemesterArgs)
+async def get_timetable(session_id: str, semester: Optional[str] = None):
+    """
+    개인 수업 시간표를 한 번에 조회합니다. 메뉴 이동과 이전학기/다음학기 이동을 모두 자동으로 처리합니다.
+    시간표 질문에는 navigate_to나 click_element 대신 이 도구를 사용하세요.
+    """
+    # 학기를 지정하지 않으면 계절학기 기간에도 최근 정규학기 시간표
+    target = parse_semester(semester) if semester else get_latest_regular_semester()
+    if target is None:
+        return f"'{semester}' 학기를 이해하지 못했습니다. '2025-2'처럼 학년도와 학기를 함께 입력하세요."
+
+    session = session_manager.get_session(session_id)
+    cache_owner = session.usaint_id or session.id
+    cached = get_cached_data(cache_owner, DATA_TIMETABLE, target)
+    if cached is not None:
+        tables = [ExtractedTable(**table) for table in cached.data]
+        return _format_timetable(target, tables, cached.fetched_at)
+
+    result = await fetch_timetable(session, session_id, *target)
+
+    if not result["moved"]:
+        shown = semester_label(*result["semester"]) if result["semester"] else "알 수 없는 학기"
+        return f"{semester_label(*target)}로 이동하지 못했습니다. (현재 화면: {shown})"
+
+    cached = set_cached_data(cache_owner, DATA_TIMETABLE, [table.model_dump() for table in result["tables"]], target)
+    return _format_timetable(target, result["tables"], cached.fetched_at)
+
+
+def _format_timetable(semester: Tuple[int, str], tables: List[ExtractedTable], fetched_at: datetime) -> str:
+    if not tables:
+        return f"{semester_label(*semester)} 시간표가 없습니다. {format_as_of(fetched_at)}"
+    body = "\n\n".join(format_table(table) for table in tables)
+    return f"# {semester_label(*semester)} 시간표\n{body}\n{format_as_of(fetched_at)}"
+
+
+async def fetch_academic_record(session: Session, session_id_str: str) -> Dict[str, str]:
+    """학적정보 화면의 항목을 {라벨: 값}으로 반환합니다."""
+    async with session.action_lock.hold("fetch_academic_record", PRIORITY_INTERACTIVE):
+        await _navigate_to(session_id_str, ACADEMIC_RECORD_MENU_TITLE)
+        frame = await _get_frame(session)
+        return await frame.evaluate(_FIELD_SCRIPT)
+
+
+@tool(args_schema=SessionArgs)
+async def get_academic_record(session_id: str):
+    """
+    학적정보(학번, 이름, 소속, 학년, 학적상태, 이수학기 등)를 한 번에 조회합니다.
+    메뉴 이동과 화면 읽기를 모두 자동으로 처리합니다.
+    """
+    session = session_manager.get_session(session_id)
+    cache_owner = session.usaint_id or session.id
+    cached = get_cached_data(cache_owner, DATA_ACADEMIC_RECORD)
+    if cached is None:
+        fields = await fetch_academic_record(session, session_id)
+        if not fields:
+            return "학적정보를 읽지 못했습니다."
+        cached = set_cached_data(cache_owner, DATA_ACADEMIC_RECORD, fields)
+
+    lines = [f"{label}: {value}" for label, value in cached.data.items()]
+    return "\n".join(lines + [cached.as_of()])
+
+
+class ScholarshipRecord(BaseModel):
+    year: Optional[int] = Field(default=None, description="학년도")
+    term: Optional[str] = Field(default=None, description="학기")
+    name: str = Field(description="장학금명")
+    amount: Optional[int] = Field(default=None, description="수혜 금액 (원)")
+
+
+def _find_column(headers: List[str], *names: str) -> Optional[int]:
+    for name in names:
+        for index, header in enumerate(headers):
+            if name in header:
+                return index
+    return None
+
+
+def _parse_amount(value: str) -> Optional[int]:
+    digits = "".join(ch for ch in value if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def _cell(cells: List[str], col: Optional[int]) -> str:
+    return cells[col] if col is not None and col < len(cells) else ""
+
+
+def _parse_scholarship_rows(headers: List[str], rows: List[List[str]]) -> List[ScholarshipRecord]:
+    """헤더 이름으로 열을 찾아 장학금 행을 ScholarshipRecord로 변환합니다."""
+    name_col = _find_column(headers, "장학금명", "장학명", "장학금")
+    year_col = _find_column(headers, "학년도")
+    term_col = _find_column(headers, "학기")
+    amount_col = _find_column(headers, "합계", "총액", "수혜금액", "금액")
+    if name_col is None:
+        return []
+
+    records = []
+    for cells in rows:
+        if not _cell(cells, name_col):
+            continue
+
+        year = _parse_amount(_cell(cells, year_col))
+        records.append(
+            ScholarshipRecord(
+                year=year if year and year > 1900 else None,
+                term=normalize_term(_cell(cells, term_col)) or _cell(cells, term_col) or None,
+                name=_cell(cells, name_col),
+                amount=_parse_amount(_cell(cells, amount_col)),
+            )
+        )
+    return records
+
+
+async def fetch_scholarship_history(session: Session, session_id_str: str) -> List[ScholarshipRecord]:
+    """장학금 수혜 내역 표를 모든 페이지에 걸쳐 읽습니다."""
+    async with session.action_lock.hold("fetch_scholarship_history", PRIORITY_INTERACTIVE):
+        await _navigate_to(session_id_str, SCHOLARSHIP_MENU_TITLE)
+        tables = await extract_tables(session, header_keyword="장학")
+
+    records = []
+    for table in tables:
+        records.extend(_parse_scholarship_rows(table.headers, table.rows))
+    return records
+
+
+@tool(args_schema=SessionArgs)
+async def get_scholarship_history(session_id: str):
+    """
+    장학금 수혜 내역(학년도, 학기, 장학금명, 금액)을 한 번에 조회합니다.
+    메뉴 이동과 여러 페이지로 나뉜 표 읽기를 모두 자동으로 처리합니다.
+    """
+    session = session_manager.get_session(session_id)
+    cache_owner = session.usaint_id or session.id
+    cached = get_cached_data(cache_owner, DATA_SCHOLARSHIP)
+    if cached is None:
+        records = await fetch_scholarship_history(session, session_id)
+        cached = set_cached_data(cache_owner, DATA_SCHOLARSHIP, [record.model_dump() for record in records])
+
+    records = [ScholarshipRecord(**record) for record in cached.data]
+    if not records:
+        return f"조회된 장학금 수혜 내역이 없습니다. {cached.as_of()}"
+
+    lines = ["학년도\t학기\t장학금명\t금액"]
+    for record in records:
+        lines.append(
+            "\t".join(
+                [
+                    "" if record.year is None else str(record.year),
+                    record.term or "",
+                    record.name,
+                    "" if record.amount is None else f"{record.amount:,}",
+                ]
+            )
+        )
+    lines.append(f"합계\t\t\t{sum(record.amount or 0 for record in records):,}")
+    lines.append(cached.as_of())
+    return "\n".join(lines)
@@ -0,0 +1,82 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from time import time
+from typing import Dict, List, Tuple
+
+# 우선순위 (값이 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0  # 사용자 대화 턴
+PRIORITY_BACKGROUND = 1  # 스케줄러 작업
+
+# 이 시간 이상 기다린 경우에만 로그 출력
+WAIT_LOG_THRESHOLD_SECONDS = 0.1
+
+
+class ActionLock:
+    """
+    한 탭(Page)을 조작하는 동작을 하나씩 실행하도록 직렬화하는 락입니다.
+    대기자가 여럿이면 대화 턴이 스케줄러 작업보다 먼저 락을 받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.holder: str = ""
+        self._locked = False
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        self.wait_stats: Dict[str, float] = {"count": 0, "total": 0.0, "max": 0.0}
+
+    def locked(self) -> bool:
+        return self._locked
+
+    async def acquire(self, label: str, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """락을 얻을 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        started_at = time()
+
+        if not self._locked and not self._waiters:
+            self._locked = True
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+            try:
+                # 반납하는 쪽이 락을 그대로 넘겨줌
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()
+                else:
+                    self._waiters = [item for item in self._waiters if item[2] is not waiter]
+                    heapq.heapify(self._waiters)
+                raise
+
+        self.holder = label
+        waited = time() - started_at
+        self._record_wait(label, waited)
+        return waited
+
+    def release(self):
+        self.holder = ""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._locked = False
+
+    @asynccontextmanager
+    async def hold(self, label: str, priority: int = PRIORITY_INTERACTIVE):
+        await self.acquire(label, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record_wait(self, label: str, waited: float):
+        self.wait_stats["count"] += 1
+        self.wait_stats["total"] += waited
+        self.wait_stats["max"] = max(self.wait_stats["max"], waited)
+
+        if waited >= WAIT_LOG_THRESHOLD_SECONDS:
+            print(f"[ActionLock] {self.name} '{label}' {waited:.2f}s 대기")
@@ -1,28 +1,49 @@
-from typing import Annotated, AsyncGenerator, Dict, Optional
+from time import perf_counter
+from typing import Annotated, AsyncGenerator, Dict, Optional, Set
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import START, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 from playwright.async_api import Playwright, async_playwright
 from typing_extensions import TypedDict
 
+from apps.agent.answer_cache import (
+    ANSWER_CACHE_ENABLED,
+    CachedAnswer,
+    SemanticAnswerCache,
+    is_stateless_history,
+)
+from apps.agent.checkpointer import DBCheckpointSaver
+from apps.agent.history import HistoryManager
+from apps.agent.intent_router import (
+    INTENT_CAFETERIA,
+    INTENT_GRADES,
+    INTENT_NOTICE,
+    INTENT_ROUTER_ENABLED,
+    IntentRouter,
+    RoutedIntent,
+)
 from apps.agent.prompt import get_prompt
 from apps.agent.rag import search_ssu_notice
+from apps.agent.tokens import PromptCacheStats, count_text_tokens
+from apps.agent.tool_output import capture_tool_output, compact_tool_output
 from apps.agent.cafeteria import fetch_cafeteria_menu
-from apps.agent.grade_fetcher import fetch_grade_summary, fetch_full_grades
-from apps.agent.session import session_manager
-from apps.agent.usaint import (
-    click_in_iframe,
-    get_iframe_interactive_element,
-    get_iframe_text_content,
-    insert_text,
-    search_menu,
-    select_navigation_menu,
-    usaint_login,
+from apps.agent.browser_pool import browser_pool
+from apps.agent.browser_worker import (
+    BROWSER_TOOLS,
+    browser_worker_farm,
+    cancel_warm_up,
+    close_session,
+    end_turn,
+    fetch_grades,
+    open_session,
+    warm_up_session,
 )
+from apps.agent.session import session_manager
+from apps.agent.usaint import search_menu
 
 from apps.user_api.domain.usaint_account.service import get_usaint_account_by_user_id
 from lib.database import get_db
@@ -33,6 +54,7 @@ from apps.agent.rag import search_notices
 class State(TypedDict):
     messages: Annotated[list, add_messages]
     session_id: str
+    summary: str  # 토큰 예산을 넘어 접힌 이전 대화의 누적 요약
 
 
 # 툴 이름을 한글 메시지로 변환하는 매핑
@@ -40,13 +62,27 @@ TOOL_NAME_TO_MESSAGE = {
     "search_ssu_notice": "숭실대 공지사항 검색 중...",
     "search_menu": "유세인트 메뉴 검색 중...",
     "select_navigation_menu": "메뉴 선택 중...",
+    "navigate_to": "메뉴 이동 중...",
     "get_iframe_text_content": "페이지 내용 읽는 중...",
     "get_iframe_interactive_element": "페이지 요소 찾는 중...",
+    "get_iframe_table": "표 읽는 중...",
     "click_in_iframe": "클릭 실행 중...",
+    "click_element": "클릭 실행 중...",
     "insert_text": "텍스트 입력 중...",
+    "get_grades": "성적 조회 중...",
+    "get_timetable": "시간표 조회 중...",
+    "get_academic_record": "학적정보 조회 중...",
+    "get_scholarship_history": "장학금 수혜 내역 조회 중...",
     "fetch_cafeteria_menu": "식당 메뉴 조회 중...",
 }
 
+# 의도 라우터가 바로 답할 때 진행 상태로 보여줄 도구
+ROUTED_INTENT_TOOLS = {
+    INTENT_CAFETERIA: "fetch_cafeteria_menu",
+    INTENT_NOTICE: "search_ssu_notice",
+    INTENT_GRADES: "get_grades",
+}
+
 
 class AgentService:
     """FastAPI에서 호출 가능한 에이전트 서비스 (LangGraph 기반)"""
@@ -54,15 +90,15 @@ class AgentService:
     def __init__(self):
         self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
         self.playwright: Optional[Playwright] = None
-        self.memory = MemorySaver()
-
-        # 도구 정의
-        self.tools = [
-            click_in_iframe,
-            insert_text,
-            get_iframe_interactive_element,
-            get_iframe_text_content,
-            select_navigation_menu,
+        # 대화 기록은 DB에 저장하고 대화마다 최근 체크포인트만 유지
+        self.memory = DBCheckpointSaver()
+
+        # 도구 정의 (워커 모드에서는 탭을 조작하는 도구를 워커로 전달)
+        browser_tools = list(BROWSER_TOOLS.values())
+        if browser_worker_farm.enabled:
+            browser_tools = [browser_worker_farm.proxy_tool(t) for t in browser_tools]
+
+        self.tools = browser_tools + [
             search_menu,
             search_ssu_notice,
             fetch_cafeteria_menu,
@@ -71,6 +107,18 @@ class AgentService:
         # LLM에 도구 바인딩
         self.llm_with_tools = self.llm.bind_tools(self.tools)
 
+        # 호출마다 대화 기록을 토큰 예산 안으로 줄이고, 오래된 대화는 요약으로 접음
+        self.history = HistoryManager(summarizer=self.llm)
+
+        # 시스템 프롬프트 앞부분은 모든 대화에서 같으므로 프로바이더 캐시 적중률을 기록
+        self.prompt_cache_stats = PromptCacheStats()
+
+        # 학식/공지/캐시된 성적 같은 단순 질문은 그래프를 거치지 않고 바로 응답
+        self.router = IntentRouter(llm=self.llm)
+
+        # 학식/공지처럼 개인 정보가 없는 답변은 비슷한 질문에 재사용
+        self.answer_cache = SemanticAnswerCache()
+
         # 그래프 초기화
         self.graph = self._build_graph()
 
@@ -81,26 +129,42 @@ class AgentService:
 
         # chatbot 노드 정의
         async def chatbot(state: State):
-            from langchain_core.messages import SystemMessage
-
-            # 시스템 프롬프트가 없으면 추가
-            messages = list(state["messages"])
-            has_system = any(isinstance(msg, SystemMessage) for msg in messages)
-
-            if not has_system:
-                # 첫 메시지면 시스템 프롬프트 추가
-                session_id = state.get("session_id", "")
-                messages = [SystemMessage(content=get_prompt(session_id))] + messages
+            # 시스템 프롬프트를 붙이고 대화 기록을 토큰 예산 안으로 맞춤
+            session_id = state.get("session_id", "")
+            history = await self.history.prepare(
+                get_prompt(session_id), list(state["messages"]), state.get("summary")
+            )
 
-            response = await self.llm_with_tools.ainvoke(messages)
-            return {"messages": [response]}
+            response = await self.llm_with_tools.ainvoke(history.messages)
+            self.prompt_cache_stats.record(response)
+            return {"messages": history.removals + [response], "summary": history.summary}
 
         # 노드 추가
         graph_builder.add_node("chatbot", chatbot)
 
-        # 도구 노드 추가
+        # 도구 노드 추가 (결과는 도구별 토큰 예산에 맞춰 압축한 뒤 상태에 저장)
         tool_node = ToolNode(tools=self.tools)
-        graph_builder.add_node("tools", tool_node)
+
+        async def tools(state: State, config: RunnableConfig):
+            result = await tool_node.ainvoke(state, config)
+            query = next(
+                (str(m.content) for m in reversed(state["messages"]) if isinstance(m, HumanMessage)),
+                None,
+            )
+
+            for message in result.get("messages", []):
+                if not isinstance(message, ToolMessage) or message.status == "error":
+                    continue
+                capture_tool_output(message.name, message.content, query)
+                compacted = compact_tool_output(message.name, message.content, query)
+                print(
+                    f"[AgentService] 도구 결과 압축: {message.name} "
+                    f"{count_text_tokens(str(message.content))} -> {count_text_tokens(compacted)} 토큰"
+                )
+                message.content = compacted
+            return result
+
+        graph_builder.add_node("tools", tools)
 
         # 엣지 추가
         graph_builder.add_edge(START, "chatbot")
@@ -111,38 +175,176 @@ class AgentService:
         return graph_builder.compile(checkpointer=self.memory)
 
     async def initialize(self):
-        """Playwright 초기화"""
+        """Playwright 초기화 (워커 모드면 브라우저 워커 프로세스 실행)"""
+        if browser_worker_farm.enabled:
+            await browser_worker_farm.start()
+            return
+
         if not self.playwright:
             self.playwright = await async_playwright().start()
             print("[AgentService] Playwright 초기화 완료")
 
     async def shutdown(self):
         """모든 세션 종료 및 Playwright 정리"""
+        # 브라우저 워커는 각자 세션을 정리하고 종료
+        if browser_worker_farm.enabled:
+            await browser_worker_farm.stop()
+
         # 모든 세션 종료
         for session_id in list(session_manager.session_map.keys()):
             await self.close_session_by_id(session_id)
 
+        # 브라우저 풀 종료
+        await browser_pool.close()
+
         # Playwright 종료
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
             print("[AgentService] Playwright 종료 완료")
 
+    async def _open_session(
+        self, session_id: str, usaint_id: Optional[str], usaint_password: Optional[str]
+    ) -> AsyncGenerator[Dict, None]:
+        """세션을 소유한 곳(워커 또는 현재 프로세스)에서 대화 턴을 시작합니다."""
+        if browser_worker_farm.enabled:
+            browser_worker_farm.assign(session_id, usaint_id)
+            events = browser_worker_farm.stream(
+                session_id, "open_session", usaint_id=usaint_id, usaint_password=usaint_password
+            )
+        else:
+            events = open_session(self.playwright, session_id, usaint_id, usaint_password)
+
+        async for event in events:
+            yield event
+
+    async def warm_up_chat_room(
+        self, chat_room_id: int, usaint_id: Optional[str], usaint_password: Optional[str]
+    ) -> bool:
+        """
+        채팅방 입장 시 첫 메시지 전에 브라우저 탭과 유세인트 로그인을 미리 준비합니다.
+        예열은 백그라운드에서 진행되며, 첫 메시지는 진행 중인 예열이 끝나면 그 탭을 이어서 사용합니다.
+        """
+        session_id = self._get_session_id(chat_room_id)
+        try:
+            if browser_worker_farm.enabled:
+                if not browser_worker_farm.workers:
+                    await self.initialize()
+                browser_worker_farm.assign(session_id, usaint_id)
+                return await browser_worker_farm.call(
+                    session_id, "warm_up_session", usaint_id=usaint_id, usaint_password=usaint_password
+                )
+
+            if not self.playwright:
+                await self.initialize()
+            return await warm_up_session(self.playwright, session_id, usaint_id, usaint_password)
+        except Exception as e:
+            print(f"[AgentService] 세션 예열 요청 실패: {session_id} - {e}")
+            return False
+
+    async def cancel_chat_room_warm_up(self, chat_room_id: int):
+        """사용자가 채팅방을 나가면 진행 중인 예열을 취소합니다."""
+        session_id = self._get_session_id(chat_room_id)
+        try:
+            if browser_worker_farm.enabled:
+                if session_id in browser_worker_farm.affinity:
+                    await browser_worker_farm.call(session_id, "cancel_warm_up")
+                return
+            await cancel_warm_up(self.playwright, session_id)
+        except Exception as e:
+            print(f"[AgentService] 세션 예열 취소 실패: {session_id} - {e}")
+
+    async def _end_turn(self, session_id: str):
+        try:
+            if browser_worker_farm.enabled:
+                await browser_worker_farm.call(session_id, "end_turn")
+            else:
+                await end_turn(self.playwright, session_id)
+        except Exception as e:
+            print(f"[AgentService] 턴 종료 처리 실패: {session_id} - {e}")
+
+    async def _classify_intent(self, message: str) -> Optional[RoutedIntent]:
+        if not INTENT_ROUTER_ENABLED:
+            return None
+        try:
+            return await self.router.classify(message)
+        except Exception as e:
+            print(f"[AgentService] 의도 분류 실패, 에이전트로 처리: {e}")
+            return None
+
+    async def _answer_routed(
+        self, session_id: str, routed: RoutedIntent, message: str, usaint_id: Optional[str]
+    ) -> Optional[str]:
+        """라우터로 바로 답하고, 이어지는 질문을 위해 대화 기록에도 남깁니다. 답할 수 없으면 None"""
+        try:
+            answer = await self.router.answer(routed, message, usaint_id)
+        except Exception as e:
+            print(f"[AgentService] 직접 응답 실패, 에이전트로 처리: {e}")
+            return None
+        if answer is not None:
+            await self._remember_exchange(session_id, message, answer, ROUTED_INTENT_TOOLS[routed.intent])
+        return answer
+
+    async def _remember_exchange(self, session_id: str, message: str, answer: str, tool_name: Optional[str] = None):
+        """
+        그래프를 거치지 않은 답변도 이어지는 질문을 위해 대화 기록에 남깁니다.
+        라우터가 답했으면 어떤 도구의 데이터인지 답변 이름(name)으로 남겨 응답 캐시가 개인 데이터를 구분합니다.
+        """
+        await self.graph.aupdate_state(
+            {"configurable": {"thread_id": session_id}},
+            {
+                "session_id": session_id,
+                "messages": [HumanMessage(content=message), AIMessage(content=answer, name=tool_name)],
+            },
+            as_node="chatbot",
+        )
+
+    async def _is_stateless_thread(self, session_id: str) -> bool:
+        """이전 대화에 성적/시간표 같은 개인 데이터나 누적 요약이 없는지 (응답 캐시 저장 조건)"""
+        if not ANSWER_CACHE_ENABLED:
+            return False
+        try:
+            snapshot = await self.graph.aget_state({"configurable": {"thread_id": session_id}})
+        except Exception as e:
+            print(f"[AgentService] 대화 기록 확인 실패, 응답 캐시에 저장하지 않음: {e}")
+            return False
+        values = snapshot.values or {}
+        return is_stateless_history(values.get("messages") or [], values.get("summary"))
+
+    async def _lookup_answer_cache(self, message: str) -> Optional[CachedAnswer]:
+        if not ANSWER_CACHE_ENABLED:
+            return None
+        try:
+            return await self.answer_cache.lookup(message)
+        except Exception as e:
+            print(f"[AgentService] 응답 캐시 조회 실패: {e}")
+            return None
+
+    async def _store_answer_cache(
+        self, message: str, answer: str, tools: Set[str], started: float, stateless: bool = True
+    ):
+        if not ANSWER_CACHE_ENABLED:
+            return
+        try:
+            await self.answer_cache.store(message, answer, tools, perf_counter() - started, stateless)
+        except Exception as e:
+            print(f"[AgentService] 응답 캐시 저장 실패: {e}")
+
     def _get_session_id(self, chat_room_id: int) -> str:
         """chat_room_id를 session_id로 변환"""
         return f"chatroom_{chat_room_id}"
 
+    def _get_scheduler_session_id(self, chat_room_id: int) -> str:
+        """스케줄러 작업용 session_id. 같은 계정 컨텍스트에서 별도 탭을 사용합니다."""
+        return f"schedule_{chat_room_id}"
+
     def clear_memory(self, chat_room_id: int):
         """특정 채팅방의 대화 메모리를 초기화"""
         session_id = self._get_session_id(chat_room_id)
         try:
-            if hasattr(self.memory, "storage"):
-                thread_key = (session_id,)
-                if thread_key in self.memory.storage:
-                    del self.memory.storage[thread_key]
-                    print(f"[AgentService] 채팅방 {chat_room_id}의 메모리 초기화 완료")
-                    return True
-            return False
+            self.memory.delete_thread(session_id)
+            print(f"[AgentService] 채팅방 {chat_room_id}의 메모리 초기화 완료")
+            return True
         except Exception as e:
             print(f"[AgentService] 메모리 초기화 실패: {e}")
             return False
@@ -155,55 +357,7 @@ class AgentService:
             bool: 메모리가 수정되었으면 True, 그렇지 않으면 False
         """
         try:
-            if not hasattr(self.memory, "storage"):
-                return False
-
-            thread_key = (session_id,)
-            if thread_key not in self.memory.storage:
-                return False
-
-            # 메모리에서 상태 가져오기
-            checkpoint = self.memory.storage[thread_key]
-            if not checkpoint or "channel_values" not in checkpoint:
-                return False
-
-            channel_values = checkpoint["channel_values"]
-            if "messages" not in channel_values:
-                return False
-
-            messages = channel_values["messages"]
-            if not messages:
-                return False
-
-            # 마지막 메시지 확인
-            last_message = messages[-1]
-
-            # AIMessage이면서 tool_calls가 있는지 확인
-            from langchain_core.messages import AIMessage, ToolMessage
-
-            if (
-                isinstance(last_message, AIMessage)
-                and hasattr(last_message, "tool_calls")
-                and last_message.tool_calls
-            ):
-                # tool_calls가 있는데 다음 메시지가 ToolMessage인지 확인
-                # 마지막이 AIMessage(with tool_calls)면 ToolMessage가 없는 것
-                print(
-                    f"[AgentService] 불완전한 tool_calls 감지: {len(last_message.tool_calls)}개"
-                )
-
-                # 불완전한 AIMessage 제거
-                messages.pop()
-                checkpoint["channel_values"]["messages"] = messages
-                self.memory.storage[thread_key] = checkpoint
-
-                print(
-                    f"[AgentService] 불완전한 메시지 제거 완료 (session: {session_id})"
-                )
-                return True
-
-            return False
-
+            return self.memory.repair_thread(session_id)
         except Exception as e:
             print(f"[AgentService] 메모리 검증 중 오류: {e}")
             import traceback
@@ -220,8 +374,16 @@ class AgentService:
                 return f"'{menu_title}' 메뉴 선택 중..."
             return "메뉴 선택 중..."
 
+        elif tool_name == "navigate_to":
+            menu_title = tool_args.get("menu_title", "")
+            if menu_title:
+                return f"'{menu_title}' 화면으로 이동 중..."
+            return "메뉴 이동 중..."
+
         elif tool_name == "search_menu":
-            # search_menu는 파라미터가 없음
+            query = tool_args.get("query", "")
+            if query:
+                return f"'{query}' 메뉴 검색 중..."
             return "메뉴 구조 조회 중..."
 
         elif tool_name == "search_ssu_notice":
@@ -240,7 +402,7 @@ class AgentService:
                 return f"'{content[:20]}...' 입력 중..."
             return "텍스트 입력 중..."
 
-        elif tool_name == "click_in_iframe":
+        elif tool_name in ("click_in_iframe", "click_element"):
             return "버튼 클릭 중..."
 
         elif tool_name == "get_iframe_text_content":
@@ -286,46 +448,59 @@ class AgentService:
             Dict: 이벤트 타입과 데이터를 포함한 딕셔너리
             - {"type": "tool_start", "tool_name": "...", "message": "..."}
             - {"type": "agent_message", "content": "..."}
+            - {"type": "queue", "position": n, "message": "..."}  (브라우저 자리 대기 중)
             - {"type": "error", "message": "..."}
         """
+        session_id = None
+        turn_started = False
+        started = perf_counter()
         try:
-            # Playwright가 초기화되지 않았다면 초기화
-            if not self.playwright:
+            # Playwright(또는 브라우저 워커)가 초기화되지 않았다면 초기화
+            if not self.playwright and not browser_worker_farm.workers:
                 await self.initialize()
 
             # chat_room_id를 session_id로 변환
             session_id = self._get_session_id(chat_room_id)
 
-            # 채팅방별 세션 조회/생성
-            session = session_manager.get_session(session_id)
-
-            # 세션 활동 시간 업데이트
-            session.update_activity()
-
             # 메모리 검증 및 수정 (불완전한 tool_calls 제거)
             was_fixed = self._validate_and_fix_memory(session_id)
             if was_fixed:
                 print(f"[AgentService] 메모리 상태 복구 완료")
 
-            # 세션이 시작되지 않았다면 시작
-            if session.page is None:
-                await session.start(self.playwright)
-                print(f"[AgentService] 채팅방 {chat_room_id}의 세션 시작: {session_id}")
+            # 비슷한 질문에 대한 개인 정보 없는 답변이 있으면 바로 응답
+            cached = await self._lookup_answer_cache(message)
+            if cached is not None:
+                await self._remember_exchange(session_id, message, cached.answer)
+                yield {"type": "agent_message", "content": cached.answer}
+                return
 
-                # 유세인트 로그인이 필요한 경우
-                if usaint_id and usaint_password:
-                    yield {
-                        "type": "tool_start",
-                        "tool_name": "usaint_login",
-                        "message": "유세인트 로그인 중...",
-                    }
-                    await usaint_login(session, usaint_id, usaint_password)
-                    print(f"[AgentService] 유세인트 로그인 완료: {session_id}")
+            # 단순 질문은 브라우저 세션을 열지 않고 바로 응답
+            answer = None
+            routed = await self._classify_intent(message)
+            if routed is not None:
+                tool_name = ROUTED_INTENT_TOOLS[routed.intent]
+                yield {"type": "tool_start", "tool_name": tool_name, "message": TOOL_NAME_TO_MESSAGE[tool_name]}
+                answer = await self._answer_routed(session_id, routed, message, usaint_id)
+            if INTENT_ROUTER_ENABLED:
+                self.router.stats.record(routed.intent if answer is not None else None)
+            if answer is not None:
+                yield {"type": "agent_message", "content": answer}
+                await self._store_answer_cache(message, answer, {ROUTED_INTENT_TOOLS[routed.intent]}, started)
+                return
+
+            # 세션이 시작되지 않았다면 시작 (대기 순번/로그인 이벤트 전달)
+            turn_started = True
+            async for event in self._open_session(session_id, usaint_id, usaint_password):
+                yield event
 
             # LangGraph 설정
             config = {"recursion_limit": 25, "configurable": {"thread_id": session_id}}
 
-            # 스트리밍 실행
+            # 스트리밍 실행 (응답 캐시 저장을 위해 사용한 도구와 최종 답변을 기록)
+            # 이전 대화에 개인 데이터가 있으면 답변이 그 내용에 기댈 수 있으므로 캐시하지 않음
+            stateless_thread = await self._is_stateless_thread(session_id)
+            used_tools: Set[str] = set()
+            final_answer = None
             try:
                 async for event in self.graph.astream(
                     {
@@ -370,6 +545,7 @@ class AgentService:
                                         f"[AgentService] 툴 호출: {tool_name}, 인자: {tool_args}"
                                     )
 
+                                    used_tools.add(tool_name)
                                     yield {
                                         "type": "tool_start",
                                         "tool_name": tool_name,
@@ -381,6 +557,7 @@ class AgentService:
                                 isinstance(last_message, AIMessage)
                                 and last_message.content
                             ):
+                                final_answer = last_message.content
                                 yield {
                                     "type": "agent_message",
                                     "content": last_message.content,
@@ -413,12 +590,18 @@ class AgentService:
                 # 에러를 yield로 전달했으므로 raise하지 않음
                 return
 
+            if final_answer:
+                await self._store_answer_cache(message, final_answer, used_tools, started, stateless_thread)
+
         except Exception as e:
             print(f"[AgentService] 메시지 처리 중 오류: {e}")
             import traceback
 
             traceback.print_exc()
             yield {"type": "error", "message": f"오류가 발생했습니다: {str(e)}"}
+        finally:
+            if turn_started:
+                await self._end_turn(session_id)
 
     # 스케줄러가 호출할 성적 데이터 가져오기
     async def get_grades_data(
@@ -435,23 +618,26 @@ class AgentService:
             usaint_id = usaint_account.id
             usaint_pw = decrypt_password(usaint_account.password)
 
-            # 세션 가져오기
-            session = await self._get_or_create_session(chat_room_id, usaint_id, usaint_pw)
-            if not session:
-                raise Exception("세션 생성 또는 로그인에 실패했습니다.")
-
-            # 세션 id 문자열 가져오기
-            session_id_str = self._get_session_id(chat_room_id)
+            # 변경 감지가 캐시 TTL만큼 늦어지지 않도록 캐시를 거치지 않고 현재 학기를 다시 조회
+            # (fetch_full_grades가 결과를 캐시에 다시 저장하므로 채팅에서는 그대로 캐시 사용)
+            # 같은 학생의 채팅방과 로그인/쿠키를 공유하는 스케줄러용 탭에서 전체 성적 조회
+            # (작업이 끝나면 탭을 바로 반납)
+            session_id = self._get_scheduler_session_id(chat_room_id)
+            if browser_worker_farm.enabled:
+                browser_worker_farm.assign(session_id, usaint_id)
+                return await browser_worker_farm.call(
+                    session_id, "fetch_grades", usaint_id=usaint_id, usaint_password=usaint_pw
+                )
 
-            # 전체 성적 데이터 추출
-            key_data = await fetch_full_grades(session, session_id_str)
-            return key_data
+            if not self.playwright:
+                await self.initialize()
+            return await fetch_grades(self.playwright, session_id, usaint_id, usaint_pw)
 
         except Exception as e:
             print(f"[AgentService] 성적 조회 작업 중 오류: {e}")
             return None
         finally:
-             db.close()
+            db.close()
 
     # 스케줄러가 호출할 학식 메뉴 데이터 가져오기
     async def get_cafeteria_data(
@@ -562,26 +748,6 @@ class AgentService:
             print(f"[AgentService] 장학금 공지 조회 중 오류: {e}")
             return None
 
-    async def _get_or_create_session(
-        self, chat_room_id: int, usaint_id: str, usaint_pw: str
-    ):
-        """[스케줄러 전용] 세션을 가져오거나, 없으면 생성하고 로그인합니다."""
-        if not self.playwright:
-            await self.initialize()
-
-        session_id = self._get_session_id(chat_room_id)
-        session = session_manager.get_session(session_id)
-        session.update_activity() # 세션 자동 종료 방지
-
-        # 세션이 없거나, 페이지가 닫혔으면 새로 시작
-        if session.page is None or session.page.is_closed():
-            print(f"[AgentService] 스케줄러용 세션이 없어 새로 시작합니다: {session_id}")
-            await session.start(self.playwright)
-            await usaint_login(session, usaint_id, usaint_pw)
-            print(f"[AgentService] 스케줄러용 로그인 완료: {session_id}")
-        
-        return session
-
     async def close_chat_room_session(self, chat_room_id: int):
         """특정 채팅방의 세션을 종료합니다."""
         session_id = self._get_session_id(chat_room_id)
@@ -589,11 +755,13 @@ class AgentService:
 
     async def close_session_by_id(self, session_id: str):
         """session_id로 세션을 종료합니다."""
-        if session_id in session_manager.session_map:
-            session = session_manager.session_map[session_id]
-            await session.close()
-            del session_manager.session_map[session_id]
-            print(f"[AgentService] 세션 종료: {session_id}")
+        if browser_worker_farm.enabled:
+            if session_id in browser_worker_farm.affinity:
+                await browser_worker_farm.call(session_id, "close_session")
+                browser_worker_farm.forget(session_id)
+            return
+
+        await close_session(self.playwright, session_id)
 
 
 def get_agent_data_function(task_type: str):
@@ -0,0 +1,210 @@
+"""
+의미 기반 응답 캐시
+
+학식 메뉴나 공지처럼 개인 정보가 없는 질문은 여러 학생이 몇 분 사이에 거의 같은 문장으로 묻습니다.
+개인 정보가 없는 도구(NON_PERSONAL_TOOLS)만 사용한 답변을 질문 임베딩과 함께 저장해 두고,
+비슷한 질문이 오면 에이전트를 실행하지 않고 바로 돌려줍니다.
+
+- "오늘"/"내일", 식당처럼 문장은 비슷해도 답이 달라지는 값은 query_signature가 같아야만 재사용
+- 학식 답변은 메뉴 날짜가 끝나면, 공지 답변은 공지 인덱스가 바뀌면 만료 (둘 다 최대 ANSWER_CACHE_MAX_TTL)
+"""
+
+import asyncio
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+from apps.agent.intent_router import (
+    INTENT_CAFETERIA,
+    INTENT_NOTICE,
+    embed_texts,
+    match_intent_rules,
+    parse_menu_date,
+    parse_restaurant_codes,
+)
+from apps.agent.rag import get_notice_index_version
+from lib.env import get_env
+
+# 이 도구만 사용한 답변을 캐시 (성적/시간표 등 개인 데이터 도구가 하나라도 있으면 저장하지 않음)
+NON_PERSONAL_TOOLS = {"fetch_cafeteria_menu", "search_ssu_notice"}
+
+ANSWER_CACHE_ENABLED = (get_env("ANSWER_CACHE_ENABLED") or "true").lower() == "true"
+
+# 저장된 질문과 이 이상 비슷해야 재사용 (코사인 유사도)
+ANSWER_CACHE_MIN_SIMILARITY = float(get_env("ANSWER_CACHE_MIN_SIMILARITY") or 0.9)
+
+# 데이터와 관계없이 답변을 보관하는 최대 시간 ("이번 주 공지"처럼 상대적인 질문 대비)
+ANSWER_CACHE_MAX_TTL = timedelta(hours=6)
+
+# 메모리에 보관할 최대 답변 수 (넘으면 오래된 것부터 삭제)
+ANSWER_CACHE_MAX_ENTRIES = 500
+
+# 공지 질문에서 주제가 아닌 말 ("장학금 공지 알려줘"의 "알려줘")
+_NOTICE_FILLER_WORDS = {
+    "알려줘", "알려주세요", "알려줄래", "보여줘", "보여주세요", "찾아줘", "찾아주세요", "검색해줘",
+    "있어", "있나요", "있어요", "있니", "뭐야", "뭐있어", "뭐가", "무슨", "어떤", "관련", "관한", "대한",
+    "최근", "요즘", "최신", "새로", "새로운", "올라온", "나온", "내용", "확인", "좀", "혹시",
+}
+
+# 명사 뒤에 붙는 조사 (긴 것부터 확인)
+_JOSA_SUFFIXES = ("에서", "으로", "이랑", "에는", "은", "는", "이", "가", "을", "를", "에", "의", "도", "만", "로", "과", "와", "랑")
+
+
+class CachedAnswer:
+    def __init__(
+        self,
+        query: str,
+        answer: str,
+        vector: np.ndarray,
+        signature: Tuple,
+        expires_at: datetime,
+        notice_version: Optional[str],
+        latency: float,
+    ):
+        self.query = query
+        self.answer = answer
+        self.vector = vector  # 정규화된 질문 임베딩
+        self.signature = signature  # query_signature 결과
+        self.expires_at = expires_at
+        self.notice_version = notice_version  # 공지 검색을 사용한 답변이면 당시 인덱스 버전
+        self.latency = latency  # 처음 답변을 만드는 데 걸린 시간 (초)
+
+
+def is_stateless_history(messages: List, summary: Optional[str]) -> bool:
+    """
+    이전 대화에 개인 데이터가 없는지 확인합니다.
+    성적/시간표 같은 도구 결과나 라우터가 답한 개인 정보(이름이 붙은 답변), 누적 요약이 있으면
+    답변이 그 내용에 기댈 수 있으므로 다른 학생에게 재사용하지 않습니다.
+    """
+    if summary:
+        return False
+    for message in messages:
+        name = getattr(message, "name", None)
+        if getattr(message, "type", None) in ("tool", "ai") and name and name not in NON_PERSONAL_TOOLS:
+            return False
+    return True
+
+
+def _strip_josa(word: str) -> str:
+    for suffix in _JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[: -len(suffix)]
+    return word
+
+
+def notice_topic_keywords(message: str) -> Tuple[str, ...]:
+    """공지 질문의 주제 단어 ("공지"와 요청 표현을 뺀 명사). 어순과 관계없이 같은 값"""
+    words = set()
+    for word in re.findall(r"[0-9A-Za-z가-힣]+", message.lower()):
+        word = _strip_josa(word)
+        if len(word) < 2 or "공지" in word or word in _NOTICE_FILLER_WORDS or word.isdigit():
+            continue
+        words.add(word)
+    return tuple(sorted(words))
+
+
+def query_signature(message: str, today: Optional[date] = None) -> Optional[Tuple]:
+    """
+    답을 결정하는 값(의도, 메뉴 날짜, 식당, 공지 주제와 숫자)을 뽑습니다. 캐시할 수 없는 질문이면 None
+    "그럼 내일은?"처럼 앞 대화에 기대는 질문은 의도가 잡히지 않아 캐시하지 않습니다.
+    """
+    intent = match_intent_rules(message)
+    if intent == INTENT_CAFETERIA:
+        return intent, parse_menu_date(message, today).isoformat(), tuple(parse_restaurant_codes(message))
+    if intent == INTENT_NOTICE:
+        # "장학금 공지"와 "등록금 공지"는 임베딩이 가까워도 답이 다르므로 주제 단어까지 같아야 재사용
+        return intent, tuple(re.findall(r"\d+", message)), notice_topic_keywords(message)
+    return None
+
+
+class AnswerCacheStats:
+    """캐시 대상 질문의 적중률과 절약한 응답 시간 집계"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record_hit(self, entry: CachedAnswer, similarity: float, elapsed: float):
+        self.hits += 1
+        self.saved_seconds += max(entry.latency - elapsed, 0.0)
+        print(
+            f"[AnswerCache] 적중 (유사도 {similarity:.2f}, '{entry.query}') | "
+            f"{elapsed * 1000:.0f}ms, 약 {entry.latency - elapsed:.1f}초 절약 | "
+            f"적중률 {self.hit_rate:.1%} ({self.hits}/{self.hits + self.misses}), 누적 절약 {self.saved_seconds:.1f}초"
+        )
+
+    def record_miss(self):
+        self.misses += 1
+        print(f"[AnswerCache] 미적중 | 적중률 {self.hit_rate:.1%} ({self.hits}/{self.hits + self.misses})")
+
+
+class SemanticAnswerCache:
+    def __init__(self):
+        self._entries: List[CachedAnswer] = []
+        self.stats = AnswerCacheStats()
+
+    def _expires_at(self, signature: Tuple) -> datetime:
+        limit = datetime.now() + ANSWER_CACHE_MAX_TTL
+        if signature[0] == INTENT_CAFETERIA:
+            # 메뉴 날짜가 지나면 만료
+            menu_end = datetime.combine(date.fromisoformat(signature[1]) + timedelta(days=1), time.min)
+            return min(limit, menu_end)
+        return limit
+
+    async def lookup(self, message: str) -> Optional[CachedAnswer]:
+        """비슷한 질문의 유효한 답변이 있으면 반환합니다."""
+        signature = query_signature(message)
+        if signature is None:
+            return None
+
+        started = datetime.now()
+        self._entries = [entry for entry in self._entries if entry.expires_at > started]
+        candidates = [entry for entry in self._entries if entry.signature == signature]
+
+        if candidates and signature[0] == INTENT_NOTICE:
+            version = await asyncio.to_thread(get_notice_index_version)
+            candidates = [entry for entry in candidates if entry.notice_version == version]
+
+        if not candidates:
+            self.stats.record_miss()
+            return None
+
+        vector = (await asyncio.to_thread(embed_texts, [message]))[0]
+        similarity, best = max(((float(entry.vector @ vector), entry) for entry in candidates), key=lambda pair: pair[0])
+        if similarity < ANSWER_CACHE_MIN_SIMILARITY:
+            self.stats.record_miss()
+            return None
+
+        self.stats.record_hit(best, similarity, (datetime.now() - started).total_seconds())
+        return best
+
+    async def store(self, message: str, answer: str, tools: Set[str], latency: float, stateless: bool = True):
+        """
+        개인 정보가 없는 도구만 사용한 답변을 저장합니다.
+        stateless가 False이면(이전 대화에 개인 데이터가 있으면) 저장하지 않습니다.
+        """
+        if not stateless or not tools or not tools <= NON_PERSONAL_TOOLS:
+            return
+        signature = query_signature(message)
+        if signature is None:
+            return
+
+        vector = (await asyncio.to_thread(embed_texts, [message]))[0]
+        notice_version = None
+        if "search_ssu_notice" in tools:
+            notice_version = await asyncio.to_thread(get_notice_index_version)
+
+        self._entries.append(
+            CachedAnswer(message, answer, vector, signature, self._expires_at(signature), notice_version, latency)
+        )
+        if len(self._entries) > ANSWER_CACHE_MAX_ENTRIES:
+            self._entries.pop(0)
+        print(f"[AnswerCache] 답변 저장: '{message}' (도구 {', '.join(sorted(tools))}, {latency:.1f}초)")
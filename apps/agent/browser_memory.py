@@ -0,0 +1,94 @@
+import os
+from pathlib import Path
+from time import time
+from typing import Dict, List, Optional, Set
+
+PROC_DIR = Path("/proc")
+
+# Chromium 계열 프로세스 이름 (comm은 최대 15자)
+CHROMIUM_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+# /proc 전체를 매번 훑지 않도록 측정값을 잠시 재사용
+RSS_CACHE_SECONDS = 2.0
+
+_cache: Dict[str, float] = {"measured_at": 0.0, "rss": -1.0}
+
+
+def _read_parent_map() -> Dict[int, List[int]]:
+    """pid -> 자식 pid 목록"""
+    children: Dict[int, List[int]] = {}
+    for entry in PROC_DIR.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후부터 파싱
+        fields = stat[stat.rfind(")") + 2 :].split()
+        children.setdefault(int(fields[1]), []).append(int(entry.name))
+    return children
+
+
+def _read_rss_bytes(pid: int) -> int:
+    try:
+        for line in (PROC_DIR / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _is_chromium(pid: int) -> bool:
+    try:
+        comm = (PROC_DIR / str(pid) / "comm").read_text().strip().lower()
+    except OSError:
+        return False
+    return any(name in comm for name in CHROMIUM_PROCESS_NAMES)
+
+
+def _chromium_descendants() -> Dict[int, int]:
+    """이 서버 프로세스의 하위 Chromium 프로세스 pid -> 부모 pid"""
+    children = _read_parent_map()
+    found: Dict[int, int] = {}
+    stack = [(pid, os.getpid()) for pid in children.get(os.getpid(), [])]
+    while stack:
+        pid, parent = stack.pop()
+        stack.extend((child, pid) for child in children.get(pid, []))
+        if _is_chromium(pid):
+            found[pid] = parent
+    return found
+
+
+def get_chromium_root_pids() -> Set[int]:
+    """브라우저 프로세스(부모가 Chromium이 아닌 Chromium 프로세스) pid 목록"""
+    if not PROC_DIR.exists():
+        return set()
+    found = _chromium_descendants()
+    return {pid for pid, parent in found.items() if parent not in found}
+
+
+def invalidate_rss_cache():
+    """탭/브라우저를 닫은 직후처럼 다음 조회에서 새로 측정해야 할 때 호출합니다."""
+    _cache["measured_at"] = 0.0
+    _cache["rss"] = -1.0
+
+
+def get_browser_rss_bytes() -> Optional[int]:
+    """
+    이 서버 프로세스가 띄운 Chromium 프로세스들의 RSS 합계 (bytes)
+    공유 메모리가 중복 집계되므로 실제보다 약간 크게 나옵니다. /proc이 없으면 None
+    """
+    if not PROC_DIR.exists():
+        return None
+
+    now = time()
+    if now - _cache["measured_at"] < RSS_CACHE_SECONDS and _cache["rss"] >= 0:
+        return int(_cache["rss"])
+
+    total = sum(_read_rss_bytes(pid) for pid in _chromium_descendants())
+
+    _cache["measured_at"] = now
+    _cache["rss"] = float(total)
+    return total
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import signal
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright
+
+from apps.agent.browser_memory import get_chromium_root_pids
+from apps.agent.fast_mode import USAINT_FAST_MODE
+from lib.env import get_env
+
+# 풀에서 유지할 Chromium 프로세스 수
+BROWSER_POOL_SIZE = int(get_env("BROWSER_POOL_SIZE") or 2)
+
+# 브라우저 1개당 허용하는 최대 컨텍스트 수
+BROWSER_MAX_CONTEXTS = int(get_env("BROWSER_MAX_CONTEXTS") or 20)
+
+BROWSER_LAUNCH_ARGS = [
+    "--disable-web-security",
+    "--disable-features=IsolateOrigins,SitePerProcess",
+]
+
+
+class BrowserSlot:
+    """풀에 속한 브라우저 하나와 그 위에서 빌려간 컨텍스트 목록"""
+
+    def __init__(self, index: int, browser: Browser, pid: Optional[int] = None):
+        self.index = index
+        self.browser = browser
+        self.pid = pid  # 멈췄을 때 강제 종료하기 위한 브라우저 프로세스 pid (알 수 없으면 None)
+        self.contexts: List[BrowserContext] = []
+
+    @property
+    def load(self) -> int:
+        return len(self.contexts)
+
+    def is_alive(self) -> bool:
+        return self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    소수의 장기 실행 Chromium 브라우저를 공유하고,
+    세션마다 가벼운 BrowserContext를 빌려주는 풀입니다.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_contexts: int = BROWSER_MAX_CONTEXTS):
+        self.size = size
+        self.max_contexts = max_contexts
+        self.headless = USAINT_FAST_MODE  # fast mode에서는 headless로 실행 (풀 전체에 적용, 세션별 설정은 요청 차단만)
+
+        self.playwright: Optional[Playwright] = None
+        self.slots: List[Optional[BrowserSlot]] = [None] * size
+        self.context_slot_map: Dict[int, BrowserSlot] = {}  # id(context) -> slot
+
+        # 슬롯 상태 변경(컨텍스트 반납, 브라우저 교체)을 대기자에게 알리기 위한 조건 변수
+        self._condition = asyncio.Condition()
+
+    def configure(self, playwright: Playwright):
+        """풀이 사용할 Playwright 인스턴스를 등록합니다."""
+        if self.playwright is None:
+            self.playwright = playwright
+
+    async def _launch(self, index: int) -> BrowserSlot:
+        before = get_chromium_root_pids()
+        browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS,
+        )
+        # 실행 전후로 새로 생긴 브라우저 프로세스를 이 슬롯의 pid로 기록
+        launched = get_chromium_root_pids() - before
+        pid = launched.pop() if len(launched) == 1 else None
+
+        slot = BrowserSlot(index, browser, pid)
+        self.slots[index] = slot
+        print(f"[BrowserPool] 브라우저 #{index} 실행 (pid={pid})")
+        return slot
+
+    async def _pick_slot(self) -> Optional[BrowserSlot]:
+        """
+        가장 적게 사용 중인 브라우저를 고릅니다.
+        비어 있거나 죽은 슬롯이 있고 기존 브라우저가 모두 사용 중이면 새로 띄웁니다.
+        """
+        alive = [slot for slot in self.slots if slot is not None and slot.is_alive()]
+        available = [slot for slot in alive if slot.load < self.max_contexts]
+
+        # 유휴 브라우저가 있으면 새 프로세스를 띄우지 않고 재사용
+        idle = [slot for slot in available if slot.load == 0]
+        if idle:
+            return idle[0]
+
+        empty_index = next(
+            (
+                index
+                for index, slot in enumerate(self.slots)
+                if slot is None or not slot.is_alive()
+            ),
+            None,
+        )
+        if empty_index is not None:
+            return await self._launch(empty_index)
+
+        if available:
+            return min(available, key=lambda slot: slot.load)
+
+        return None
+
+    async def new_context(self, **context_options) -> BrowserContext:
+        """
+        가장 한가한 브라우저에 새 컨텍스트를 생성하여 반환합니다.
+        모든 브라우저가 최대 컨텍스트 수에 도달했으면 반납될 때까지 대기합니다.
+        """
+        if self.playwright is None:
+            raise RuntimeError("BrowserPool이 초기화되지 않았습니다. configure()를 먼저 호출하세요.")
+
+        async with self._condition:
+            while True:
+                slot = await self._pick_slot()
+                if slot is not None:
+                    break
+                print("[BrowserPool] 모든 브라우저가 가득 차 반납을 기다립니다.")
+                await self._condition.wait()
+
+            context = await slot.browser.new_context(**context_options)
+            slot.contexts.append(context)
+            self.context_slot_map[id(context)] = slot
+
+        print(
+            f"[BrowserPool] 브라우저 #{slot.index}에 컨텍스트 할당 "
+            f"({slot.load}/{self.max_contexts})"
+        )
+        return context
+
+    async def release_context(self, context: BrowserContext):
+        """컨텍스트를 닫고 풀에 반납합니다."""
+        try:
+            await context.close()
+        finally:
+            async with self._condition:
+                slot = self.context_slot_map.pop(id(context), None)
+                if slot is not None and context in slot.contexts:
+                    slot.contexts.remove(context)
+                self._condition.notify_all()
+
+    def is_context_alive(self, context: BrowserContext) -> bool:
+        slot = self.context_slot_map.get(id(context))
+        return slot is not None and slot in self.slots and slot.is_alive()
+
+    async def probe_browser(self, context: BrowserContext, timeout: float) -> bool:
+        """
+        컨텍스트가 속한 브라우저에 임시 컨텍스트와 새 탭을 열어 브라우저 자체가 응답하는지 확인합니다.
+        한 탭(렌더러)만 멈춘 경우에는 True이므로 브라우저를 강제 종료할 필요가 없습니다.
+        """
+        slot = self.context_slot_map.get(id(context))
+        if slot is None or slot not in self.slots or not slot.is_alive():
+            return False
+
+        probe_context = None
+        try:
+            probe_context = await asyncio.wait_for(slot.browser.new_context(), timeout=timeout)
+            page = await asyncio.wait_for(probe_context.new_page(), timeout=timeout)
+            await asyncio.wait_for(page.evaluate("1"), timeout=timeout)
+            return True
+        except Exception as e:
+            print(f"[BrowserPool] 브라우저 #{slot.index} 응답 확인 실패: {e}")
+            return False
+        finally:
+            if probe_context is not None:
+                try:
+                    await asyncio.wait_for(probe_context.close(), timeout=timeout)
+                except Exception:
+                    pass
+
+    async def discard_context(self, context: BrowserContext):
+        """브라우저가 죽어 닫을 수 없는 컨텍스트를 풀에서 제거합니다."""
+        async with self._condition:
+            slot = self.context_slot_map.pop(id(context), None)
+            if slot is not None and context in slot.contexts:
+                slot.contexts.remove(context)
+            self._condition.notify_all()
+
+    async def kill_browser(self, context: BrowserContext):
+        """
+        응답하지 않는 컨텍스트가 속한 브라우저를 강제 종료하고 슬롯을 비웁니다.
+        같은 브라우저의 다른 컨텍스트도 함께 사라지므로 각 세션에서 다시 만들어야 합니다.
+        """
+        async with self._condition:
+            slot = self.context_slot_map.get(id(context))
+            if slot is None or self.slots[slot.index] is not slot:
+                return
+
+            self.slots[slot.index] = None
+            for slot_context in slot.contexts:
+                self.context_slot_map.pop(id(slot_context), None)
+            slot.contexts.clear()
+            self._condition.notify_all()
+
+        if slot.pid is not None:
+            try:
+                os.kill(slot.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            try:
+                await asyncio.wait_for(slot.browser.close(), timeout=5)
+            except Exception as e:
+                print(f"[BrowserPool] 브라우저 #{slot.index} 종료 실패: {e}")
+
+        print(f"[BrowserPool] 응답 없는 브라우저 #{slot.index} 강제 종료 (pid={slot.pid})")
+
+    def stats(self) -> List[Dict]:
+        """브라우저별 사용 현황"""
+        return [
+            {
+                "index": index,
+                "alive": slot is not None and slot.is_alive(),
+                "contexts": slot.load if slot else 0,
+            }
+            for index, slot in enumerate(self.slots)
+        ]
+
+    async def close(self):
+        """모든 브라우저를 종료합니다."""
+        for slot in self.slots:
+            if slot is None:
+                continue
+            try:
+                await slot.browser.close()
+            except Exception as e:
+                print(f"[BrowserPool] 브라우저 #{slot.index} 종료 중 오류: {e}")
+
+        self.slots = [None] * self.size
+        self.context_slot_map.clear()
+        print("[BrowserPool] 모든 브라우저 종료 완료")
+
+
+browser_pool = BrowserPool()
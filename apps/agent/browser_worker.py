@@ -0,0 +1,641 @@
+"""
+브라우저 워커 프로세스
+
+Playwright 세션을 API(uvicorn/Socket.io) 프로세스 밖의 별도 프로세스에서 실행합니다.
+API 프로세스는 유닉스 소켓으로 작업 이름과 인자를 보내고 결과만 받아옵니다.
+
+- BROWSER_WORKERS=0 (기본값): 기존처럼 API 프로세스 안에서 직접 실행
+- BROWSER_WORKERS=N: 워커 프로세스 N개를 띄우고, 같은 유세인트 계정(없으면 같은 채팅방)은
+  항상 같은 워커로 보내 탭과 로그인 컨텍스트를 공유합니다.
+
+프로토콜: 한 줄에 JSON 하나
+    요청  {"id": 1, "op": "call_tool", "kwargs": {...}}
+    이벤트 {"id": 1, "event": {...}}      (스트리밍 작업의 중간 결과, 0개 이상)
+    응답  {"id": 1, "result": ...} 또는 {"id": 1, "error": "..."}
+"""
+
+import argparse
+import asyncio
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+from os import getcwd
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from langchain_core.tools import BaseTool, StructuredTool
+from playwright.async_api import Playwright, async_playwright
+
+from apps.agent.academic_fetcher import get_academic_record, get_scholarship_history, get_timetable
+from apps.agent.browser_pool import browser_pool
+from apps.agent.grade_fetcher import fetch_full_grades, get_grades
+from apps.agent.session import BROWSER_MEMORY_BUDGET_MB, MAX_SESSIONS, _get_account_key, session_manager
+from apps.agent.table_extractor import get_iframe_table
+from apps.agent.usaint import (
+    click_element,
+    click_in_iframe,
+    get_iframe_interactive_element,
+    get_iframe_text_content,
+    insert_text,
+    navigate_to,
+    select_navigation_menu,
+    usaint_login,
+)
+from apps.agent.watchdog import WATCHDOG_INTERVAL_SECONDS, session_watchdog
+from lib.env import get_env
+
+# 브라우저 워커 프로세스 수 (0이면 API 프로세스 안에서 실행)
+BROWSER_WORKERS = int(get_env("BROWSER_WORKERS") or 0)
+
+# 워커가 소켓을 열 때까지 기다리는 최대 시간
+WORKER_START_TIMEOUT_SECONDS = 30
+
+# 화면 텍스트 등 큰 결과를 한 줄로 주고받기 위한 버퍼 크기
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# 동시에 진행할 수 있는 세션 예열(join_room) 작업 수 (프로세스별)
+MAX_CONCURRENT_WARM_UPS = int(get_env("MAX_CONCURRENT_WARM_UPS") or 2)
+
+# 워커 안에서 실행하는 주기 작업 간격 (main.py 스케줄러와 동일)
+CLEANUP_INTERVAL_SECONDS = 60
+LOGIN_STATE_REFRESH_INTERVAL_SECONDS = 5 * 60
+
+# 탭을 조작하는 도구 (워커 모드에서는 워커로 전달)
+BROWSER_TOOLS: Dict[str, BaseTool] = {
+    browser_tool.name: browser_tool
+    for browser_tool in [
+        click_in_iframe,
+        click_element,
+        insert_text,
+        get_iframe_interactive_element,
+        get_iframe_text_content,
+        get_iframe_table,
+        get_grades,
+        get_timetable,
+        get_academic_record,
+        get_scholarship_history,
+        navigate_to,
+        select_navigation_menu,
+    ]
+}
+
+
+class BrowserWorkerError(Exception):
+    """워커에서 작업이 실패했거나 워커와 통신할 수 없을 때"""
+
+
+# ---------------------------------------------------------------------------
+# 세션 작업 (워커 프로세스 또는 API 프로세스 안에서 직접 실행)
+# ---------------------------------------------------------------------------
+
+
+async def open_session(
+    playwright: Playwright,
+    session_id: str,
+    usaint_id: Optional[str] = None,
+    usaint_password: Optional[str] = None,
+) -> AsyncIterator[Dict]:
+    """
+    대화 턴을 시작합니다. 세션을 처리 중으로 표시하고,
+    탭이 없으면 자리를 확보한 뒤 시작하고 로그인합니다.
+    """
+    session = session_manager.get_session(session_id)
+    session.update_activity()
+    session.busy = True  # 처리 중에는 축출 대상에서 제외
+
+    # 채팅방 입장 때 시작한 예열이 진행 중이면 끝날 때까지 기다렸다가 그 탭을 사용
+    warm_up = _warm_up_tasks.get(session_id)
+    if warm_up is not None:
+        await asyncio.wait({warm_up})
+
+    # 탭이 죽어 있으면 이번 턴을 시작하기 전에 복구
+    if session.page is not None and (session.broken_reason or session.page.is_closed()):
+        await session_watchdog.recover(session, session.broken_reason or "close")
+
+    if session.page is not None:
+        return
+
+    # 세션 수/메모리 상한에 걸리면 자리가 날 때까지 대기 순번을 알림
+    async for position in session_manager.admit(session_id):
+        yield {
+            "type": "queue",
+            "position": position,
+            "message": f"이용자가 많아 대기 중입니다. (대기 순번: {position})",
+        }
+    try:
+        await session.start(playwright, usaint_id=usaint_id)
+    finally:
+        session_manager.finish_admission(session_id)
+    print(f"[BrowserWorker] 세션 시작: {session_id}")
+
+    # 유세인트 로그인이 필요한 경우
+    if usaint_id and usaint_password:
+        yield {
+            "type": "tool_start",
+            "tool_name": "usaint_login",
+            "message": "유세인트 로그인 중...",
+        }
+        await usaint_login(session, usaint_id, usaint_password)
+        print(f"[BrowserWorker] 유세인트 로그인 완료: {session_id}")
+
+
+# 진행 중인 세션 예열 작업 (session_id -> Task)
+_warm_up_tasks: Dict[str, asyncio.Task] = {}
+_warm_up_slots = asyncio.Semaphore(MAX_CONCURRENT_WARM_UPS)
+
+
+async def warm_up_session(
+    playwright: Playwright,
+    session_id: str,
+    usaint_id: Optional[str] = None,
+    usaint_password: Optional[str] = None,
+) -> bool:
+    """
+    채팅방 입장 시 첫 메시지 전에 탭을 열고 로그인해 둡니다. 작업을 시작했으면 True
+    예열은 추측성 작업이므로 자리가 없거나 동시 예열 수가 가득 차면 건너뜁니다.
+    (다른 세션을 축출하거나 대기열에 들어가지 않음)
+    """
+    if session_id in _warm_up_tasks or _warm_up_slots.locked():
+        return False
+
+    session = session_manager.session_map.get(session_id)
+    if session is not None and session.page is not None:
+        return False
+
+    task = asyncio.create_task(_warm_up(playwright, session_id, usaint_id, usaint_password))
+    _warm_up_tasks[session_id] = task
+    task.add_done_callback(lambda _: _warm_up_tasks.pop(session_id, None))
+    return True
+
+
+async def _warm_up(playwright: Playwright, session_id: str, usaint_id: Optional[str], usaint_password: Optional[str]):
+    async with _warm_up_slots:
+        if not session_manager.has_free_slot():
+            print(f"[BrowserWorker] 자리가 없어 예열을 건너뜁니다: {session_id}")
+            return
+
+        session = session_manager.get_session(session_id)
+        try:
+            # 그 사이 자리가 찼으면 기다리지 않음. 중간에 빠져나온 admit()은 바로 닫아야
+            # 대기열에서 제거되고 다음 대기자에게 알림이 감 (GC에 맡기면 대기열에 남아 있음)
+            admission = session_manager.admit(session_id)
+            try:
+                async for position in admission:
+                    return
+            finally:
+                await admission.aclose()
+            try:
+                await session.start(playwright, usaint_id=usaint_id)
+            finally:
+                session_manager.finish_admission(session_id)
+
+            # 로그인 (저장된 스냅샷이 있으면 포털만 열고 통과) - 포털 첫 화면도 이때 미리 로드됨
+            if usaint_id and usaint_password and not await usaint_login(session, usaint_id, usaint_password):
+                # 로그인에 실패한 탭은 남기지 않고 첫 메시지에서 다시 시도
+                await close_session(playwright, session_id)
+                return
+
+            session.update_activity()
+            print(f"[BrowserWorker] 세션 예열 완료: {session_id}")
+
+        except asyncio.CancelledError:
+            # 사용자가 나갔으면 예열한 탭을 반납 (이미 대화가 시작된 세션은 그대로 둠)
+            if not session.busy:
+                await close_session(playwright, session_id)
+            print(f"[BrowserWorker] 세션 예열 취소: {session_id}")
+            raise
+        except Exception as e:
+            print(f"[BrowserWorker] 세션 예열 실패: {session_id} - {e}")
+            if not session.busy:
+                await close_session(playwright, session_id)
+
+
+async def cancel_warm_up(playwright: Playwright, session_id: str) -> bool:
+    """진행 중인 예열을 취소합니다. 취소할 작업이 있었으면 True"""
+    task = _warm_up_tasks.get(session_id)
+    if task is None:
+        return False
+    task.cancel()
+    return True
+
+
+async def end_turn(playwright: Playwright, session_id: str):
+    """대화 턴이 끝나 세션을 다시 축출 가능 상태로 되돌립니다."""
+    session = session_manager.session_map.get(session_id)
+    if session is not None:
+        session.busy = False
+
+
+async def call_tool(playwright: Playwright, session_id: str, name: str, args: Dict):
+    browser_tool = BROWSER_TOOLS.get(name)
+    if browser_tool is None:
+        raise BrowserWorkerError(f"알 수 없는 도구입니다: {name}")
+
+    # 턴 도중 워커가 재시작되면 이 워커에는 세션이 없음. page=None인 탭으로 실행하지 않고 턴을 실패시킴
+    session = session_manager.session_map.get(session_id)
+    if session is None or session.page is None:
+        raise BrowserWorkerError("브라우저 세션이 종료되었습니다. (브라우저 워커 재시작) 다시 시도해주세요.")
+    return await browser_tool.ainvoke(args)
+
+
+async def fetch_grades(
+    playwright: Playwright, session_id: str, usaint_id: str, usaint_password: str
+) -> Optional[str]:
+    """[스케줄러 전용] 스케줄러용 탭을 열어 전체 성적을 조회한 뒤 바로 반납합니다."""
+    session = session_manager.get_session(session_id)
+    session.update_activity()  # 세션 자동 종료 방지
+
+    try:
+        # 세션이 없거나, 페이지가 닫혔으면 새로 시작
+        if session.page is None or session.page.is_closed():
+            print(f"[BrowserWorker] 스케줄러용 세션이 없어 새로 시작합니다: {session_id}")
+            async for position in session_manager.admit(session_id):
+                pass  # 스케줄러 작업은 대기 순번을 알릴 대상이 없음
+            try:
+                await session.start(playwright, usaint_id=usaint_id)
+            finally:
+                session_manager.finish_admission(session_id)
+            await usaint_login(session, usaint_id, usaint_password)
+            print(f"[BrowserWorker] 스케줄러용 로그인 완료: {session_id}")
+
+        session.busy = True
+        return await fetch_full_grades(session, session_id)
+    finally:
+        # 작업이 끝나면 탭을 바로 반납
+        await close_session(playwright, session_id)
+
+
+async def close_session(playwright: Playwright, session_id: str):
+    """session_id로 세션을 종료합니다."""
+    if session_id in session_manager.session_map:
+        session = session_manager.session_map[session_id]
+        await session.close()
+        del session_manager.session_map[session_id]
+        print(f"[BrowserWorker] 세션 종료: {session_id}")
+
+
+async def get_live_account_keys(playwright: Playwright, session_id: str = "") -> List[str]:
+    """이 워커에서 사용 중인 계정 키 (API 프로세스의 프로필 정리용)"""
+    return list(session_manager.account_map.keys())
+
+
+async def get_stats(playwright: Playwright, session_id: str = ""):
+    return {
+        "pid": os.getpid(),
+        "sessions": session_manager.live_session_count(),
+        "browsers": browser_pool.stats(),
+    }
+
+
+# 워커가 처리할 수 있는 작업 목록 (op 이름 -> 함수)
+WORKER_OPERATIONS = {
+    "open_session": open_session,
+    "warm_up_session": warm_up_session,
+    "cancel_warm_up": cancel_warm_up,
+    "end_turn": end_turn,
+    "call_tool": call_tool,
+    "fetch_grades": fetch_grades,
+    "close_session": close_session,
+    "live_account_keys": get_live_account_keys,
+    "stats": get_stats,
+}
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스
+# ---------------------------------------------------------------------------
+
+
+class BrowserWorker:
+    """워커 프로세스 안에서 소켓 요청을 받아 WORKER_OPERATIONS를 실행합니다."""
+
+    def __init__(self, playwright: Playwright):
+        self.playwright = playwright
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            task = asyncio.create_task(self._handle_request(json.loads(line), writer, write_lock))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        for task in tasks:
+            task.cancel()
+        writer.close()
+
+    async def _handle_request(self, request: Dict, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        request_id = request.get("id")
+        try:
+            operation = WORKER_OPERATIONS.get(request.get("op"))
+            if operation is None:
+                raise BrowserWorkerError(f"알 수 없는 작업입니다: {request.get('op')}")
+
+            result = operation(self.playwright, **request.get("kwargs", {}))
+            if inspect.isasyncgen(result):
+                async for event in result:
+                    await self._send(writer, write_lock, {"id": request_id, "event": event})
+                result = None
+            else:
+                result = await result
+
+            await self._send(writer, write_lock, {"id": request_id, "result": result})
+        except Exception as e:
+            print(f"[BrowserWorker] '{request.get('op')}' 작업 중 오류: {e}")
+            await self._send(writer, write_lock, {"id": request_id, "error": str(e)})
+
+    async def _send(self, writer: asyncio.StreamWriter, write_lock: asyncio.Lock, message: Dict):
+        async with write_lock:
+            writer.write(json.dumps(message, ensure_ascii=False, default=str).encode() + b"\n")
+            await writer.drain()
+
+    async def maintain(self):
+        """API 프로세스의 스케줄러 대신 워커가 소유한 세션을 정리/갱신합니다."""
+        last_refresh = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+            try:
+                await session_manager.cleanup_inactive_sessions(timeout_seconds=60)
+                if loop.time() - last_refresh >= LOGIN_STATE_REFRESH_INTERVAL_SECONDS:
+                    await session_manager.refresh_login_states()
+                    last_refresh = loop.time()
+            except Exception as e:
+                print(f"[BrowserWorker] 주기 작업 중 오류: {e}")
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL_SECONDS)
+            try:
+                await session_watchdog.check_all()
+            except Exception as e:
+                print(f"[BrowserWorker] watchdog 점검 중 오류: {e}")
+
+    async def shutdown(self):
+        for session_id in list(session_manager.session_map.keys()):
+            try:
+                await close_session(self.playwright, session_id)
+            except Exception as e:
+                print(f"[BrowserWorker] 세션 종료 중 오류: {session_id} - {e}")
+        await browser_pool.close()
+
+
+async def run_worker(socket_path: str):
+    # MAX_SESSIONS/BROWSER_MEMORY_BUDGET_MB는 서버 전체 상한이므로 워커 수로 나눠 워커마다 적용
+    workers = max(BROWSER_WORKERS, 1)
+    session_manager.max_sessions = max(MAX_SESSIONS // workers, 1)
+    session_manager.memory_budget_bytes = BROWSER_MEMORY_BUDGET_MB * 1024 * 1024 // workers
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(stop_signal, stop_event.set)
+
+    async with async_playwright() as playwright:
+        worker = BrowserWorker(playwright)
+        server = await asyncio.start_unix_server(
+            worker.handle_connection, path=socket_path, limit=STREAM_LIMIT
+        )
+        # 소켓으로 유세인트 비밀번호와 도구 호출이 오가므로 서버 프로세스 사용자만 접속 가능하게
+        os.chmod(socket_path, 0o600)
+        maintenance = asyncio.create_task(worker.maintain())
+        watch = asyncio.create_task(worker.watch())
+        print(f"[BrowserWorker] 워커 시작 (pid={os.getpid()}, socket={socket_path})")
+
+        await stop_event.wait()
+
+        maintenance.cancel()
+        watch.cancel()
+        server.close()
+        await worker.shutdown()
+        print(f"[BrowserWorker] 워커 종료 (pid={os.getpid()})")
+
+
+# ---------------------------------------------------------------------------
+# API 프로세스 쪽 클라이언트
+# ---------------------------------------------------------------------------
+
+
+class WorkerClient:
+    """워커 프로세스 하나를 띄우고 소켓으로 요청을 주고받습니다."""
+
+    def __init__(self, index: int):
+        self.index = index
+        # 다른 로컬 사용자가 소켓에 접속하지 못하도록 0700 디렉토리 안에 생성
+        self.socket_dir = tempfile.mkdtemp(prefix=f"usaint-browser-worker-{os.getpid()}-{index}-")
+        self.socket_path = os.path.join(self.socket_dir, "worker.sock")
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Queue] = {}
+
+    def is_alive(self) -> bool:
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._read_task is not None
+            and not self._read_task.done()
+        )
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "apps.agent.browser_worker", "--socket", self.socket_path,
+            cwd=getcwd(),
+        )
+
+        deadline = asyncio.get_running_loop().time() + WORKER_START_TIMEOUT_SECONDS
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(
+                    self.socket_path, limit=STREAM_LIMIT
+                )
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if self.process.returncode is not None:
+                    raise BrowserWorkerError(f"브라우저 워커 #{self.index} 실행 실패")
+                if asyncio.get_running_loop().time() > deadline:
+                    raise BrowserWorkerError(f"브라우저 워커 #{self.index} 연결 시간 초과")
+                await asyncio.sleep(0.2)
+
+        self._read_task = asyncio.create_task(self._read_loop())
+        print(f"[BrowserWorkerFarm] 워커 #{self.index} 연결 (pid={self.process.pid})")
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                queue = self._pending.get(message.get("id"))
+                if queue is not None:
+                    queue.put_nowait(message)
+        finally:
+            # 워커가 죽으면 기다리던 요청을 모두 실패 처리
+            for queue in self._pending.values():
+                queue.put_nowait({"error": f"브라우저 워커 #{self.index}와의 연결이 끊어졌습니다."})
+
+    async def request(self, op: str, **kwargs) -> AsyncIterator[Dict]:
+        """요청을 보내고 이벤트/결과 메시지를 순서대로 돌려줍니다. 마지막 메시지는 result 또는 error"""
+        request_id = next(self._request_ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        self._pending[request_id] = queue
+
+        try:
+            async with self._write_lock:
+                self._writer.write(
+                    json.dumps({"id": request_id, "op": op, "kwargs": kwargs}, ensure_ascii=False).encode()
+                    + b"\n"
+                )
+                await self._writer.drain()
+
+            while True:
+                message = await queue.get()
+                yield message
+                if "result" in message or "error" in message:
+                    return
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def stop(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self.process is not None and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        if self._read_task is not None:
+            self._read_task.cancel()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class BrowserWorkerFarm:
+    """브라우저 워커 프로세스들과, 세션이 어느 워커에 있는지(affinity)를 관리합니다."""
+
+    def __init__(self, size: int = BROWSER_WORKERS):
+        self.size = size
+        self.workers: List[WorkerClient] = []
+        self.affinity: Dict[str, int] = {}  # session_id -> 워커 번호
+        self._restart_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    async def start(self):
+        if not self.enabled or self.workers:
+            return
+        self.workers = [WorkerClient(index) for index in range(self.size)]
+        await asyncio.gather(*[worker.start() for worker in self.workers])
+        print(f"[BrowserWorkerFarm] 브라우저 워커 {self.size}개 실행")
+
+    async def stop(self):
+        await asyncio.gather(*[worker.stop() for worker in self.workers], return_exceptions=True)
+        for worker in self.workers:
+            shutil.rmtree(worker.socket_dir, ignore_errors=True)
+        self.workers = []
+        self.affinity.clear()
+        print("[BrowserWorkerFarm] 브라우저 워커 종료 완료")
+
+    def assign(self, session_id: str, usaint_id: Optional[str] = None) -> int:
+        """같은 계정의 세션은 같은 워커로 보내 로그인 컨텍스트를 공유합니다."""
+        key = _get_account_key(session_id, usaint_id)
+        index = int(hashlib.sha1(key.encode()).hexdigest()[:8], 16) % self.size
+        self.affinity[session_id] = index
+        return index
+
+    def forget(self, session_id: str):
+        self.affinity.pop(session_id, None)
+
+    async def _get_worker(self, session_id: str) -> WorkerClient:
+        index = self.affinity.get(session_id)
+        if index is None:
+            index = self.assign(session_id)
+
+        worker = self.workers[index]
+        if not worker.is_alive():
+            async with self._restart_lock:
+                if not worker.is_alive():
+                    # 워커가 죽었으면 다시 띄움 (세션은 로그인 스냅샷으로 복원됨)
+                    print(f"[BrowserWorkerFarm] 워커 #{index} 재시작")
+                    await worker.stop()
+                    await worker.start()
+        return worker
+
+    async def stream(self, session_id: str, op: str, **kwargs) -> AsyncIterator[Dict]:
+        """스트리밍 작업의 중간 이벤트를 돌려줍니다."""
+        worker = await self._get_worker(session_id)
+        async for message in worker.request(op, session_id=session_id, **kwargs):
+            if "event" in message:
+                yield message["event"]
+            elif "error" in message:
+                raise BrowserWorkerError(message["error"])
+
+    async def call(self, session_id: str, op: str, **kwargs):
+        worker = await self._get_worker(session_id)
+        result = None
+        async for message in worker.request(op, session_id=session_id, **kwargs):
+            if "error" in message:
+                raise BrowserWorkerError(message["error"])
+            result = message.get("result")
+        return result
+
+    async def live_account_keys(self) -> Set[str]:
+        """
+        모든 워커에서 사용 중인 계정 키를 모읍니다.
+        sessions/ 디렉토리를 모든 워커가 공유하므로, 응답하지 않는 워커가 있으면 BrowserWorkerError
+        """
+        keys: Set[str] = set()
+        for worker in self.workers:
+            if not worker.is_alive():
+                raise BrowserWorkerError(f"브라우저 워커 #{worker.index}가 응답하지 않습니다.")
+            async for message in worker.request("live_account_keys", session_id=""):
+                if "error" in message:
+                    raise BrowserWorkerError(message["error"])
+                keys.update(message.get("result") or [])
+        return keys
+
+    def proxy_tool(self, browser_tool: BaseTool) -> BaseTool:
+        """같은 이름/스키마로 워커에 도구 호출을 전달하는 도구를 만듭니다."""
+
+        async def call_in_worker(**kwargs):
+            return await self.call(
+                kwargs["session_id"], "call_tool", name=browser_tool.name, args=kwargs
+            )
+
+        return StructuredTool.from_function(
+            coroutine=call_in_worker,
+            name=browser_tool.name,
+            description=browser_tool.description,
+            args_schema=browser_tool.args_schema,
+        )
+
+
+browser_worker_farm = BrowserWorkerFarm()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="유세인트 브라우저 워커")
+    parser.add_argument("--socket", required=True, help="요청을 받을 유닉스 소켓 경로")
+    args = parser.parse_args()
+
+    asyncio.run(run_worker(args.socket))
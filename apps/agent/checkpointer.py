@@ -0,0 +1,399 @@
+"""
+DB 기반 LangGraph 체크포인터
+
+MemorySaver는 모든 대화의 모든 체크포인트를 프로세스 메모리에 영구히 쌓아 두고, 재시작하면 사라지며,
+여러 프로세스가 공유할 수 없습니다. 이 체크포인터는 체크포인트를 DB(로컬은 SQLite, 운영은 서비스 MySQL)에 저장하고
+
+- 대화(thread)마다 최근 CHECKPOINT_KEEP_LATEST개만 남기고 오래된 체크포인트와 쓰기 기록은 삭제
+- 필요한 대화만 요청 시점에 DB에서 읽음 (메모리에 전체를 올리지 않음)
+- 대화 삭제/잘라내기/복구(끊긴 tool_calls 제거) API 제공
+"""
+
+import asyncio
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from lib.database import engine as database_engine
+from lib.env import get_env
+
+ENV = get_env("ENV") or "local"
+
+# 체크포인트 저장 DB. 비우면 로컬(ENV=local)은 SQLite 파일,
+# 그 외에는 여러 워커가 대화를 공유하도록 서비스 DB(lib.database, MySQL)를 사용
+CHECKPOINT_DATABASE_URL = get_env("CHECKPOINT_DATABASE_URL")
+LOCAL_CHECKPOINT_DATABASE_URL = "sqlite:///data/checkpoints.db"
+
+# 대화마다 남겨 둘 최근 체크포인트 수
+CHECKPOINT_KEEP_LATEST = int(get_env("CHECKPOINT_KEEP_LATEST") or 5)
+
+# 체크포인트 한 개에 대화 전체가 들어가므로 MySQL에서는 LONGBLOB이 되도록 길이 지정
+_BLOB = LargeBinary(length=2**32 - 1)
+
+CheckpointBase = declarative_base()
+
+
+class CheckpointRow(CheckpointBase):
+    __tablename__ = "agent_checkpoint"
+
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    # uuid6 기반이라 문자열 정렬 순서가 생성 순서와 같음
+    checkpoint_id = Column(String(64), primary_key=True)
+    parent_checkpoint_id = Column(String(64), nullable=True)
+
+    checkpoint_type = Column(String(50), nullable=False)
+    checkpoint = Column(_BLOB, nullable=False)
+    metadata_type = Column(String(50), nullable=False)
+    checkpoint_metadata = Column("metadata", _BLOB, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class CheckpointWriteRow(CheckpointBase):
+    __tablename__ = "agent_checkpoint_write"
+
+    thread_id = Column(String(255), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    task_id = Column(String(64), primary_key=True)
+    idx = Column(Integer, primary_key=True)
+
+    channel = Column(String(255), nullable=False)
+    value_type = Column(String(50), nullable=False)
+    value = Column(_BLOB, nullable=False)
+    task_path = Column(String(255), nullable=False, default="")
+
+
+def _create_engine(url: str) -> Engine:
+    if url.startswith("sqlite:///"):
+        Path(url.removeprefix("sqlite:///")).parent.mkdir(parents=True, exist_ok=True)
+        # asyncio.to_thread로 여러 스레드에서 접근
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(url, pool_pre_ping=True)
+
+
+_checkpoint_engine: Optional[Engine] = None
+
+
+def get_checkpoint_engine() -> Engine:
+    """체크포인트를 저장할 DB 엔진 (CHECKPOINT_DATABASE_URL > 로컬 SQLite > 서비스 DB)"""
+    global _checkpoint_engine
+    if _checkpoint_engine is None:
+        if CHECKPOINT_DATABASE_URL:
+            _checkpoint_engine = _create_engine(CHECKPOINT_DATABASE_URL)
+        elif ENV == "local":
+            _checkpoint_engine = _create_engine(LOCAL_CHECKPOINT_DATABASE_URL)
+        else:
+            _checkpoint_engine = database_engine
+    return _checkpoint_engine
+
+
+def create_checkpoint_tables(engine: Optional[Engine] = None):
+    """체크포인트 테이블 생성 (앱 시작 시와 scripts/init_db.py에서 호출)"""
+    CheckpointBase.metadata.create_all(engine or get_checkpoint_engine())
+
+
+class DBCheckpointSaver(BaseCheckpointSaver[str]):
+    """SQLAlchemy로 체크포인트를 저장하는 LangGraph 체크포인터 (비동기 메서드는 스레드에서 실행)"""
+
+    def __init__(self, url: Optional[str] = None, keep_latest: int = CHECKPOINT_KEEP_LATEST):
+        super().__init__()
+        self.keep_latest = keep_latest
+        # 테이블은 create_checkpoint_tables()로 앱 시작 시 생성
+        self.engine = _create_engine(url) if url else get_checkpoint_engine()
+        self._session_factory = sessionmaker(bind=self.engine, autoflush=False)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _to_tuple(self, db, row: CheckpointRow) -> CheckpointTuple:
+        writes = (
+            db.query(CheckpointWriteRow)
+            .filter(
+                CheckpointWriteRow.thread_id == row.thread_id,
+                CheckpointWriteRow.checkpoint_ns == row.checkpoint_ns,
+                CheckpointWriteRow.checkpoint_id == row.checkpoint_id,
+            )
+            .order_by(CheckpointWriteRow.task_id, CheckpointWriteRow.idx)
+            .all()
+        )
+        parent_config = None
+        if row.parent_checkpoint_id:
+            parent_config = _make_config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+
+        return CheckpointTuple(
+            config=_make_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint=self.serde.loads_typed((row.checkpoint_type, row.checkpoint)),
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=parent_config,
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.value_type, write.value)))
+                for write in writes
+            ],
+        )
+
+    def _latest_row(self, db, thread_id: str, checkpoint_ns: str = "") -> Optional[CheckpointRow]:
+        return (
+            db.query(CheckpointRow)
+            .filter(CheckpointRow.thread_id == thread_id, CheckpointRow.checkpoint_ns == checkpoint_ns)
+            .order_by(CheckpointRow.checkpoint_id.desc())
+            .first()
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        with self._session_factory() as db:
+            if checkpoint_id:
+                row = db.get(CheckpointRow, (thread_id, checkpoint_ns, checkpoint_id))
+            else:
+                row = self._latest_row(db, thread_id, checkpoint_ns)
+            return self._to_tuple(db, row) if row is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._session_factory() as db:
+            query = db.query(CheckpointRow)
+            if config is not None:
+                configurable = config["configurable"]
+                query = query.filter(CheckpointRow.thread_id == configurable["thread_id"])
+                if "checkpoint_ns" in configurable:
+                    query = query.filter(CheckpointRow.checkpoint_ns == configurable["checkpoint_ns"])
+                if configurable.get("checkpoint_id"):
+                    query = query.filter(CheckpointRow.checkpoint_id == configurable["checkpoint_id"])
+            if before is not None:
+                query = query.filter(CheckpointRow.checkpoint_id < before["configurable"]["checkpoint_id"])
+
+            count = 0
+            for row in query.order_by(CheckpointRow.checkpoint_id.desc()):
+                result = self._to_tuple(db, row)
+                # 메타데이터는 직렬화되어 있으므로 필터는 읽은 뒤 적용
+                if filter and any(result.metadata.get(key) != value for key, value in filter.items()):
+                    continue
+                yield result
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_type, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+
+        with self._session_factory() as db:
+            db.merge(
+                CheckpointRow(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    checkpoint_id=checkpoint["id"],
+                    parent_checkpoint_id=configurable.get("checkpoint_id"),
+                    checkpoint_type=checkpoint_type,
+                    checkpoint=serialized_checkpoint,
+                    metadata_type=metadata_type,
+                    checkpoint_metadata=serialized_metadata,
+                )
+            )
+            self._compact(db, thread_id, checkpoint_ns, self.keep_latest)
+            db.commit()
+
+        return _make_config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"])
+
+        with self._session_factory() as db:
+            for index, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, index)
+                existing = db.get(CheckpointWriteRow, (*key, task_id, idx))
+                # 일반 쓰기는 처음 기록만 유지하고, 특수 채널(오류/중단 등)은 덮어씀
+                if existing is not None and channel not in WRITES_IDX_MAP:
+                    continue
+
+                value_type, serialized_value = self.serde.dumps_typed(value)
+                db.merge(
+                    CheckpointWriteRow(
+                        thread_id=key[0],
+                        checkpoint_ns=key[1],
+                        checkpoint_id=key[2],
+                        task_id=task_id,
+                        idx=idx,
+                        channel=channel,
+                        value_type=value_type,
+                        value=serialized_value,
+                        task_path=task_path,
+                    )
+                )
+            db.commit()
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        if current is None:
+            current_version = 0
+        elif isinstance(current, int):
+            current_version = current
+        else:
+            current_version = int(current.split(".")[0])
+        return f"{current_version + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------------
+    # 정리/복구 API
+    # ------------------------------------------------------------------
+
+    def _compact(self, db, thread_id: str, checkpoint_ns: str, keep: int) -> int:
+        """최근 keep개보다 오래된 체크포인트와 그 쓰기 기록을 삭제합니다."""
+        stale_ids = [
+            checkpoint_id
+            for (checkpoint_id,) in db.query(CheckpointRow.checkpoint_id)
+            .filter(CheckpointRow.thread_id == thread_id, CheckpointRow.checkpoint_ns == checkpoint_ns)
+            .order_by(CheckpointRow.checkpoint_id.desc())
+            .offset(keep)
+            .all()
+        ]
+        if not stale_ids:
+            return 0
+
+        for model in (CheckpointRow, CheckpointWriteRow):
+            db.query(model).filter(
+                model.thread_id == thread_id,
+                model.checkpoint_ns == checkpoint_ns,
+                model.checkpoint_id.in_(stale_ids),
+            ).delete(synchronize_session=False)
+        return len(stale_ids)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """대화의 모든 체크포인트와 쓰기 기록을 삭제합니다."""
+        with self._session_factory() as db:
+            for model in (CheckpointRow, CheckpointWriteRow):
+                db.query(model).filter(model.thread_id == thread_id).delete(synchronize_session=False)
+            db.commit()
+
+    def truncate_thread(self, thread_id: str, keep: int = 1) -> int:
+        """대화의 최근 keep개 체크포인트만 남깁니다. 삭제한 체크포인트 수를 반환"""
+        with self._session_factory() as db:
+            deleted = self._compact(db, thread_id, "", keep)
+            db.commit()
+        return deleted
+
+    def repair_thread(self, thread_id: str) -> bool:
+        """
+        마지막 메시지가 응답(ToolMessage)을 받지 못한 tool_calls이면 제거합니다.
+        최신 체크포인트 한 행만 수정하며, 수정했으면 True
+        """
+        with self._session_factory() as db:
+            row = self._latest_row(db, thread_id)
+            if row is None:
+                return False
+
+            checkpoint = self.serde.loads_typed((row.checkpoint_type, row.checkpoint))
+            messages: List = checkpoint.get("channel_values", {}).get("messages") or []
+            if not _has_dangling_tool_calls(messages):
+                return False
+
+            print(f"[Checkpointer] 불완전한 tool_calls 제거: {len(messages[-1].tool_calls)}개 ({thread_id})")
+            checkpoint["channel_values"]["messages"] = messages[:-1]
+            row.checkpoint_type, row.checkpoint = self.serde.dumps_typed(checkpoint)
+            db.commit()
+        return True
+
+    # ------------------------------------------------------------------
+    # 비동기 메서드 (DB 작업을 스레드에서 실행)
+    # ------------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for result in results:
+            yield result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def _make_config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+    }
+
+
+def _has_dangling_tool_calls(messages: List) -> bool:
+    if not messages:
+        return False
+    last_message = messages[-1]
+    return isinstance(last_message, AIMessage) and bool(getattr(last_message, "tool_calls", None))
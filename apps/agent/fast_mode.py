@@ -0,0 +1,165 @@
+from time import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, Request, Route
+
+from lib.env import get_env
+
+# fast mode: headless 실행 + 불필요한 리소스 차단
+USAINT_FAST_MODE = (get_env("USAINT_FAST_MODE") or "true").lower() == "true"
+
+# DOM만 읽는 에이전트에게 필요 없는 리소스 타입
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# 서드파티 트래커/분석 스크립트 도메인
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "wcs.naver.net",
+)
+
+# 학교 도메인 (이 도메인의 스크립트는 기본 허용)
+FIRST_PARTY_HOST = "ssu.ac.kr"
+
+# iframe 동작에 필요한 SAP WebDynpro/포털 스크립트 (항상 허용)
+SAP_WHITELIST_PATHS = (
+    "/sap/public/bc/ur/",
+    "/sap/public/bc/webdynpro/",
+    "/sap/bc/webdynpro/",
+    "/irj/portalapps/",
+    "/com.sap.portal.",
+)
+
+# 차단된 요청은 응답을 받지 않으므로 크기를 알 수 없어, 리소스 타입별 평균 크기로 절감량을 추정합니다.
+# 차단 없이 로드한 기준 측정(install_fast_mode(block=False))이 있으면 그 평균을, 없으면 아래 기본값을 사용
+DEFAULT_RESOURCE_SIZES = {
+    "image": 30 * 1024,
+    "media": 500 * 1024,
+    "font": 60 * 1024,
+    "script": 40 * 1024,
+}
+_DEFAULT_RESOURCE_SIZE = 10 * 1024
+
+# 리소스 타입별 관측된 응답 크기 [합계, 개수]
+_observed_type_sizes: Dict[str, List[int]] = {}
+
+
+def estimate_resource_size(resource_type: str) -> int:
+    """리소스 타입의 평균 응답 크기 (관측값이 없으면 기본값)"""
+    total, count = _observed_type_sizes.get(resource_type, (0, 0))
+    if count:
+        return total // count
+    return DEFAULT_RESOURCE_SIZES.get(resource_type, _DEFAULT_RESOURCE_SIZE)
+
+
+def _is_whitelisted(url: str) -> bool:
+    return any(path in url for path in SAP_WHITELIST_PATHS)
+
+
+def should_block(url: str, resource_type: str) -> bool:
+    """fast mode에서 요청을 차단할지 결정합니다."""
+    if _is_whitelisted(url):
+        return False
+
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+
+    host = urlparse(url).hostname or ""
+    if any(host == tracker or host.endswith(f".{tracker}") for tracker in TRACKER_HOSTS):
+        return True
+
+    # 학교 도메인이 아닌 서드파티 스크립트 차단
+    if resource_type == "script" and not (host == FIRST_PARTY_HOST or host.endswith(f".{FIRST_PARTY_HOST}")):
+        return True
+
+    return False
+
+
+class ResourceStats:
+    """세션별 요청 차단/로드 통계"""
+
+    def __init__(self):
+        self.blocked_requests = 0
+        self.blocked_bytes = 0  # 리소스 타입별 평균 크기 기반 추정치
+        self.blocked_by_type: Dict[str, int] = {}
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+
+    def record_blocked(self, url: str, resource_type: str):
+        self.blocked_requests += 1
+        self.blocked_bytes += estimate_resource_size(resource_type)
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def record_loaded(self, url: str, resource_type: str, size: int):
+        self.loaded_requests += 1
+        self.loaded_bytes += size
+
+        observed = _observed_type_sizes.setdefault(resource_type, [0, 0])
+        observed[0] += size
+        observed[1] += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "blocked_requests": self.blocked_requests,
+            "blocked_bytes": self.blocked_bytes,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "loaded_requests": self.loaded_requests,
+            "loaded_bytes": self.loaded_bytes,
+        }
+
+
+async def install_fast_mode(page: Page, stats: ResourceStats, block: bool = True):
+    """
+    페이지에 요청 가로채기 레이어를 설치합니다.
+    block=False이면 차단 없이 로드 통계만 수집합니다.
+    """
+
+    async def handle_route(route: Route):
+        request = route.request
+        if should_block(request.url, request.resource_type):
+            stats.record_blocked(request.url, request.resource_type)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def handle_request_finished(request: Request):
+        try:
+            sizes = await request.sizes()
+            stats.record_loaded(
+                request.url,
+                request.resource_type,
+                sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0),
+            )
+        except Exception:
+            pass
+
+    if block:
+        await page.route("**/*", handle_route)
+    page.on("requestfinished", handle_request_finished)
+
+
+def record_navigation_hop(
+    metrics: List[Dict], label: str, started_at: float, before: Dict, after: Dict
+) -> Dict:
+    """메뉴 이동 1회에 대한 소요 시간과 로드/차단 통계 차이를 기록합니다."""
+    hop = {
+        "label": label,
+        "elapsed": round(time() - started_at, 3),
+        "loaded_requests": after["loaded_requests"] - before["loaded_requests"],
+        "loaded_bytes": after["loaded_bytes"] - before["loaded_bytes"],
+        "blocked_requests": after["blocked_requests"] - before["blocked_requests"],
+        "blocked_bytes": after["blocked_bytes"] - before["blocked_bytes"],
+    }
+    metrics.append(hop)
+
+    print(
+        f"[FastMode] '{label}' 이동 {hop['elapsed']}s, "
+        f"로드 {hop['loaded_requests']}건/{hop['loaded_bytes'] // 1024}KB, "
+        f"차단 {hop['blocked_requests']}건/~{hop['blocked_bytes'] // 1024}KB"
+    )
+    return hop
@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from apps.agent.academic_calendar import is_grade_pending_semester
+from apps.agent.academic_data_cache import (
+    DATA_GRADE_STATUS,
+    DATA_GRADES,
+    FINAL_TTL,
+    get_cached_data,
+    get_cached_data_list,
+    get_ttl,
+    invalidate_cached_data,
+    set_cached_data,
+)
+
+# 사용자별 성적 캐시 (academic_data 테이블)
+# - GRADES: 학기마다 {"records": [...], "final": bool}
+#   지난 학기(final)는 다시 조회하지 않음
+# - GRADE_STATUS: {"history_complete": bool, "latest_checked_at": ISO 시각}
+#   "가장 최근 학기 확인 시각"은 현재 학기 성적 TTL(학사 일정에 따라 10~30분)이 지나면 만료
+
+
+def _get_status(usaint_id: str) -> Dict:
+    cached = get_cached_data(usaint_id, DATA_GRADE_STATUS)
+    if cached is None:
+        return {"history_complete": False, "latest_checked_at": None}
+    return cached.data
+
+
+def _set_status(usaint_id: str, **changes):
+    status = {**_get_status(usaint_id), **changes}
+    set_cached_data(usaint_id, DATA_GRADE_STATUS, status, ttl=FINAL_TTL)
+
+
+def is_semester_final(usaint_id: str, year: int, term: str) -> bool:
+    """다시 조회할 필요가 없는 지난 학기 성적이 캐시에 있는지"""
+    # 성적 공개 기간 전에 final로 저장된 학기도 공개 중에는 다시 조회
+    if is_grade_pending_semester(year, term):
+        return False
+    cached = get_cached_data(usaint_id, DATA_GRADES, (year, term))
+    return cached is not None and cached.data["final"]
+
+
+def is_history_complete(usaint_id: str) -> bool:
+    return _get_status(usaint_id)["history_complete"]
+
+
+def set_cached_semester(usaint_id: str, year: int, term: str, records: List[Dict]):
+    """학기 성적을 저장합니다. 조회 시점에 현재 학기도, 성적 공개 중인 학기도 아니면 final로 표시"""
+    set_cached_data(
+        usaint_id,
+        DATA_GRADES,
+        {"records": records, "final": not is_grade_pending_semester(year, term)},
+        semester=(year, term),
+    )
+
+
+def mark_history_complete(usaint_id: str):
+    _set_status(usaint_id, history_complete=True)
+
+
+def mark_latest_checked(usaint_id: str):
+    _set_status(usaint_id, latest_checked_at=datetime.now().isoformat())
+
+
+def get_latest_checked_at(usaint_id: str) -> Optional[datetime]:
+    """가장 최근 학기 성적을 브라우저로 확인한 시각 (응답의 "데이터 기준" 표시용)"""
+    checked_at = _get_status(usaint_id)["latest_checked_at"]
+    return datetime.fromisoformat(checked_at) if checked_at else None
+
+
+def get_cached_grades(usaint_id: str) -> Optional[List[Dict]]:
+    """
+    전 학기 성적이 캐시에 있고 최근 학기 확인이 만료되지 않았으면 전체 기록을 반환합니다.
+    하나라도 부족하면 None (브라우저로 조회 필요)
+    """
+    status = _get_status(usaint_id)
+    if not status["history_complete"] or not status["latest_checked_at"]:
+        return None
+    if datetime.now() - datetime.fromisoformat(status["latest_checked_at"]) > get_ttl(DATA_GRADES):
+        return None
+
+    # 학기 순서대로 정렬되어 있음 (오래된 학기 먼저)
+    semesters = get_cached_data_list(usaint_id, DATA_GRADES)
+    if any(semester.expired for semester in semesters):
+        return None
+    return [record for semester in semesters for record in semester.data["records"]]
+
+
+def invalidate_current_semester(usaint_id: str):
+    """현재 학기 성적만 무효화합니다. 지난 학기 성적은 그대로 유지"""
+    _set_status(usaint_id, latest_checked_at=None)
+    for semester in get_cached_data_list(usaint_id, DATA_GRADES):
+        if not semester.data["final"]:
+            invalidate_cached_data(usaint_id, DATA_GRADES, semester.semester)
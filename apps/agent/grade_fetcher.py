@@ -1,13 +1,58 @@
-from typing import Optional
-from apps.agent.session import Session
-from apps.agent.usaint import _get_frame, _select_navigation_menu, _click_in_iframe
+from typing import List, Optional, Tuple
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+from apps.agent.academic_calendar import TERMS, normalize_term, semester_label
+from apps.agent.academic_data_cache import format_as_of
+from apps.agent.action_lock import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from apps.agent.grade_cache import (
+    get_cached_grades,
+    get_latest_checked_at,
+    invalidate_current_semester,
+    is_history_complete,
+    is_semester_final,
+    mark_history_complete,
+    mark_latest_checked,
+    set_cached_semester,
+)
+from apps.agent.semester_nav import click_semester_button, read_displayed_semester
+from apps.agent.session import Session, session_manager
+from apps.agent.table_extractor import extract_tables
+from apps.agent.usaint import _get_frame, _navigate_to, _select_navigation_menu
 import asyncio
 
+GRADE_MENU_TITLE = "학기별 성적 조회"
+
+# 한 번 방문에서 거슬러 올라갈 최대 학기 수
+MAX_SEMESTER_STEPS = 40
+
+# 성적이 없는 학기가 이만큼 이어지면 입학 이전으로 판단 (휴학 기간 고려)
+MAX_EMPTY_SEMESTERS = 12
+
+# 등급별 평점 (4.5 만점). 표에 평점 열이 있으면 그 값을 우선 사용
+GRADE_POINTS = {
+    "A+": 4.5, "A0": 4.0, "B+": 3.5, "B0": 3.0,
+    "C+": 2.5, "C0": 2.0, "D+": 1.5, "D0": 1.0, "F": 0.0,
+}
+
+
+class GradeRecord(BaseModel):
+    year: int = Field(description="학년도")
+    term: str = Field(description="학기 (1학기/여름학기/2학기/겨울학기)")
+    course: str = Field(description="과목명")
+    credits: Optional[float] = Field(default=None, description="학점")
+    grade: Optional[str] = Field(default=None, description="등급 (A+, B0 등)")
+    gpa: Optional[float] = Field(default=None, description="평점")
+
 
 async def fetch_grade_summary(session: Session, session_id_str: str) -> Optional[str]:
     """
     usaint 세션에서 학기별 성적 조회를 탐색하고 데이터를 추출합니다.
     """
+    async with session.action_lock.hold("fetch_grade_summary", PRIORITY_BACKGROUND):
+        return await _fetch_grade_summary(session, session_id_str)
+
+
+async def _fetch_grade_summary(session: Session, session_id_str: str) -> Optional[str]:
     try:
         await _select_navigation_menu(session_id_str, "학사관리")
         await _select_navigation_menu(session_id_str, "성적/졸업")
@@ -40,69 +85,215 @@ async def fetch_grade_summary(session: Session, session_id_str: str) -> Optional
         return None
 
 
-async def fetch_full_grades(session: Session, session_id_str: str) -> Optional[str]:
+def _parse_float(value: str) -> Optional[float]:
+    try:
+        return float(value.replace(",", "").strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def _find_column(headers: List[str], *names: str, exclude: Tuple[str, ...] = ()) -> Optional[int]:
+    for name in names:
+        for index, header in enumerate(headers):
+            if name in header and not any(word in header for word in exclude):
+                return index
+    return None
+
+
+def _parse_grade_rows(year: int, term: str, headers: List[str], rows: List[List[str]]) -> List[GradeRecord]:
+    """헤더 이름으로 열을 찾아 성적 행을 GradeRecord로 변환합니다."""
+    course_col = _find_column(headers, "과목명")
+    credits_col = _find_column(headers, "학점", exclude=("평점",))
+    grade_col = _find_column(headers, "등급", "성적", exclude=("평점",))
+    gpa_col = _find_column(headers, "평점")
+    if course_col is None:
+        return []
+
+    records = []
+    for cells in rows:
+        if len(cells) <= course_col or not cells[course_col]:
+            continue
+
+        grade = cells[grade_col] if grade_col is not None and grade_col < len(cells) else None
+        gpa = _parse_float(cells[gpa_col]) if gpa_col is not None and gpa_col < len(cells) else None
+        if gpa is None and grade:
+            gpa = GRADE_POINTS.get(grade.strip())
+
+        records.append(
+            GradeRecord(
+                year=year,
+                term=term,
+                course=cells[course_col],
+                credits=_parse_float(cells[credits_col]) if credits_col is not None and credits_col < len(cells) else None,
+                grade=grade or None,
+                gpa=gpa,
+            )
+        )
+    return records
+
+
+async def _walk_grade_semesters(session: Session, session_id_str: str, cache_owner: str):
     """
-    [사용자 요청용] '학기별 성적 조회'의 테이블 전체를 파싱합니다.
-    (현재 2024-1학기 조회를 위해 "이전학기" 2회 클릭 로직 고정)
+    가장 최근 학기부터 "이전학기"로 거슬러 올라가며 학기마다 표를 한 번에 읽어 캐시에 저장합니다.
+    이미 캐시된 지난 학기에 도달하면 (그 이전도 모두 캐시되어 있으므로) 멈춥니다.
     """
-    try:
-        # 1. 성적 페이지로 이동
-        await _select_navigation_menu(session_id_str, "학사관리")
-        await _select_navigation_menu(session_id_str, "성적/졸업")
-        await _select_navigation_menu(session_id_str, "학기별 성적 조회")
+    await _navigate_to(session_id_str, GRADE_MENU_TITLE)
+
+    seen = set()
+    empty_streak = 0
+    for step in range(MAX_SEMESTER_STEPS):
+        semester = (await read_displayed_semester(session))["semester"]
+        if semester is None:
+            raise Exception("성적 화면에서 학년도/학기를 읽지 못했습니다.")
+
+        # 이전학기를 눌러도 학기가 바뀌지 않으면 가장 오래된 학기
+        if semester in seen:
+            break
+        seen.add(semester)
+
+        year, term = semester
+        if step == 0:
+            # 처음 열린 화면이 가장 최근 학기이므로, 이미 final로 저장된 학기여도 확인 시각은 갱신
+            # (방학 중에는 처음 열린 학기가 지난 정규학기라 아래에서 바로 멈출 수 있음)
+            mark_latest_checked(cache_owner)
+        if is_semester_final(cache_owner, year, term) and is_history_complete(cache_owner):
+            break
+
+        tables = await extract_tables(session, header_keyword="과목명")
+        records = _parse_grade_rows(year, term, tables[0].headers, tables[0].rows) if tables else []
+        set_cached_semester(cache_owner, year, term, [record.model_dump() for record in records])
+        print(f"[GradeFetcher] {semester_label(year, term)} 성적 {len(records)}건")
+
+        empty_streak = 0 if records else empty_streak + 1
+        if empty_streak >= MAX_EMPTY_SEMESTERS:
+            break
+
+        # 표 페이지를 넘기면서 화면이 다시 그려졌을 수 있으므로 버튼 표시를 다시 남김
+        if not (await read_displayed_semester(session))["hasPrev"]:
+            break
+        await click_semester_button(session, "prev")
+    else:
+        # 최대 학기 수까지 다 보지 못했으면 다음 조회에서 이어서 확인
+        return
+
+    mark_history_complete(cache_owner)
+
+
+async def fetch_grade_records(
+    session: Session,
+    session_id_str: str,
+    priority: int = PRIORITY_INTERACTIVE,
+    refresh_current: bool = False,
+) -> List[GradeRecord]:
+    """
+    전 학기 성적을 GradeRecord 목록으로 반환합니다. (오래된 학기 먼저)
+    캐시가 유효하면 브라우저를 사용하지 않고, 그렇지 않으면 아직 없는 학기만 조회합니다.
+    """
+    cache_owner = session.usaint_id or session.id
+    if refresh_current:
+        invalidate_current_semester(cache_owner)
+
+    cached = get_cached_grades(cache_owner)
+    if cached is None:
+        async with session.action_lock.hold("fetch_grade_records", priority):
+            await _walk_grade_semesters(session, session_id_str, cache_owner)
+        cached = get_cached_grades(cache_owner)
+
+    # 조회를 마쳤는데도 캐시가 비어 있으면 "성적 없음"이 아니라 조회 실패
+    # (빈 목록으로 넘기면 스케줄러가 성적 변동으로 오인함)
+    if cached is None:
+        raise Exception("성적을 조회했지만 캐시를 채우지 못했습니다. (다음 조회에서 다시 확인합니다)")
+
+    return [GradeRecord(**record) for record in cached]
+
+
+def format_grade_records(records: List[GradeRecord]) -> str:
+    """LLM에 전달하기 위한 TSV 형식"""
+    if not records:
+        return "조회된 성적 데이터가 없습니다."
+
+    lines = ["학년도\t학기\t과목명\t학점\t등급\t평점"]
+    for record in records:
+        lines.append(
+            "\t".join(
+                [
+                    str(record.year),
+                    record.term,
+                    record.course,
+                    "" if record.credits is None else f"{record.credits:g}",
+                    record.grade or "",
+                    "" if record.gpa is None else f"{record.gpa:g}",
+                ]
+            )
+        )
+    return "\n".join(lines)
 
-        frame = await _get_frame(session)
-        if not frame:
-            raise Exception("iframe(_get_frame)을 찾는 데 실패했습니다.")
 
-        target_tbody_selector = "#WD01F4-contentTBody"
-        prev_semester_button_selector = "#WD01E3"  # "이전학기" 버튼 ID
+class GetGradesArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    year: Optional[int] = Field(default=None, description="조회할 학년도 (예: 2024). 비우면 전체")
+    term: Optional[str] = Field(default=None, description="조회할 학기 (1학기/여름학기/2학기/겨울학기). 비우면 전체")
 
-        frame = await _get_frame(session)
-        if not frame:
-            raise Exception("iframe(1)을 찾는 데 실패했습니다.")
 
-        await _click_in_iframe(session_id_str, prev_semester_button_selector)
-        await asyncio.sleep(2)
-        await _click_in_iframe(session_id_str, prev_semester_button_selector)
-        await asyncio.sleep(2)
+@tool(args_schema=GetGradesArgs)
+async def get_grades(session_id: str, year: Optional[int] = None, term: Optional[str] = None):
+    """
+    전 학기 성적(학년도, 학기, 과목명, 학점, 등급, 평점)을 한 번에 조회합니다.
+    지난 학기 성적은 저장된 값을 바로 사용하므로 메뉴 이동이나 학기 이동이 필요 없습니다.
+    결과 끝의 "데이터 기준" 시각을 답변에 함께 안내하세요.
+    """
+    session = session_manager.get_session(session_id)
+    records = await fetch_grade_records(session, session_id)
 
-        frame = await _get_frame(session)
-        if not frame:
-            raise Exception("iframe(3)을 찾는 데 실패했습니다.")
+    if year is not None:
+        records = [record for record in records if record.year == year]
+    if term:
+        normalized = normalize_term(term)
+        records = [record for record in records if record.term == normalized]
 
-        # 3. 테이블 파싱
-        known_1st_semester_subject_id = "#WD023F"
-        await frame.wait_for_selector(known_1st_semester_subject_id, timeout=5000)
-        rows = await frame.locator(f"{target_tbody_selector} tr").all()
+    checked_at = get_latest_checked_at(session.usaint_id or session.id)
+    if checked_at is None:
+        return format_grade_records(records)
+    return f"{format_grade_records(records)}\n{format_as_of(checked_at)}"
 
-        results = []
 
-        for row in rows[1:]:  # 헤더 스킵
-            cols = await row.locator("td").all_inner_texts()
+def summarize_latest_grades(records: List[GradeRecord]) -> str:
+    """가장 최근 학기 성적을 "과목명: 등급" 형식으로 (스케줄러 변경 감지용)"""
+    if not records:
+        return "조회된 성적 데이터가 없습니다."
 
-            if len(cols) >= 4:
-                subject = cols[3].strip()  # 과목명
-                grade = cols[2].strip()  # 등급
+    latest = max((record.year, TERMS.index(record.term)) for record in records)
+    results = [
+        f"{record.course}: {record.grade}"
+        for record in records
+        if (record.year, TERMS.index(record.term)) == latest and record.grade
+    ]
+    if not results:
+        return "조회된 성적 데이터가 없습니다."
 
-                if subject and grade:
-                    results.append(f"{subject}: {grade}")
+    return "\n".join(results)
 
-        print(results)
-        if not results:
-            return "조회된 성적 데이터가 없습니다."
 
-        return "\n".join(results)
+async def fetch_full_grades(session: Session, session_id_str: str) -> Optional[str]:
+    """
+    [스케줄러 전용] 가장 최근 학기 성적을 "과목명: 등급" 형식으로 반환합니다. (변경 감지용)
+    현재 학기만 다시 조회하고, 지난 학기는 캐시를 사용합니다.
+    """
+    try:
+        records = await fetch_grade_records(
+            session, session_id_str, priority=PRIORITY_BACKGROUND, refresh_current=True
+        )
+        return summarize_latest_grades(records)
 
     except Exception as e:
+        # 오류 문구를 결과로 넘기면 이전 결과와 달라 변동 알림이 나가므로 None (이번 회차 건너뜀)
         print(f"[GradeFetcher-Full] '전체 성적' 조회 중 오류: {e}")
-        return f"성적 조회 중 오류가 발생했습니다: {e}"
+        return None
 
 
 async def main():
     """fetch_full_grades 테스트"""
     from playwright.async_api import async_playwright
-    from apps.agent.session import session_manager
     from apps.agent.usaint import usaint_login
     from lib.env import get_env
 
@@ -110,7 +301,7 @@ async def main():
     session = session_manager.get_session(session_id)
 
     async with async_playwright() as playwright:
-        await session.start(playwright)
+        await session.start(playwright, usaint_id=get_env("USAINT_ID"))
         await usaint_login(session, get_env("USAINT_ID"), get_env("USAINT_PASSWORD"))
 
         print("\n=== fetch_full_grades 테스트 시작 ===\n")
@@ -0,0 +1,161 @@
+from typing import List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from apps.agent.tokens import count_message_tokens
+from lib.env import get_env
+
+# LLM 호출 한 번에 보낼 대화 기록 토큰 상한 (시스템 프롬프트 포함)
+HISTORY_TOKEN_BUDGET = int(get_env("HISTORY_TOKEN_BUDGET") or 8000)
+
+# 그대로 보내는 최근 사용자 턴 수 (도구 결과 포함)
+HISTORY_KEEP_RECENT_TURNS = int(get_env("HISTORY_KEEP_RECENT_TURNS") or 2)
+
+# 요약에 넣을 때 메시지 하나당 최대 글자 수
+SUMMARY_MESSAGE_MAX_CHARS = 500
+
+_SUMMARY_PROMPT = (
+    "당신은 숭실대학교 유세인트 챗봇의 대화 기록을 요약하는 도우미입니다. "
+    "기존 요약과 이어지는 대화를 합쳐, 이후 답변에 필요한 사실(사용자가 물어본 것, 조회한 학기/메뉴, "
+    "조회 결과의 핵심 수치, 사용자의 선호)만 한국어 불릿으로 10줄 이내로 정리하세요."
+)
+
+
+class PreparedHistory:
+    def __init__(
+        self,
+        messages: List[BaseMessage],
+        summary: str,
+        removals: List[RemoveMessage],
+        tokens_before: int,
+        tokens_after: int,
+    ):
+        self.messages = messages  # LLM에 보낼 메시지 (시스템 프롬프트 포함)
+        self.summary = summary  # 그래프 상태에 저장할 누적 요약
+        self.removals = removals  # 요약으로 접어 상태에서 지울 메시지
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+
+
+def _split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """사용자 메시지를 기준으로 턴을 나눕니다. (tool_calls와 ToolMessage가 같은 턴에 남도록)"""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _stub_tool_output(message: ToolMessage) -> ToolMessage:
+    """이전 턴의 도구 결과를 짧은 표시로 바꿉니다. (원본은 상태에 그대로 남음)"""
+    return ToolMessage(
+        content=f"[이전 도구 결과 생략: {message.name or '도구'}, {len(str(message.content))}자]",
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+        id=message.id,
+    )
+
+
+def _render_for_summary(messages: List[BaseMessage]) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            role = "사용자"
+        elif isinstance(message, ToolMessage):
+            role = f"도구({message.name})"
+        elif isinstance(message, AIMessage):
+            role = "챗봇"
+            if message.tool_calls and not message.content:
+                lines.append(f"챗봇: [도구 호출] {', '.join(call['name'] for call in message.tool_calls)}")
+                continue
+        else:
+            continue
+        lines.append(f"{role}: {str(message.content)[:SUMMARY_MESSAGE_MAX_CHARS]}")
+    return "\n".join(lines)
+
+
+class HistoryManager:
+    """
+    LLM 호출마다 대화 기록을 토큰 예산 안으로 맞춥니다.
+    1. 최근 HISTORY_KEEP_RECENT_TURNS 턴은 그대로 보냄
+    2. 그보다 오래된 턴의 도구 결과는 짧은 표시로 대체
+    3. 그래도 예산을 넘으면 오래된 턴을 누적 요약에 접고 상태에서 제거
+    """
+
+    def __init__(
+        self,
+        summarizer: BaseChatModel,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        keep_recent_turns: int = HISTORY_KEEP_RECENT_TURNS,
+    ):
+        self.summarizer = summarizer
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+
+    def _build(self, system_prompt: str, summary: str, turns: List[List[BaseMessage]]) -> List[BaseMessage]:
+        recent_start = max(len(turns) - self.keep_recent_turns, 0)
+        messages: List[BaseMessage] = [SystemMessage(content=system_prompt)]
+        if summary:
+            messages.append(SystemMessage(content=f"## 이전 대화 요약\n{summary}"))
+
+        for index, turn in enumerate(turns):
+            for message in turn:
+                if index < recent_start and isinstance(message, ToolMessage):
+                    message = _stub_tool_output(message)
+                messages.append(message)
+        return messages
+
+    async def _summarize(self, summary: str, messages: List[BaseMessage]) -> str:
+        request = [
+            SystemMessage(content=_SUMMARY_PROMPT),
+            HumanMessage(content=f"## 기존 요약\n{summary or '(없음)'}\n\n## 이어지는 대화\n{_render_for_summary(messages)}"),
+        ]
+        response = await self.summarizer.ainvoke(request)
+        return str(response.content).strip()
+
+    async def prepare(
+        self, system_prompt: str, history: List[BaseMessage], summary: Optional[str] = None
+    ) -> PreparedHistory:
+        summary = summary or ""
+        turns = _split_turns(history)
+        tokens_before = count_message_tokens([SystemMessage(content=system_prompt), *history])
+
+        messages = self._build(system_prompt, summary, turns)
+        tokens_after = count_message_tokens(messages)
+
+        # 예산을 넘으면 최근 턴을 제외한 오래된 턴부터 요약으로 접음
+        folded: List[BaseMessage] = []
+        while tokens_after > self.token_budget and len(turns) > self.keep_recent_turns:
+            folded.extend(turns.pop(0))
+            messages = self._build(system_prompt, summary, turns)
+            tokens_after = count_message_tokens(messages)
+
+        removals: List[RemoveMessage] = []
+        if folded:
+            try:
+                summary = await self._summarize(summary, folded)
+            except Exception as e:
+                # 요약에 실패하면 이번 호출은 접지 않고 도구 결과 생략만 적용
+                print(f"[History] 대화 요약 실패: {e}")
+                turns = _split_turns(history)
+                messages = self._build(system_prompt, summary, turns)
+                tokens_after = count_message_tokens(messages)
+            else:
+                removals = [RemoveMessage(id=message.id) for message in folded if message.id]
+                messages = self._build(system_prompt, summary, turns)
+                tokens_after = count_message_tokens(messages)
+
+        print(
+            f"[History] 대화 기록 토큰 {tokens_before} -> {tokens_after} "
+            f"(예산 {self.token_budget}, 요약한 메시지 {len(removals)}개)"
+        )
+        return PreparedHistory(messages, summary, removals, tokens_before, tokens_after)
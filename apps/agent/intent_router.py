@@ -0,0 +1,360 @@
+"""
+의도 라우터
+
+LangGraph 에이전트(큰 시스템 프롬프트 + 최소 두 번의 LLM 호출)를 거치기 전에
+확신할 수 있는 단순 질문만 골라 바로 답합니다.
+- 학식: fetch_cafeteria_menu_data 결과를 템플릿으로
+- 공지 검색: search_notices 결과로 LLM 한 번 호출
+- 성적: 캐시된 성적을 템플릿으로 (캐시가 없으면 브라우저가 필요하므로 에이전트로)
+
+키워드 규칙과 예시 문장 임베딩 최근접 이웃(korean_ef)이 같은 의도를 가리킬 때만 라우팅하고,
+나머지는 모두 에이전트로 넘깁니다.
+"""
+
+import asyncio
+import re
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from apps.agent.academic_calendar import (
+    REGULAR_TERMS,
+    TERMS,
+    compare_semesters,
+    get_latest_regular_semester,
+    normalize_term,
+    semester_label,
+)
+from apps.agent.academic_data_cache import format_as_of
+from apps.agent.cafeteria import RESTAURANT_NAMES, fetch_cafeteria_menu_data
+from apps.agent.grade_cache import get_cached_grades, get_latest_checked_at
+from apps.agent.grade_fetcher import GradeRecord
+from apps.agent.rag import korean_ef, search_notices
+from apps.agent.tool_output import compact_tool_output
+from lib.env import get_env
+
+INTENT_CAFETERIA = "cafeteria"
+INTENT_NOTICE = "notice"
+INTENT_GRADES = "grades"
+INTENT_AGENT = "agent"  # 라우팅하지 않고 에이전트로
+
+INTENT_ROUTER_ENABLED = (get_env("INTENT_ROUTER_ENABLED") or "true").lower() == "true"
+
+# 키워드 규칙과 같은 의도일 때 필요한 최근접 예시 코사인 유사도
+INTENT_ROUTER_MIN_SIMILARITY = float(get_env("INTENT_ROUTER_MIN_SIMILARITY") or 0.6)
+
+# 이보다 긴 질문은 여러 요청이 섞였을 가능성이 높아 에이전트로
+INTENT_ROUTER_MAX_CHARS = 60
+
+# 의도별 예시 문장 (최근접 이웃 분류용)
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    INTENT_CAFETERIA: [
+        "오늘 학식 뭐야",
+        "학식 메뉴 알려줘",
+        "내일 학생식당 메뉴",
+        "도담식당 점심 뭐 나와",
+        "오늘 저녁 학식",
+        "푸드코트 메뉴 보여줘",
+        "금요일 학식 메뉴",
+    ],
+    INTENT_NOTICE: [
+        "장학금 공지 알려줘",
+        "수강신청 공지 있어?",
+        "최근 학사 공지 보여줘",
+        "등록금 납부 공지",
+        "졸업 관련 공지사항 찾아줘",
+        "휴학 신청 공지 알려줘",
+    ],
+    INTENT_GRADES: [
+        "내 성적 알려줘",
+        "이번 학기 성적 보여줘",
+        "2024년 2학기 성적",
+        "25-1학기 학점 조회",
+        "지난 학기 성적 어때",
+    ],
+    INTENT_AGENT: [
+        "수강신청 어떻게 해",
+        "내 시간표 보여줘",
+        "장학금 얼마 받았어",
+        "졸업까지 몇 학점 남았어",
+        "평점 평균 계산해줘",
+        "휴학 신청하고 싶어",
+        "학적 정보 알려줘",
+        "성적 이의신청 하는 방법",
+        "메뉴에서 성적 조회 화면 열어줘",
+        "전공 학점이랑 교양 학점 나눠서 알려줘",
+    ],
+}
+
+_CAFETERIA_KEYWORDS = ("학식", "식당", "밥", "점심", "저녁", "조식", "식단", "푸드코트", "스낵", "스넥", "키친")
+_NOTICE_KEYWORDS = ("공지",)
+_GRADE_KEYWORDS = ("성적", "학점")
+
+# 키워드가 있어도 에이전트가 처리해야 하는 요청 (신청/변경/계산/방법 안내 등)
+_AGENT_KEYWORDS = ("신청", "변경", "취소", "어떻게", "방법", "계산", "남았", "졸업", "이의", "전공", "교양", "평균")
+
+_RESTAURANT_ALIASES = {
+    "학생식당": 1,
+    "도담": 2,
+    "스낵": 4,
+    "스넥": 4,
+    "푸드코트": 5,
+    "키친": 6,
+    "kitchen": 6,
+    "faculty": 7,
+    "교직원": 7,
+}
+
+_WEEKDAYS = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+_NOTICE_PROMPT = (
+    "당신은 숭실대학교 공지사항 안내 챗봇입니다. 아래 검색 결과만 근거로 사용자 질문에 한국어로 짧게 답하세요. "
+    "관련 공지의 제목, 날짜와 링크를 목록으로 안내하고, 검색 결과에 없는 내용은 추측하지 마세요. "
+    "관련 공지가 없으면 찾지 못했다고 답하세요."
+)
+
+
+class RoutedIntent:
+    def __init__(self, intent: str, similarity: float, example: str):
+        self.intent = intent
+        self.similarity = similarity  # 최근접 예시와의 코사인 유사도
+        self.example = example  # 최근접 예시 문장 (로그용)
+
+
+def match_intent_rules(message: str) -> Optional[str]:
+    """키워드 규칙으로 의도를 고릅니다. 여러 의도가 섞였거나 에이전트용 요청이면 None"""
+    lowered = message.lower()
+
+    # "수강신청 공지", "졸업 관련 공지"처럼 공지가 들어가면 공지 검색이 우선
+    if any(word in lowered for word in _NOTICE_KEYWORDS):
+        return INTENT_NOTICE
+    if any(word in lowered for word in _AGENT_KEYWORDS):
+        return None
+
+    matched = set()
+    if any(word in lowered for word in _CAFETERIA_KEYWORDS) or any(alias in lowered for alias in _RESTAURANT_ALIASES):
+        matched.add(INTENT_CAFETERIA)
+    if any(word in lowered for word in _GRADE_KEYWORDS):
+        matched.add(INTENT_GRADES)
+    return matched.pop() if len(matched) == 1 else None
+
+
+def parse_menu_date(message: str, today: Optional[date] = None) -> date:
+    """'오늘', '내일', '11월 12일', '금요일' 같은 표현을 날짜로 (없으면 오늘)"""
+    today = today or date.today()
+    for word, offset in (("모레", 2), ("내일", 1), ("어제", -1), ("오늘", 0)):
+        if word in message:
+            return today + timedelta(days=offset)
+
+    match = re.search(r"(\d{1,2})\s*(?:월|/)\s*(\d{1,2})\s*일?", message)
+    if match:
+        try:
+            return date(today.year, int(match.group(1)), int(match.group(2)))
+        except ValueError:
+            pass
+
+    for index, weekday in enumerate(_WEEKDAYS):
+        if weekday in message or f"{weekday[0]}욜" in message:
+            days = (index - today.weekday()) % 7
+            if "다음주" in message.replace(" ", ""):
+                days += 7
+            return today + timedelta(days=days)
+    return today
+
+
+def parse_restaurant_codes(message: str) -> List[int]:
+    """질문에 나온 식당 코드 (없으면 전체 식당)"""
+    lowered = message.lower()
+    codes = [code for alias, code in _RESTAURANT_ALIASES.items() if alias in lowered]
+    return sorted(set(codes)) or list(RESTAURANT_NAMES)
+
+
+def is_current_semester_query(message: str) -> bool:
+    return "이번" in message or "현재" in message
+
+
+def parse_semester_filter(message: str, today: Optional[date] = None) -> Tuple[Optional[int], Optional[str]]:
+    """
+    '이번 학기', '2024년 2학기', '25-1학기' 같은 표현을 (학년도, 학기)로. 없으면 (None, None)
+    '이번/현재 학기'는 계절학기 기간에도 가장 최근 정규학기로 봅니다.
+    """
+    if is_current_semester_query(message):
+        return get_latest_regular_semester(today)
+
+    match = re.search(r"(\d{2,4})\s*(?:학년도|년)?\s*-?\s*(1학기|2학기|1|2|여름|겨울)", message)
+    if not match:
+        return None, None
+    year = int(match.group(1))
+    if year < 100:
+        year += 2000
+    return year, normalize_term(match.group(2))
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """korean_ef로 임베딩하고 정규화합니다. (내적 = 코사인 유사도)"""
+    vectors = np.array(korean_ef(texts), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class RouterStats:
+    """라우터 적중률 집계"""
+
+    def __init__(self):
+        self.total = 0
+        self.routed = Counter()
+
+    @property
+    def hit_rate(self) -> float:
+        return sum(self.routed.values()) / self.total if self.total else 0.0
+
+    def record(self, intent: Optional[str]):
+        self.total += 1
+        if intent:
+            self.routed[intent] += 1
+        breakdown = ", ".join(f"{name} {count}" for name, count in self.routed.items()) or "없음"
+        print(
+            f"[IntentRouter] {'직접 응답: ' + intent if intent else '에이전트로 전달'} | "
+            f"적중률 {self.hit_rate:.1%} ({sum(self.routed.values())}/{self.total}, {breakdown})"
+        )
+
+
+class IntentRouter:
+    def __init__(self, llm: BaseChatModel):
+        self.llm = llm
+        self.stats = RouterStats()
+        self._examples: List[Tuple[str, str]] = [
+            (intent, example) for intent, examples in INTENT_EXAMPLES.items() for example in examples
+        ]
+        self._example_vectors: Optional[np.ndarray] = None
+
+    def _nearest(self, message: str) -> Tuple[str, float, str]:
+        # 예시 임베딩은 첫 질문에서 한 번만 계산
+        if self._example_vectors is None:
+            self._example_vectors = embed_texts([example for _, example in self._examples])
+
+        similarities = self._example_vectors @ embed_texts([message])[0]
+        best = int(np.argmax(similarities))
+        intent, example = self._examples[best]
+        return intent, float(similarities[best]), example
+
+    async def classify(self, message: str) -> Optional[RoutedIntent]:
+        """확신할 수 있는 의도면 RoutedIntent, 아니면 None (에이전트로)"""
+        message = message.strip()
+        if len(message) > INTENT_ROUTER_MAX_CHARS:
+            return None
+
+        rule_intent = match_intent_rules(message)
+        if rule_intent is None:
+            return None
+
+        intent, similarity, example = await asyncio.to_thread(self._nearest, message)
+        if intent != rule_intent or similarity < INTENT_ROUTER_MIN_SIMILARITY:
+            print(f"[IntentRouter] 규칙({rule_intent})과 최근접 예시({intent}, {similarity:.2f}, '{example}') 불일치")
+            return None
+        return RoutedIntent(intent, similarity, example)
+
+    async def answer(self, routed: RoutedIntent, message: str, usaint_id: Optional[str]) -> Optional[str]:
+        """라우팅한 의도에 바로 답합니다. 직접 답할 수 없으면 None (에이전트로)"""
+        if routed.intent == INTENT_CAFETERIA:
+            return await self._answer_cafeteria(message)
+        if routed.intent == INTENT_NOTICE:
+            return await self._answer_notice(message)
+        if routed.intent == INTENT_GRADES:
+            return self._answer_grades(message, usaint_id)
+        return None
+
+    async def _answer_cafeteria(self, message: str) -> Optional[str]:
+        menu_date = parse_menu_date(message)
+        codes = parse_restaurant_codes(message)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(fetch_cafeteria_menu_data, code, menu_date.strftime("%Y%m%d")) for code in codes)
+        )
+
+        if all("error" in menu_data for menu_data in results):
+            return None  # 학식 사이트 조회 실패 시 에이전트로
+
+        sections = []
+        for menu_data in results:
+            if "error" in menu_data or not menu_data.get("menus"):
+                continue
+            lines = [f"📍 **{menu_data['restaurant_name']}**"]
+            for menu in menu_data["menus"]:
+                line = f"- {menu['category']}: {menu['main_dish'] or '-'}"
+                if menu["side_dishes"]:
+                    line += f" ({', '.join(menu['side_dishes'])})"
+                lines.append(line)
+            sections.append("\n".join(lines))
+
+        date_label = f"{menu_date.month}월 {menu_date.day}일 ({_WEEKDAYS[menu_date.weekday()][0]})"
+        if not sections:
+            if len(codes) == 1:
+                return f"{date_label} {RESTAURANT_NAMES[codes[0]]} 메뉴 정보가 없습니다."
+            return f"{date_label} 학식 메뉴 정보가 없습니다."
+        return f"📅 {date_label} 학식 메뉴입니다.\n\n" + "\n\n".join(sections)
+
+    async def _answer_notice(self, message: str) -> Optional[str]:
+        results = await asyncio.to_thread(search_notices, query=message, n_results=3, date_weight=0.2)
+        if not results:
+            return None  # 검색 실패 시 에이전트가 다시 시도
+
+        context = compact_tool_output("search_ssu_notice", results, message)
+        response = await self.llm.ainvoke(
+            [
+                SystemMessage(content=_NOTICE_PROMPT),
+                HumanMessage(content=f"## 질문\n{message}\n\n## 검색 결과\n{context}"),
+            ]
+        )
+        return str(response.content).strip()
+
+    def _answer_grades(self, message: str, usaint_id: Optional[str]) -> Optional[str]:
+        if not usaint_id:
+            return None
+        cached = get_cached_grades(usaint_id)
+        if cached is None:
+            return None  # 브라우저 조회가 필요하면 에이전트(get_grades)로
+
+        records = [GradeRecord(**record) for record in cached]
+        year, term = parse_semester_filter(message)
+        if is_current_semester_query(message):
+            # 최근 정규학기 성적이 아직 없으면 그 이전 중 성적이 있는 가장 최근 정규학기, 하나도 없으면 에이전트로
+            graded = [
+                (record.year, record.term)
+                for record in records
+                if record.grade
+                and record.term in REGULAR_TERMS
+                and compare_semesters((record.year, record.term), (year, term)) <= 0
+            ]
+            if not graded:
+                return None
+            year, term = max(graded, key=lambda semester: (semester[0], TERMS.index(semester[1])))
+        if year is not None:
+            records = [record for record in records if record.year == year and (term is None or record.term == term)]
+        if not records:
+            target = semester_label(year, term) if year is not None and term else "요청하신 학기"
+            return f"{target} 성적 데이터가 없습니다."
+
+        sections = []
+        semesters = sorted({(record.year, record.term) for record in records}, key=lambda s: (s[0], TERMS.index(s[1])))
+        for semester in semesters:
+            rows = [record for record in records if (record.year, record.term) == semester]
+            lines = [f"**{semester_label(*semester)}**", "| 과목명 | 학점 | 등급 |", "|---|---|---|"]
+            lines += [
+                f"| {record.course} | {'' if record.credits is None else f'{record.credits:g}'} | {record.grade or '-'} |"
+                for record in rows
+            ]
+            graded = [record for record in rows if record.gpa is not None and record.credits]
+            credits = sum(record.credits for record in graded)
+            if credits:
+                average = sum(record.gpa * record.credits for record in graded) / credits
+                lines.append(f"평점평균: {average:.2f}")
+            sections.append("\n".join(lines))
+
+        answer = "\n\n".join(sections)
+        checked_at = get_latest_checked_at(usaint_id)
+        if checked_at is not None:
+            answer += f"\n\n{format_as_of(checked_at)}"
+        return answer
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+from os import getcwd
+from pathlib import Path
+from time import time
+from typing import Optional
+
+from playwright.async_api import BrowserContext
+
+from lib.env import get_env
+
+# 유세인트 계정별 storage_state 스냅샷 저장 위치
+LOGIN_STATE_DIR = Path(f"{getcwd()}/sessions/_accounts")
+
+# 이 시간보다 오래된 스냅샷은 복원하지 않음 (기본 6시간)
+LOGIN_STATE_MAX_AGE_SECONDS = int(get_env("LOGIN_STATE_MAX_AGE_SECONDS") or 6 * 60 * 60)
+
+# 사용 중인 세션의 스냅샷 갱신 주기 (기본 10분)
+LOGIN_STATE_REFRESH_SECONDS = int(get_env("LOGIN_STATE_REFRESH_SECONDS") or 10 * 60)
+
+
+def _account_key(usaint_id: str) -> str:
+    """학번이 파일명에 그대로 남지 않도록 해시로 변환합니다."""
+    return hashlib.sha256(usaint_id.encode()).hexdigest()[:16]
+
+
+def get_login_state_path(usaint_id: str) -> Path:
+    return LOGIN_STATE_DIR / f"{_account_key(usaint_id)}.json"
+
+
+def load_login_state(usaint_id: str) -> Optional[Path]:
+    """복원 가능한 스냅샷 경로를 반환합니다. 없거나 너무 오래되었으면 None"""
+    path = get_login_state_path(usaint_id)
+    if not path.exists():
+        return None
+
+    if time() - path.stat().st_mtime > LOGIN_STATE_MAX_AGE_SECONDS:
+        print(f"[LoginState] 스냅샷이 만료되어 사용하지 않습니다: {path.name}")
+        return None
+
+    return path
+
+
+async def save_login_state(context: BrowserContext, usaint_id: str) -> Path:
+    """로그인된 컨텍스트의 쿠키/스토리지를 계정별 스냅샷으로 저장합니다."""
+    LOGIN_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    path = get_login_state_path(usaint_id)
+    state = await context.storage_state()
+
+    # 세션 쿠키가 담겨 있으므로 소유자만 읽을 수 있게 저장
+    tmp_path = path.with_suffix(".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+    print(f"[LoginState] 로그인 스냅샷 저장: {path.name}")
+    return path
+
+
+def delete_login_state(usaint_id: str):
+    """만료된 스냅샷을 삭제합니다."""
+    path = get_login_state_path(usaint_id)
+    if path.exists():
+        path.unlink()
+        print(f"[LoginState] 만료된 스냅샷 삭제: {path.name}")
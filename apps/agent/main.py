@@ -104,7 +104,7 @@ async def main():
 
     async with async_playwright() as playwright:
         session = session_manager.get_session(session_id)
-        await session.start(playwright)
+        await session.start(playwright, usaint_id=get_env("USAINT_ID"))
 
         print("Logging in to USAINT...")
         await usaint_login(session, get_env("USAINT_ID"), get_env("USAINT_PASSWORD"))
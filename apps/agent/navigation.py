@@ -0,0 +1,200 @@
+import difflib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# 유세인트 메뉴 구조 (리프 값이 문자열이면 해당 화면의 이동 대상 URL)
+MENU_FILE = Path(__file__).parent / "menu.json"
+
+# 실행 중 캡처한 화면별 이동 대상 URL 저장 위치 (모든 계정이 공유하므로 세션 파라미터는 지우고 저장)
+NAVIGATION_TARGETS_FILE = Path("data/navigation_targets.json")
+
+# 포털 창/세션/사용자별로 달라지는 쿼리 파라미터 (소문자)
+SESSION_URL_PARAMS = {
+    "windowid",
+    "currentwindowid",
+    "prevnavtarget",
+    "jsessionid",
+    "sap-user",
+    "sap-ext-sid",
+    "sap-contextid",
+    "sap-sessioncmd",
+    "sap-wd-cltwndid",
+    "sap-wd-appwndid",
+    "sap-wd-tstamp",
+    "sap-wd-norefresh",
+    "sap-ep-iviewhandle",
+}
+
+# 사용자가 자주 쓰는 표현 -> 실제 메뉴명
+MENU_ALIASES = {
+    "성적": "학기별 성적 조회",
+    "성적조회": "학기별 성적 조회",
+    "학기성적": "학기별 성적 조회",
+    "시간표": "개인수업시간표조회",
+    "내시간표": "개인수업시간표조회",
+    "수업시간표": "개인수업시간표조회",
+    "학적": "학적정보 조회 및 수정",
+    "학적정보": "학적정보 조회 및 수정",
+    "장학금": "장학금수혜내역조회",
+    "장학금내역": "장학금수혜내역조회",
+    "수강신청내역": "수강신청내역조회",
+    "수강내역": "수강신청내역조회",
+    "채플": "채플정보조회",
+    "졸업": "졸업사정표",
+    "등록금": "등록금납입 이력조회",
+}
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.split()).lower()
+
+
+def strip_session_params(url: str) -> str:
+    """';jsessionid=' 같은 경로 파라미터와 세션별 쿼리 파라미터를 지운 URL"""
+    parsed = urlparse(url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in SESSION_URL_PARAMS
+    ]
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path.split(";")[0], "", urlencode(query), ""))
+
+
+def is_same_application(url: str, target: str) -> bool:
+    """도착한 화면이 이동 대상과 같은 애플리케이션(호스트와 경로)인지"""
+    landed, expected = urlparse(strip_session_params(url)), urlparse(strip_session_params(target))
+    return (landed.netloc, landed.path.rstrip("/")) == (expected.netloc, expected.path.rstrip("/"))
+
+
+class MenuEntry:
+    def __init__(self, title: str, path: List[str], target: Optional[str] = None):
+        self.title = title
+        self.path = path
+        self.target = target  # 직접 이동 가능한 URL (없으면 경로 재생)
+
+    def path_text(self) -> str:
+        return " > ".join(self.path)
+
+
+class NavigationIndex:
+    """menu.json의 리프 메뉴를 전체 경로와 이동 대상으로 찾기 위한 색인"""
+
+    def __init__(self, menu_data: Dict, captured_targets: Optional[Dict[str, str]] = None):
+        self.entries: Dict[str, MenuEntry] = {}
+        self._collect(menu_data, [])
+
+        for title, target in (captured_targets or {}).items():
+            if title in self.entries and not self.entries[title].target:
+                self.entries[title].target = target
+
+        self._normalized = {_normalize(title): title for title in self.entries}
+
+    def _collect(self, node: Dict, path: List[str]):
+        for title, child in node.items():
+            current_path = path + [title]
+            if isinstance(child, dict):
+                self._collect(child, current_path)
+            else:
+                # 같은 이름의 리프가 여러 곳에 있으면 먼저 나온 경로 사용
+                self.entries.setdefault(title, MenuEntry(title, current_path, child))
+
+    def resolve(self, query: str) -> Optional[MenuEntry]:
+        """메뉴명/별칭/유사 표현으로 리프 메뉴를 찾습니다."""
+        normalized = _normalize(query)
+        if not normalized:
+            return None
+
+        if normalized in self._normalized:
+            return self.entries[self._normalized[normalized]]
+
+        alias = MENU_ALIASES.get(normalized)
+        if alias in self.entries:
+            return self.entries[alias]
+
+        # 부분 일치 (가장 짧은 메뉴명 우선)
+        partial = [key for key in self._normalized if normalized in key]
+        if partial:
+            return self.entries[self._normalized[min(partial, key=len)]]
+
+        close = difflib.get_close_matches(normalized, self._normalized.keys(), n=1, cutoff=0.6)
+        if close:
+            return self.entries[self._normalized[close[0]]]
+
+        return None
+
+    def search(self, query: str, limit: int = 5) -> List[MenuEntry]:
+        """query와 비슷한 리프 메뉴 후보 목록"""
+        normalized = _normalize(query)
+
+        # 메뉴명 일치를 상위 경로 일치보다 먼저 보여줌
+        title_matches = [
+            self.entries[title] for key, title in self._normalized.items() if normalized in key
+        ]
+        path_matches = [
+            self.entries[title]
+            for key, title in self._normalized.items()
+            if normalized not in key and normalized in _normalize("".join(self.entries[title].path))
+        ]
+        matches = title_matches + path_matches
+        if not matches:
+            matches = [
+                self.entries[self._normalized[key]]
+                for key in difflib.get_close_matches(
+                    normalized, self._normalized.keys(), n=limit, cutoff=0.4
+                )
+            ]
+        return matches[:limit]
+
+    def record_target(self, title: str, target: str):
+        """실제 이동 후 캡처한 화면 URL을 저장해 다음부터 바로 이동합니다."""
+        target = strip_session_params(target)
+        entry = self.entries.get(title)
+        if entry is None or entry.target == target:
+            return
+
+        entry.target = target
+        captured = _load_captured_targets()
+        captured[title] = target
+        _save_captured_targets(captured)
+
+    def forget_target(self, title: str):
+        """직접 이동에 실패한 대상은 경로 재생으로 되돌립니다."""
+        entry = self.entries.get(title)
+        if entry is not None:
+            entry.target = None
+
+        captured = _load_captured_targets()
+        if captured.pop(title, None) is not None:
+            _save_captured_targets(captured)
+
+
+def _load_captured_targets() -> Dict[str, str]:
+    if not NAVIGATION_TARGETS_FILE.exists():
+        return {}
+    try:
+        with open(NAVIGATION_TARGETS_FILE, "r", encoding="utf-8") as f:
+            captured = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    # 세션 파라미터를 지우기 전에 저장된 URL도 정리
+    return {title: strip_session_params(target) for title, target in captured.items()}
+
+
+def _save_captured_targets(captured: Dict[str, str]):
+    try:
+        NAVIGATION_TARGETS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(NAVIGATION_TARGETS_FILE, "w", encoding="utf-8") as f:
+            json.dump(captured, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"[Navigation] 이동 대상 저장 실패: {e}")
+
+
+def _build_navigation_index() -> NavigationIndex:
+    with open(MENU_FILE, "r", encoding="utf-8") as f:
+        menu_data = json.load(f)
+    return NavigationIndex(menu_data, _load_captured_targets())
+
+
+navigation_index = _build_navigation_index()
@@ -0,0 +1,146 @@
+import asyncio
+from time import time
+from typing import Dict, List, Optional
+
+from playwright.async_api import Frame, Page, Request
+
+from lib.env import get_env
+
+# 준비 대기 최대 시간 (hard timeout)
+PAGE_READY_TIMEOUT_SECONDS = float(get_env("PAGE_READY_TIMEOUT_SECONDS") or 10)
+
+# 네트워크/DOM 변화가 이 시간 동안 없으면 안정된 것으로 판단
+PAGE_READY_QUIET_MS = int(get_env("PAGE_READY_QUIET_MS") or 300)
+
+# 이 시간 이상 끝나지 않는 요청(롱폴링 등)은 대기 대상에서 제외
+LONG_REQUEST_SECONDS = 8
+
+# 장시간 열려 있는 연결은 네트워크 idle 판단에서 제외
+IGNORED_RESOURCE_TYPES = {"websocket", "eventsource"}
+
+# SAP WebDynpro 처리 중(lock) 표시 요소
+WEBDYNPRO_BUSY_SELECTORS = [
+    "#ur-loading",
+    "#ur-blocklayer",
+    ".urBusyIndicator",
+    ".lsBusyIndicator",
+    "[aria-busy='true']",
+]
+
+# frame 안에서 MutationObserver로 DOM이 잠잠해질 때까지 기다리는 스크립트
+_FRAME_QUIET_SCRIPT = """
+({ quietMs, timeoutMs, busySelectors }) => new Promise((resolve) => {
+    const start = performance.now();
+    let lastMutation = performance.now();
+    const root = document.body || document.documentElement;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+
+    const isBusy = () => busySelectors.some((selector) => {
+        const el = document.querySelector(selector);
+        if (!el) return false;
+        const style = getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden';
+    });
+
+    const tick = () => {
+        const now = performance.now();
+        if (now - start > timeoutMs) {
+            observer.disconnect();
+            resolve(false);
+            return;
+        }
+        if (document.readyState !== 'loading' && !isBusy() && now - lastMutation >= quietMs) {
+            observer.disconnect();
+            resolve(true);
+            return;
+        }
+        setTimeout(tick, 50);
+    };
+    tick();
+})
+"""
+
+
+class NetworkTracker:
+    """페이지(하위 frame 포함)의 진행 중인 요청을 추적합니다."""
+
+    def __init__(self):
+        self.inflight: Dict[Request, float] = {}
+        self.last_change: float = time()
+
+    def install(self, page: Page):
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request: Request):
+        if request.resource_type in IGNORED_RESOURCE_TYPES:
+            return
+        self.inflight[request] = time()
+        self.last_change = time()
+
+    def _on_request_done(self, request: Request):
+        if self.inflight.pop(request, None) is not None:
+            self.last_change = time()
+
+    def pending_count(self) -> int:
+        now = time()
+        return sum(
+            1 for started_at in self.inflight.values() if now - started_at < LONG_REQUEST_SECONDS
+        )
+
+    async def wait_idle(self, deadline: float, quiet_ms: int = PAGE_READY_QUIET_MS) -> bool:
+        """진행 중인 요청이 없고 quiet_ms 동안 새 요청이 없을 때까지 대기합니다."""
+        while time() < deadline:
+            if self.pending_count() == 0 and (time() - self.last_change) * 1000 >= quiet_ms:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+
+async def wait_for_frame_stable(
+    frame: Frame, deadline: float, quiet_ms: int = PAGE_READY_QUIET_MS
+) -> bool:
+    """
+    frame의 DOM 변화가 멈추고 WebDynpro busy 표시가 사라질 때까지 대기합니다.
+    대기 중 frame이 다시 로드되면 새 문서에서 다시 확인합니다.
+    """
+    while time() < deadline:
+        remaining_ms = int((deadline - time()) * 1000)
+        try:
+            return await frame.evaluate(
+                _FRAME_QUIET_SCRIPT,
+                {
+                    "quietMs": quiet_ms,
+                    "timeoutMs": remaining_ms,
+                    "busySelectors": WEBDYNPRO_BUSY_SELECTORS,
+                },
+            )
+        except Exception as e:
+            if frame.is_detached():
+                return False
+            # 실행 컨텍스트가 교체된 경우(내비게이션) 잠시 후 재시도
+            print(f"[PageReady] frame 재확인: {e}")
+            await asyncio.sleep(0.05)
+    return False
+
+
+def record_ready_wait(
+    waits: List[Dict], label: str, started_at: float, stable: bool
+) -> Dict:
+    """준비 대기에 실제로 걸린 시간을 기록합니다."""
+    wait = {
+        "label": label,
+        "elapsed": round(time() - started_at, 3),
+        "stable": stable,
+    }
+    waits.append(wait)
+
+    status = "안정" if stable else "타임아웃"
+    print(f"[PageReady] '{label}' {wait['elapsed']}s ({status})")
+    return wait
+
+
+def get_deadline(timeout: Optional[float] = None) -> float:
+    return time() + (timeout if timeout is not None else PAGE_READY_TIMEOUT_SECONDS)
@@ -0,0 +1,165 @@
+import shutil
+from os import getcwd
+from pathlib import Path
+from time import time
+from typing import Dict, Iterable, List, Set
+
+from apps.agent.login_state import LOGIN_STATE_DIR, LOGIN_STATE_MAX_AGE_SECONDS
+from lib.env import get_env
+
+# 세션(계정)별 프로필 디렉토리 위치
+SESSIONS_DIR = Path(f"{getcwd()}/sessions")
+
+# sessions/ 전체 디스크 사용량 상한 (MB)
+PROFILE_DISK_BUDGET_MB = int(get_env("PROFILE_DISK_BUDGET_MB") or 1024)
+
+# 닫힌 세션의 프로필을 바로 지우지 않고 기다리는 시간 (곧 다시 열리는 경우 대비)
+PROFILE_GC_GRACE_SECONDS = 10 * 60
+
+# 사용 중인 프로필에서도 지워도 되는 Chromium 캐시 디렉토리
+CACHE_SUBDIRS = [
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "GrShaderCache",
+    "ShaderCache",
+    "Service Worker/CacheStorage",
+    "Service Worker/ScriptCache",
+]
+
+
+def _size_of(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+
+    total = 0
+    for child in path.rglob("*"):
+        try:
+            if child.is_file() and not child.is_symlink():
+                total += child.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def _last_modified(path: Path) -> float:
+    """디렉토리 안에서 가장 최근에 수정된 시각"""
+    latest = path.stat().st_mtime
+    for child in path.rglob("*"):
+        try:
+            latest = max(latest, child.stat().st_mtime)
+        except OSError:
+            continue
+    return latest
+
+
+def _remove(path: Path) -> int:
+    """삭제하고 확보한 bytes를 반환합니다."""
+    size = _size_of(path)
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except OSError as e:
+        print(f"[ProfileGC] 삭제 실패: {path} - {e}")
+        return 0
+    return size
+
+
+def _trim_caches(profile_dir: Path) -> int:
+    reclaimed = 0
+    for base in (profile_dir, profile_dir / "Default"):
+        for name in CACHE_SUBDIRS:
+            cache_dir = base / name
+            if cache_dir.is_dir():
+                reclaimed += _remove(cache_dir)
+    return reclaimed
+
+
+def _snapshot_names(live_keys: Iterable[str]) -> Set[str]:
+    """계정 키(account_<hash>)에 해당하는 로그인 스냅샷 파일명"""
+    return {
+        f"{key[len('account_'):]}.json" for key in live_keys if key.startswith("account_")
+    }
+
+
+def collect_profiles(live_keys: Set[str], budget_mb: int = PROFILE_DISK_BUDGET_MB) -> Dict:
+    """
+    sessions/ 아래 프로필과 로그인 스냅샷을 정리하고 결과를 반환합니다.
+
+    1. 만료된 로그인 스냅샷 삭제
+    2. 사용 중인 프로필은 캐시만 정리, 닫힌 지 오래된 프로필은 삭제
+    3. 그래도 상한을 넘으면 사용 중이 아닌 것부터 오래된 순으로 삭제
+    """
+    report = {
+        "deleted_profiles": 0,
+        "trimmed_profiles": 0,
+        "deleted_snapshots": 0,
+        "reclaimed_bytes": 0,
+        "total_bytes": 0,
+    }
+    if not SESSIONS_DIR.exists():
+        return report
+
+    now = time()
+    live_snapshots = _snapshot_names(live_keys)
+
+    # 1. 만료된 로그인 스냅샷 (복원에 쓰이지 않음)
+    snapshots: List[Path] = []
+    if LOGIN_STATE_DIR.exists():
+        for snapshot in LOGIN_STATE_DIR.iterdir():
+            if not snapshot.is_file():
+                continue
+            if now - snapshot.stat().st_mtime > LOGIN_STATE_MAX_AGE_SECONDS:
+                report["reclaimed_bytes"] += _remove(snapshot)
+                report["deleted_snapshots"] += 1
+            elif snapshot.name not in live_snapshots:
+                snapshots.append(snapshot)
+
+    # 2. 세션별 프로필 디렉토리
+    idle_profiles: List[Path] = []
+    for profile_dir in SESSIONS_DIR.iterdir():
+        if not profile_dir.is_dir() or profile_dir == LOGIN_STATE_DIR:
+            continue
+
+        if profile_dir.name in live_keys:
+            reclaimed = _trim_caches(profile_dir)
+            if reclaimed:
+                report["reclaimed_bytes"] += reclaimed
+                report["trimmed_profiles"] += 1
+        elif now - _last_modified(profile_dir) > PROFILE_GC_GRACE_SECONDS:
+            report["reclaimed_bytes"] += _remove(profile_dir)
+            report["deleted_profiles"] += 1
+        else:
+            idle_profiles.append(profile_dir)
+
+    # 3. 디스크 상한 초과 시 사용 중이 아닌 프로필 -> 스냅샷 순으로 오래된 것부터 삭제
+    total = _size_of(SESSIONS_DIR)
+    budget = budget_mb * 1024 * 1024
+    if total > budget:
+        candidates = sorted(idle_profiles, key=_last_modified) + sorted(
+            snapshots, key=lambda path: path.stat().st_mtime
+        )
+        for path in candidates:
+            if total <= budget:
+                break
+            reclaimed = _remove(path)
+            total -= reclaimed
+            report["reclaimed_bytes"] += reclaimed
+            if path.parent == LOGIN_STATE_DIR:
+                report["deleted_snapshots"] += 1
+            else:
+                report["deleted_profiles"] += 1
+
+        if total > budget:
+            print(f"[ProfileGC] 사용 중인 프로필만으로 상한({budget_mb}MB)을 넘었습니다.")
+
+    report["total_bytes"] = total
+    print(
+        f"[ProfileGC] 프로필 삭제 {report['deleted_profiles']}개, "
+        f"캐시 정리 {report['trimmed_profiles']}개, 스냅샷 삭제 {report['deleted_snapshots']}개, "
+        f"확보 {report['reclaimed_bytes'] / 1024 / 1024:.1f}MB, "
+        f"현재 {total / 1024 / 1024:.1f}MB / {budget_mb}MB"
+    )
+    return report
@@ -15,6 +15,26 @@ korean_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
 # chroma db - persistent client로 변경
 chroma_client = chromadb.PersistentClient(path="./chroma_db")
 
+# 이 프로세스에서 공지 인덱스를 바꾼 횟수 (응답 캐시 무효화용, get_notice_index_version 참고)
+_notice_index_changes = 0
+
+
+def _mark_notice_index_changed():
+    global _notice_index_changes
+    _notice_index_changes += 1
+
+
+def get_notice_index_version(collection_name: str = "ssu_notice") -> str:
+    """
+    공지 인덱스가 바뀌면 달라지는 값
+    다른 프로세스에서 공지를 추가한 경우도 알 수 있도록 문서 수를 함께 사용합니다.
+    """
+    try:
+        count = chroma_client.get_collection(name=collection_name).count()
+    except Exception:
+        count = 0
+    return f"{_notice_index_changes}:{count}"
+
 
 def add_notices_to_chromadb(
     json_path: str = "data/ssu_notice.json",
@@ -142,6 +162,7 @@ def add_notices_to_chromadb(
         print(f"건너뜀: {skip_count}개")
         print(f"컬렉션 총 문서 수: {collection.count()}개")
 
+        _mark_notice_index_changed()
         return result
 
     except Exception as e:
@@ -163,6 +184,7 @@ def reset_collection(collection_name: str = "ssu_notice") -> Dict[str, str]:
     """
     try:
         chroma_client.delete_collection(name=collection_name)
+        _mark_notice_index_changed()
         print(f"컬렉션 '{collection_name}'이(가) 삭제되었습니다.")
         return {"status": "success", "message": f"컬렉션 '{collection_name}' 삭제 완료"}
     except Exception as e:
@@ -186,6 +208,7 @@ def reset_chromadb() -> Dict[str, str]:
             print(f"컬렉션 '{collection.name}' 삭제됨")
             deleted_count += 1
 
+        _mark_notice_index_changed()
         print(f"\n총 {deleted_count}개의 컬렉션이 삭제되었습니다.")
         return {
             "status": "success",
@@ -0,0 +1,113 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from apps.agent.academic_calendar import TERMS, normalize_term
+from apps.agent.session import Session
+from apps.agent.usaint import _click_in_iframe, _get_frame
+
+# 스크립트가 이전학기/다음학기 버튼에 붙이는 표시 ("prev" / "next")
+SEMESTER_BUTTON_ATTRIBUTE = "data-agent-semester-move"
+
+# 목표 학기까지 이동할 때 최대 클릭 수 (3년)
+MAX_SEMESTER_MOVES = 12
+
+# 화면에 표시된 학년도/학기를 읽고 이전학기/다음학기 버튼에 표시를 남기는 스크립트
+_SEMESTER_SCRIPT = """
+(attribute) => {
+    const text = (el) => (el ? (el.innerText || el.textContent || '') : '').trim();
+    const compact = (value) => value.replace(/\\s/g, '');
+
+    // 학년도/학기 입력 필드 (라벨로 구분)
+    let year = null;
+    let term = null;
+    document.querySelectorAll('input').forEach((input) => {
+        const value = (input.value || '').trim();
+        if (!value) return;
+        const label = compact(
+            text(input.labels?.[0]) || input.getAttribute('aria-label') || input.title || text(input.previousElementSibling)
+        );
+        if (year === null && label.includes('학년도')) year = value;
+        else if (term === null && label.includes('학기')) term = value;
+    });
+
+    document.querySelectorAll(`[${attribute}]`).forEach((el) => el.removeAttribute(attribute));
+    const buttons = Array.from(document.querySelectorAll("[role='button'], button, a"));
+    const mark = (name, direction) => {
+        const button = buttons.find((el) => compact(text(el)) === name || el.title === name);
+        if (button) button.setAttribute(attribute, direction);
+        return Boolean(button);
+    };
+
+    return { year, term, hasPrev: mark('이전학기', 'prev'), hasNext: mark('다음학기', 'next') };
+}
+"""
+
+
+def semester_order(year: int, term: str) -> int:
+    """학기 순서 비교용 값 (1학기 < 여름학기 < 2학기 < 겨울학기 < 다음 학년도 1학기)"""
+    return year * len(TERMS) + TERMS.index(term)
+
+
+def parse_semester(text: str) -> Optional[Tuple[int, str]]:
+    """'2025-2', '25-1학기', '2024학년도 여름학기' 같은 표기를 (학년도, 학기)로 바꿉니다."""
+    match = re.search(r"(\d{2,4})\s*(?:학년도|년)?\s*[-./ ]?\s*(.*)", text.strip())
+    if not match:
+        return None
+
+    year = int(match.group(1))
+    if year < 100:
+        year += 2000
+
+    term = normalize_term(match.group(2))
+    if term is None:
+        return None
+    return year, term
+
+
+async def read_displayed_semester(session: Session) -> Dict:
+    """
+    현재 화면의 학기와 이동 버튼 유무를 반환합니다.
+    {"semester": (학년도, 학기) 또는 None, "hasPrev": bool, "hasNext": bool}
+    """
+    frame = await _get_frame(session)
+    page = await frame.evaluate(_SEMESTER_SCRIPT, SEMESTER_BUTTON_ATTRIBUTE)
+
+    semester = None
+    year = re.search(r"\d{4}", page.get("year") or "")
+    term = normalize_term(page.get("term") or "")
+    if year and term:
+        semester = (int(year.group()), term)
+
+    return {"semester": semester, "hasPrev": page["hasPrev"], "hasNext": page["hasNext"]}
+
+
+async def click_semester_button(session: Session, direction: str):
+    """read_displayed_semester가 표시한 이전학기("prev")/다음학기("next") 버튼을 클릭합니다."""
+    await _click_in_iframe(session.id, f'[{SEMESTER_BUTTON_ATTRIBUTE}="{direction}"]')
+
+
+async def move_to_semester(session: Session, year: int, term: str, max_moves: int = MAX_SEMESTER_MOVES) -> bool:
+    """
+    이전학기/다음학기 버튼으로 목표 학기까지 이동합니다. (호출하는 쪽에서 action lock을 잡아야 함)
+    도착하면 True, 버튼이 없거나 학기가 바뀌지 않으면 False
+    """
+    target = semester_order(year, term)
+    previous = None
+    for _ in range(max_moves + 1):
+        displayed = await read_displayed_semester(session)
+        # 학기를 읽지 못했거나, 눌렀는데 학기가 그대로면 더 갈 수 없는 끝
+        if displayed["semester"] is None or displayed["semester"] == previous:
+            return False
+
+        current = semester_order(*displayed["semester"])
+        if current == target:
+            return True
+
+        direction = "prev" if current > target else "next"
+        if not displayed["hasPrev" if direction == "prev" else "hasNext"]:
+            return False
+
+        previous = displayed["semester"]
+        await click_semester_button(session, direction)
+
+    return False
@@ -1,41 +1,305 @@
+from collections import deque
 from os import getcwd
 from pathlib import Path
 from time import time
-from typing import Dict, Optional
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+import hashlib
 import threading
 import asyncio
 
-from playwright.async_api import BrowserContext, Page, Playwright
+from playwright.async_api import BrowserContext, Frame, Page, Playwright
 
+from apps.agent.action_lock import ActionLock
+from apps.agent.browser_memory import get_browser_rss_bytes, invalidate_rss_cache
+from apps.agent.browser_pool import browser_pool
+from apps.agent.fast_mode import USAINT_FAST_MODE, ResourceStats, install_fast_mode
+from apps.agent.page_ready import NetworkTracker
+from apps.agent.text_snapshot import TextSnapshots
+from apps.agent.login_state import (
+    LOGIN_STATE_REFRESH_SECONDS,
+    load_login_state,
+    save_login_state,
+)
+from lib.env import get_env
 
-class Session:
+# 계정 하나가 동시에 열 수 있는 최대 탭(대화) 수
+ACCOUNT_MAX_TABS = int(get_env("ACCOUNT_MAX_TABS") or 4)
 
-    def __init__(self, session_id: str):
-        self.id = session_id
-        self.user_data_dir = Path(f"{getcwd()}/sessions/{self.id}")  # 세션별 디렉토리
-        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+# 동시에 브라우저 탭을 가진 세션 최대 수
+MAX_SESSIONS = int(get_env("MAX_SESSIONS") or 30)
+
+# Chromium 프로세스 RSS 합계 상한 (MB, 0이면 메모리 기준 제한 없음)
+BROWSER_MEMORY_BUDGET_MB = int(get_env("BROWSER_MEMORY_BUDGET_MB") or 4096)
+
+# 입장 대기열에서 기다릴 최대 시간
+ADMISSION_TIMEOUT_SECONDS = int(get_env("ADMISSION_TIMEOUT_SECONDS") or 120)
+
+
+class AccountSession:
+    """
+    유세인트 계정 하나가 공유하는 인증된 BrowserContext입니다.
+    같은 학생의 채팅방과 스케줄러 작업은 이 컨텍스트에서 탭(Page)을 하나씩 빌려 씁니다.
+    """
+
+    def __init__(self, key: str, usaint_id: Optional[str] = None):
+        self.key = key
+        self.usaint_id = usaint_id
+        self.user_data_dir = Path(f"{getcwd()}/sessions/{key}")  # 계정별 디렉토리
         self.save_path = Path.joinpath(self.user_data_dir, "state.json")
 
         self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
-        self.last_activity_time: float = time()  # 마지막 활동 시간
+        self.logged_in: bool = False
+        self.login_state_saved_at: float = 0
+
+        # session_id -> 빌려준 탭
+        self.tabs: Dict[str, Page] = {}
+        self.max_tabs = ACCOUNT_MAX_TABS
+
+        # 탭 제한에 걸렸을 때 순서대로 깨우기 위한 대기열 (FIFO)
+        self._leased_slots = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self._start_lock = asyncio.Lock()
+        self.login_lock = asyncio.Lock()  # 같은 계정으로 동시에 폼 로그인하지 않도록
 
-    async def start(self, playwright: Playwright):
-        self.context = await playwright.chromium.launch_persistent_context(
-            user_data_dir=self.user_data_dir,
-            headless=False,
-            args=[
-                "--disable-web-security",
-                "--disable-features=IsolateOrigins,SitePerProcess",
-            ],
+    async def ensure_context(self, playwright: Playwright):
+        """컨텍스트가 없으면 브라우저 풀에서 빌려옵니다."""
+        async with self._start_lock:
+            if self.context is not None:
+                return
+
+            browser_pool.configure(playwright)
+
+            # 계정별 로그인 스냅샷이 있으면 우선 복원, 없으면 state.json 사용
+            storage_state = load_login_state(self.usaint_id) if self.usaint_id else None
+            if storage_state is None and self.save_path.exists():
+                storage_state = self.save_path
+
+            self.logged_in = False
+            self.context = await browser_pool.new_context(storage_state=storage_state)
+
+    async def reset_context(self):
+        """
+        브라우저가 죽어 쓸 수 없게 된 컨텍스트를 버립니다.
+        다음 ensure_context()에서 로그인 스냅샷으로 다시 만듭니다.
+        """
+        if self.context is not None:
+            await browser_pool.discard_context(self.context)
+        self.context = None
+        self.logged_in = False
+
+    async def _acquire_slot(self):
+        if self._leased_slots < self.max_tabs and not self._waiters:
+            self._leased_slots += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        print(
+            f"[AccountSession] 탭 제한({self.max_tabs}) 도달, 대기열 {len(self._waiters)}번째: {self.key}"
         )
+        try:
+            # 반납하는 쪽이 슬롯을 그대로 넘겨줌
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def _release_slot(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._leased_slots -= 1
+
+    async def lease_page(self, session_id: str) -> Page:
+        """대화(session_id)에 탭을 빌려줍니다. 제한에 걸리면 순서대로 대기합니다."""
+        page = self.tabs.get(session_id)
+        if page is not None and not page.is_closed():
+            return page
+
+        if page is None:
+            await self._acquire_slot()
+
+        try:
+            page = await self.context.new_page()
+        except Exception:
+            self.tabs.pop(session_id, None)
+            self._release_slot()
+            raise
+
+        self.tabs[session_id] = page
+        return page
+
+    async def release_page(self, session_id: str):
+        """대화가 사용하던 탭을 닫고 슬롯을 반납합니다."""
+        if session_id not in self.tabs:
+            return
+
+        page = self.tabs.pop(session_id)
+        try:
+            if not page.is_closed():
+                await page.close()
+        finally:
+            self._release_slot()
 
-        self.page = (
-            self.context.pages[0]
-            if self.context.pages
-            else await self.context.new_page()
+    def is_idle(self) -> bool:
+        # 탭을 여는 중(슬롯은 받았지만 아직 tabs에 없음)인 대화가 있으면 유휴가 아님
+        return not self.tabs and not self._waiters and self._leased_slots == 0
+
+    async def save_state(self):
+        """
+        현재 컨텍스트의 쿠키/스토리지를 저장합니다.
+        로그인이 확인된 계정은 계정별 스냅샷으로, 그 외에는 state.json에 저장합니다.
+        """
+        if not self.context:
+            return
+
+        if self.usaint_id and self.logged_in:
+            await save_login_state(self.context, self.usaint_id)
+            self.login_state_saved_at = time()
+        else:
+            self.user_data_dir.mkdir(parents=True, exist_ok=True)
+            await self.context.storage_state(path=self.save_path)
+
+    def needs_login_state_refresh(self) -> bool:
+        """로그인 스냅샷을 갱신할 시점인지 확인"""
+        return (
+            self.context is not None
+            and self.usaint_id is not None
+            and self.logged_in
+            and time() - self.login_state_saved_at > LOGIN_STATE_REFRESH_SECONDS
         )
 
+    async def close(self):
+        if self.context:
+            try:
+                await self.save_state()
+            except Exception as e:
+                print(f"[AccountSession] 상태 저장 실패: {self.key} - {e}")
+            await browser_pool.release_context(self.context)
+            self.context = None
+
+        self.tabs.clear()
+        self.logged_in = False
+
+
+class Session:
+    """채팅방(또는 스케줄러 작업) 하나의 대화 세션. 계정 컨텍스트의 탭 하나를 사용합니다."""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.account: Optional[AccountSession] = None
+        self.page: Optional[Page] = None
+        self.playwright: Optional[Playwright] = None  # 복구 시 다시 시작하기 위해 보관
+        self.broken_reason: Optional[str] = None  # 탭이 죽었으면 원인 (crash/close)
+        self.last_activity_time: float = time()  # 마지막 활동 시간
+        self.busy: bool = False  # 대화/작업 처리 중이면 축출하지 않음
+
+        # 이 탭을 조작하는 동작(도구 호출, 스케줄러 조회)을 하나씩 실행
+        self.action_lock = ActionLock(session_id)
+
+        # fast mode 리소스 차단 통계 및 메뉴 이동별 측정값
+        # (세션별로는 요청 차단만 켜고 끌 수 있음. headless 여부는 브라우저 풀 전체에 USAINT_FAST_MODE로 적용)
+        self.block_resources: bool = USAINT_FAST_MODE
+        self.resource_stats = ResourceStats()
+        self.navigation_metrics: List[Dict] = []
+        self.navigation_path: List[str] = []  # 마지막으로 이동한 메뉴 경로
+
+        # 페이지 준비 상태 판단용 네트워크 추적 및 대기 시간 기록
+        self.network = NetworkTracker()
+        self.ready_waits: List[Dict] = []
+
+        # 확인된 work area frame (frame 이동/분리 시 무효화)
+        self.work_area_frame: Optional[Frame] = None
+        self.frame_cache_stats = {"hit": 0, "miss": 0}
+
+        # frame별 마지막으로 읽은 화면 텍스트 (diff 모드용)
+        self.text_snapshots = TextSnapshots()
+
+    @property
+    def context(self) -> Optional[BrowserContext]:
+        return self.account.context if self.account else None
+
+    @property
+    def usaint_id(self) -> Optional[str]:
+        return self.account.usaint_id if self.account else None
+
+    @property
+    def logged_in(self) -> bool:
+        return self.account.logged_in if self.account else False
+
+    @logged_in.setter
+    def logged_in(self, value: bool):
+        if self.account:
+            self.account.logged_in = value
+
+    async def start(
+        self,
+        playwright: Playwright,
+        block_resources: Optional[bool] = None,
+        usaint_id: Optional[str] = None,
+    ):
+        """
+        계정 컨텍스트를 준비하고 이 대화용 탭을 빌려 세션을 시작합니다.
+        block_resources는 이 탭의 이미지/폰트/트래커 차단 여부만 정합니다. (headless는 풀 단위)
+        """
+        if block_resources is not None:
+            self.block_resources = block_resources
+
+        self.playwright = playwright
+        self.account = session_manager.get_account(self.id, usaint_id)
+        await self.account.ensure_context(playwright)
+        self.page = await self.account.lease_page(self.id)
+        self.broken_reason = None
+        self.page.on("crash", lambda page: self._mark_broken(page, "crash"))
+        self.page.on("close", lambda page: self._mark_broken(page, "close"))
+
+        self.network = NetworkTracker()
+        self.network.install(self.page)
+
+        self.work_area_frame = None
+        self.page.on("framenavigated", self._invalidate_work_area_frame)
+        self.page.on("framedetached", self._invalidate_work_area_frame)
+
+        # 차단이 꺼져 있어도 비교를 위해 로드 통계는 수집
+        await install_fast_mode(self.page, self.resource_stats, block=self.block_resources)
+
+    def _mark_broken(self, page: Page, reason: str):
+        """탭이 죽었음을 기록하고 복구를 요청합니다. 세션이 직접 닫은 경우는 제외"""
+        if self.account is None or self.account.tabs.get(self.id) is not page:
+            return
+
+        self.broken_reason = reason
+        self.work_area_frame = None
+        print(f"[Session] 탭 이상 감지 ({reason}): {self.id}")
+
+        if session_manager.broken_handler is not None:
+            asyncio.create_task(session_manager.broken_handler(self, reason))
+
+    def _invalidate_work_area_frame(self, frame: Frame):
+        """캐시된 work area frame 또는 그 상위 frame이 바뀌면 캐시를 비웁니다."""
+        current = self.work_area_frame
+        while current is not None:
+            if current == frame:
+                self.work_area_frame = None
+                return
+            current = current.parent_frame
+
+    async def save_state(self):
+        if self.account:
+            await self.account.save_state()
+
+    def needs_login_state_refresh(self) -> bool:
+        return self.account is not None and self.account.needs_login_state_refresh()
+
     def update_activity(self):
         """마지막 활동 시간 업데이트"""
         self.last_activity_time = time()
@@ -44,11 +308,22 @@ class Session:
         """세션이 비활성 상태인지 확인"""
         return (time() - self.last_activity_time) > timeout_seconds
 
+    def is_live(self) -> bool:
+        """브라우저 탭을 점유하고 있는지"""
+        return self.page is not None
+
     async def close(self):
-        if self.context:
-            await self.context.close()
+        if self.account:
+            await self.account.release_page(self.id)
+
+            # 계정의 마지막 탭이면 컨텍스트도 반납 (스냅샷은 저장됨)
+            if self.account.is_idle():
+                await session_manager.close_account(self.account.key)
 
         self.page = None
+        self.work_area_frame = None
+        self.text_snapshots.clear()
+        session_manager.notify_capacity_changed()
 
 
 _thread_local = threading.local()
@@ -65,11 +340,31 @@ def get_session_for_current_thread(session_id: str):
     return _thread_local.sessions[session_id]
 
 
+def _get_account_key(session_id: str, usaint_id: Optional[str]) -> str:
+    """유세인트 계정 단위 키. 계정 정보가 없으면 대화 세션 단독으로 사용합니다."""
+    if usaint_id:
+        return f"account_{hashlib.sha256(usaint_id.encode()).hexdigest()[:16]}"
+    return session_id
+
+
 class SessionManager:
     session_map: Dict[str, Session] = {}
+    account_map: Dict[str, AccountSession] = {}
 
-    def __init__(self):
-        pass
+    def __init__(self, max_sessions: int = MAX_SESSIONS, memory_budget_mb: int = BROWSER_MEMORY_BUDGET_MB):
+        self.max_sessions = max_sessions
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+
+        # 입장 허가는 받았지만 아직 탭을 열지 않은 세션 (동시 입장으로 상한을 넘지 않도록)
+        self._admitting: Set[str] = set()
+        # 자리가 나기를 기다리는 session_id (FIFO)
+        self._admission_queue: Deque[str] = deque()
+        self._capacity_changed = asyncio.Event()
+        self._evicting = asyncio.Lock()
+        self._evicted_since_measure = False  # 축출 후 RSS를 아직 새로 재지 않았으면 True
+
+        # 탭이 죽었을 때 호출할 복구 함수 (watchdog이 등록)
+        self.broken_handler: Optional[Callable[[Session, str], Awaitable]] = None
 
     def get_session(self, session_id: str):
         if self.session_map.get(session_id) is None:
@@ -78,6 +373,147 @@ class SessionManager:
 
         return self.session_map.get(session_id)
 
+    def get_account(self, session_id: str, usaint_id: Optional[str] = None) -> AccountSession:
+        """유세인트 계정 키로 공유 컨텍스트를 조회/생성합니다."""
+        key = _get_account_key(session_id, usaint_id)
+        if self.account_map.get(key) is None:
+            self.account_map[key] = AccountSession(key, usaint_id)
+
+        return self.account_map[key]
+
+    async def close_account(self, key: str):
+        """탭이 모두 반납된 계정 컨텍스트를 종료합니다."""
+        account = self.account_map.get(key)
+        if account is None or not account.is_idle():
+            return
+
+        del self.account_map[key]
+        await account.close()
+        print(f"[SessionManager] 계정 컨텍스트 종료: {key}")
+
+    async def refresh_login_states(self):
+        """사용 중인 계정의 로그인 스냅샷을 주기적으로 갱신합니다."""
+        for key, account in list(self.account_map.items()):
+            if not account.needs_login_state_refresh():
+                continue
+            try:
+                await account.save_state()
+            except Exception as e:
+                print(f"[SessionManager] 로그인 스냅샷 갱신 실패: {key} - {e}")
+
+    def live_session_count(self) -> int:
+        live = sum(1 for session in self.session_map.values() if session.is_live())
+        return live + len(self._admitting)
+
+    def _is_memory_exhausted(self) -> bool:
+        if self.memory_budget_bytes <= 0:
+            return False
+        rss = get_browser_rss_bytes()
+        return rss is not None and rss >= self.memory_budget_bytes
+
+    def _has_capacity(self) -> bool:
+        return self.live_session_count() < self.max_sessions and not self._is_memory_exhausted()
+
+    def has_free_slot(self) -> bool:
+        """다른 세션을 축출하거나 대기하지 않고 바로 탭을 열 수 있는지 (예열 작업용)"""
+        return not self._admission_queue and self._has_capacity()
+
+    def _pick_eviction_candidate(self, exclude: str) -> Optional[Session]:
+        """가장 오래 사용하지 않은 유휴 세션"""
+        candidates = [
+            session
+            for session_id, session in self.session_map.items()
+            if session_id != exclude and session.is_live() and not session.busy
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda session: session.last_activity_time)
+
+    async def _evict(self, session: Session):
+        """로그인 상태를 저장한 뒤 세션의 탭을 반납합니다. 다음 대화에서 스냅샷으로 복원됩니다."""
+        try:
+            await session.save_state()
+        except Exception as e:
+            print(f"[SessionManager] 축출 전 상태 저장 실패: {session.id} - {e}")
+
+        try:
+            await asyncio.wait_for(session.close(), timeout=5.0)
+        except Exception as e:
+            print(f"[SessionManager] 축출 중 오류 (강제 제거): {session.id} - {e}")
+
+        self.session_map.pop(session.id, None)
+        print(f"[SessionManager] LRU 세션 축출: {session.id}")
+
+    async def _make_room(self, session_id: str) -> bool:
+        """
+        상한에 걸렸으면 유휴 세션을 하나 축출해 자리를 만듭니다. 자리가 없으면 False
+        RSS는 탭을 닫은 뒤에도 바로 줄지 않으므로 한 번에 하나만 축출하고,
+        여전히 부족하면 admit()의 대기(_capacity_changed) 뒤 새로 측정해 다시 판단합니다.
+        """
+        async with self._evicting:
+            if self._evicted_since_measure:
+                # 축출 뒤 기다린 다음의 새 측정값으로 판단 (축출 전 캐시 값으로 하나 더 축출하지 않도록)
+                invalidate_rss_cache()
+                self._evicted_since_measure = False
+            if self._has_capacity():
+                return True
+
+            victim = self._pick_eviction_candidate(exclude=session_id)
+            if victim is None:
+                return False
+            await self._evict(victim)
+
+            if self.memory_budget_bytes > 0:
+                self._evicted_since_measure = True
+                return False
+            return self._has_capacity()
+
+    def notify_capacity_changed(self):
+        """세션이 종료되어 자리가 났음을 대기열에 알립니다."""
+        self._capacity_changed.set()
+
+    async def admit(self, session_id: str) -> AsyncIterator[int]:
+        """
+        세션이 탭을 열기 전에 자리를 확보합니다.
+        자리가 없으면 대기열에서 기다리며 대기 순번이 바뀔 때마다 yield 합니다.
+        입장 후에는 탭을 연 다음 반드시 finish_admission()을 호출해야 합니다.
+        """
+        self._admission_queue.append(session_id)
+        deadline = time() + ADMISSION_TIMEOUT_SECONDS
+        last_position = 0
+
+        try:
+            while True:
+                position = self._admission_queue.index(session_id) + 1
+                if position == 1 and await self._make_room(session_id):
+                    self._admitting.add(session_id)
+                    return
+
+                if position != last_position:
+                    last_position = position
+                    print(f"[SessionManager] 입장 대기 {position}번째: {session_id}")
+                    yield position
+
+                if time() >= deadline:
+                    raise RuntimeError("사용자가 많아 브라우저를 열 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+                # 세션 종료 알림이 오거나, 메모리 사용량 변화를 확인하기 위해 주기적으로 재시도
+                self._capacity_changed.clear()
+                try:
+                    await asyncio.wait_for(self._capacity_changed.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            try:
+                self._admission_queue.remove(session_id)
+            except ValueError:
+                pass
+            self.notify_capacity_changed()
+
+    def finish_admission(self, session_id: str):
+        self._admitting.discard(session_id)
+        self.notify_capacity_changed()
+
     async def cleanup_inactive_sessions(self, timeout_seconds: int = 300):
         """비활성 세션을 정리합니다. 기본값: 300초(5분)"""
         # 세션이 없으면 빠르게 리턴
@@ -88,7 +524,7 @@ class SessionManager:
         inactive_sessions = [
             (session_id, session)
             for session_id, session in self.session_map.items()
-            if session.is_inactive(timeout_seconds)
+            if session.is_inactive(timeout_seconds) and not session.busy
         ]
 
         if not inactive_sessions:
@@ -119,6 +555,7 @@ class SessionManager:
             return_exceptions=True
         )
 
+        self.notify_capacity_changed()
         print(f"[SessionManager] 세션 정리 완료")
 
 
@@ -0,0 +1,188 @@
+import json
+from typing import List, Literal, Optional
+
+from langchain_core.tools import tool
+from playwright.async_api import Frame
+from pydantic import BaseModel, Field
+
+from apps.agent.session import Session, session_manager
+from apps.agent.usaint import _click_in_iframe, _get_frame
+
+# 표 하나에서 "다음 페이지"를 따라갈 최대 횟수
+MAX_TABLE_PAGES = 20
+
+# 스크립트가 다음 페이지 버튼에 붙이는 표시 (표 번호)
+NEXT_PAGE_ATTRIBUTE = "data-agent-table-next"
+
+# work area frame의 표를 한 번에 읽는 스크립트
+# - WebDynpro 그리드(ct="ST", role="grid", *-contentTBody)를 우선, 없으면 헤더가 있는 일반 표
+# - 헤더 행은 th/columnheader 셀이 있는 첫 행 (없으면 contentTBody의 첫 행)
+# - 값이 모두 빈 행(WebDynpro가 채워 넣는 빈 줄)은 제외
+# - 표 주변의 활성화된 "다음 페이지" 버튼에 표시를 남김
+_TABLE_SCRIPT = """
+(attribute) => {
+    const clean = (value) => (value || '').replace(/\\s+/g, ' ').trim();
+    const cellText = (cell) => clean(cell.innerText || cell.textContent);
+    const isHeaderCell = (cell) => cell.tagName === 'TH' || cell.getAttribute('role') === 'columnheader';
+    const isGrid = (table) =>
+        table.getAttribute('ct') === 'ST' ||
+        table.getAttribute('role') === 'grid' ||
+        Array.from(table.tBodies).some((tbody) => (tbody.id || '').endsWith('-contentTBody'));
+    const isDisabled = (el) =>
+        el.getAttribute('aria-disabled') === 'true' || el.disabled || /Dsbl/.test(el.className || '');
+    const NEXT_PAGE = /다음\\s*페이지|next\\s*page/i;
+
+    const findNextButton = (table) => {
+        // 페이지 버튼은 표 바깥(스크롤바/툴바)에 있으므로 몇 단계 위 컨테이너까지 탐색
+        let container = table;
+        for (let depth = 0; depth < 4 && container.parentElement; depth++) {
+            container = container.parentElement;
+            const button = Array.from(container.querySelectorAll('[title], [aria-label], [role="button"], button'))
+                .find((el) => NEXT_PAGE.test(el.title || el.getAttribute('aria-label') || clean(el.innerText)));
+            if (button) return isDisabled(button) ? null : button;
+        }
+        return null;
+    };
+
+    document.querySelectorAll(`[${attribute}]`).forEach((el) => el.removeAttribute(attribute));
+
+    const allTables = Array.from(document.querySelectorAll('table'));
+    const grids = allTables.filter(isGrid);
+    const candidates = grids.length ? grids : allTables.filter((table) => Array.from(table.rows).some((tr) => Array.from(tr.cells).some(isHeaderCell)));
+
+    return candidates.map((table, index) => {
+        const tableRows = Array.from(table.rows);
+        let headerIndex = tableRows.findIndex((tr) => Array.from(tr.cells).some(isHeaderCell));
+        if (headerIndex < 0 && tableRows.length && (tableRows[0].parentElement.id || '').endsWith('-contentTBody')) {
+            headerIndex = 0;
+        }
+
+        const headers = headerIndex >= 0 ? Array.from(tableRows[headerIndex].cells).map(cellText) : [];
+        const rows = tableRows
+            .slice(headerIndex + 1)
+            .map((tr) => Array.from(tr.cells).map(cellText))
+            .filter((cells) => cells.some((cell) => cell));
+
+        const next = findNextButton(table);
+        if (next) next.setAttribute(attribute, String(index));
+
+        const title = clean(table.getAttribute('aria-label') || table.caption?.innerText || table.title);
+        return { index, title: title || null, headers, rows, hasNext: Boolean(next) };
+    });
+}
+"""
+
+
+class ExtractedTable(BaseModel):
+    index: int = Field(description="화면에서의 표 순서")
+    title: Optional[str] = Field(default=None, description="표 제목 (있는 경우)")
+    headers: List[str] = Field(default_factory=list)
+    rows: List[List[str]] = Field(default_factory=list)
+    pages: int = Field(default=1, description="읽은 페이지 수")
+
+
+def _matches(table: ExtractedTable, header_keyword: Optional[str]) -> bool:
+    if not header_keyword:
+        return True
+    keyword = "".join(header_keyword.split())
+    return any(keyword in "".join(header.split()) for header in table.headers)
+
+
+async def _read_tables(frame: Frame) -> List[dict]:
+    return await frame.evaluate(_TABLE_SCRIPT, NEXT_PAGE_ATTRIBUTE)
+
+
+async def extract_tables(
+    session: Session,
+    header_keyword: Optional[str] = None,
+    max_pages: int = MAX_TABLE_PAGES,
+) -> List[ExtractedTable]:
+    """
+    work area frame의 표를 헤더/행 단위로 읽습니다. (호출하는 쪽에서 action lock을 잡아야 함)
+    header_keyword가 있으면 헤더에 그 단어가 들어간 표만 반환하고,
+    "다음 페이지" 버튼이 있으면 끝까지 넘기면서 행을 모읍니다.
+    """
+    frame = await _get_frame(session)
+    tables = [
+        ExtractedTable(**{key: value for key, value in page.items() if key != "hasNext"})
+        for page in await _read_tables(frame)
+    ]
+    tables = [table for table in tables if _matches(table, header_keyword)]
+
+    for table in tables:
+        await _collect_next_pages(session, table, max_pages)
+
+    return tables
+
+
+async def _collect_next_pages(session: Session, table: ExtractedTable, max_pages: int):
+    """다음 페이지를 넘기며 새 행을 추가합니다. 스크롤형 페이지는 겹치는 행이 있으므로 중복 제거"""
+    seen = {tuple(row) for row in table.rows}
+    selector = f'[{NEXT_PAGE_ATTRIBUTE}="{table.index}"]'
+
+    while table.pages < max_pages:
+        frame = await _get_frame(session)
+        if await frame.query_selector(selector) is None:
+            return
+
+        await _click_in_iframe(session.id, selector)
+        frame = await _get_frame(session)
+        pages = await _read_tables(frame)
+        if table.index >= len(pages):
+            return
+
+        page = pages[table.index]
+        new_rows = [row for row in page["rows"] if tuple(row) not in seen]
+        if not new_rows:
+            return
+
+        seen.update(tuple(row) for row in new_rows)
+        table.rows.extend(new_rows)
+        table.pages += 1
+        if not page["hasNext"]:
+            return
+
+    print(f"[TableExtractor] 최대 페이지 수({max_pages})에 도달했습니다: 표 {table.index}")
+
+
+def _tsv_cell(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def format_table(table: ExtractedTable, output: str = "tsv") -> str:
+    """LLM에 전달하기 위한 형식 (tsv: 헤더 한 줄 + 행, json: 열 이름과 행 배열)"""
+    if output == "json":
+        return json.dumps(
+            {"title": table.title, "columns": table.headers, "rows": table.rows},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    lines = [f"# 표 {table.index}" + (f" {table.title}" if table.title else "") + f" ({len(table.rows)}행)"]
+    if table.headers:
+        lines.append("\t".join(_tsv_cell(header) for header in table.headers))
+    lines.extend("\t".join(_tsv_cell(cell) for cell in row) for row in table.rows)
+    return "\n".join(lines)
+
+
+class GetIframeTableArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    header_keyword: Optional[str] = Field(
+        default=None, description="이 단어가 헤더에 들어간 표만 반환 (예: '과목명'). 비우면 모든 표"
+    )
+    output: Literal["tsv", "json"] = Field(default="tsv", description="출력 형식")
+
+
+@tool(args_schema=GetIframeTableArgs)
+async def get_iframe_table(session_id: str, header_keyword: Optional[str] = None, output: str = "tsv"):
+    """
+    현재 화면의 표를 헤더와 행 단위로 읽어 반환합니다. 여러 페이지로 나뉜 표는 끝까지 넘겨서 모두 읽습니다.
+    성적, 시간표, 장학금 내역처럼 표로 된 데이터는 get_iframe_text_content 대신 이 도구를 사용하세요.
+    """
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("get_iframe_table"):
+        tables = await extract_tables(session, header_keyword)
+
+    if not tables:
+        return "표를 찾지 못했습니다."
+    return "\n\n".join(format_table(table, output) for table in tables)
@@ -0,0 +1,55 @@
+import difflib
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+# 세션별로 기억할 frame 텍스트 스냅샷 수
+MAX_TEXT_SNAPSHOTS = 8
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def diff_text(previous: str, current: str) -> str:
+    """
+    이전 스냅샷과 비교한 변경 줄만 반환합니다. (+ 추가, - 삭제)
+    변경 내용이 전체 본문보다 길면 전체 본문을 그대로 반환합니다.
+    """
+    digest = content_hash(current)
+    if previous == current:
+        return f"unchanged (hash: {digest})"
+
+    changed_lines = [
+        line
+        for line in difflib.unified_diff(
+            previous.splitlines(), current.splitlines(), n=0, lineterm=""
+        )
+        if not line.startswith(("---", "+++", "@@"))
+    ]
+    diff = "\n".join(changed_lines)
+
+    if len(diff) >= len(current):
+        return f"[전체 내용] (hash: {digest})\n{current}"
+
+    return f"[변경된 줄] (hash: {digest})\n{diff}"
+
+
+class TextSnapshots:
+    """frame별 마지막으로 읽은 텍스트 (오래된 것부터 제거)"""
+
+    def __init__(self, max_size: int = MAX_TEXT_SNAPSHOTS):
+        self.max_size = max_size
+        self._snapshots: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._snapshots.get(key)
+
+    def put(self, key: str, text: str):
+        self._snapshots[key] = text
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_size:
+            self._snapshots.popitem(last=False)
+
+    def clear(self):
+        self._snapshots.clear()
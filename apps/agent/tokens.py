@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Iterable
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+# gpt-4o 계열 토크나이저
+TOKEN_ENCODING = "o200k_base"
+
+# 메시지마다 붙는 역할/구분자 토큰 (대략값)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # 토크나이저 파일을 받을 수 없는 환경에서는 글자 수로 추정
+        print(f"[Tokens] tiktoken을 사용할 수 없어 글자 수로 추정합니다: {e}")
+        return None
+
+
+def count_text_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # 한글이 섞인 텍스트 기준 대략 2글자당 1토큰
+        return (len(text) + 1) // 2
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _message_text(message: BaseMessage) -> str:
+    if isinstance(message.content, str):
+        text = message.content
+    else:
+        text = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in message.content)
+
+    # 도구 호출 인자도 프롬프트에 포함됨
+    if isinstance(message, AIMessage) and message.tool_calls:
+        text += "".join(f"{call['name']}{call['args']}" for call in message.tool_calls)
+    return text
+
+
+def count_message_tokens(messages: Iterable[BaseMessage]) -> int:
+    return sum(count_text_tokens(_message_text(message)) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def _cached_prompt_tokens(message: AIMessage) -> int:
+    usage = message.usage_metadata or {}
+    cached = (usage.get("input_token_details") or {}).get("cache_read")
+    if cached is None:
+        # usage_metadata가 없는 버전은 OpenAI 응답 원본에서 읽음
+        token_usage = message.response_metadata.get("token_usage") or {}
+        cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    return cached or 0
+
+
+class PromptCacheStats:
+    """LLM 응답의 사용량 정보로 프롬프트 캐시 적중 토큰을 집계합니다."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def record(self, message: AIMessage):
+        usage = message.usage_metadata or {}
+        prompt_tokens = usage.get("input_tokens") or 0
+        cached_tokens = _cached_prompt_tokens(message)
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        print(
+            f"[PromptCache] 입력 토큰 {prompt_tokens} (캐시 {cached_tokens}, 미캐시 {prompt_tokens - cached_tokens}) | "
+            f"누적 적중률 {self.hit_rate:.1%}"
+        )
@@ -0,0 +1,240 @@
+"""
+도구 결과 압축
+
+ToolNode가 만든 ToolMessage를 LLM에 넘기기 전에 도구별 토큰 예산에 맞춰 줄입니다.
+- 공백 정리, 반복되는 SAP 화면 문구 제거
+- 여러 칸 공백으로 정렬된 표는 TSV로
+- 예산을 넘으면 사용자 질문과 관련 있는 줄을 우선 남기고 나머지는 생략 표시
+- 공지 검색은 본문 전체 대신 질문 주변 발췌문만
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from apps.agent.tokens import count_text_tokens
+from lib.env import get_env
+
+# 도구별 결과 토큰 예산 (없는 도구는 DEFAULT_TOOL_TOKEN_BUDGET)
+TOOL_TOKEN_BUDGETS = {
+    "get_iframe_text_content": 1500,
+    "get_iframe_interactive_element": 2000,
+    "get_iframe_table": 3000,
+    "search_menu": 800,
+    "search_ssu_notice": 1200,
+}
+DEFAULT_TOOL_TOKEN_BUDGET = 3000
+
+# 관련도와 상관없이 남기는 앞쪽 줄 수 (화면 제목, 표 헤더)
+HEAD_LINES = 3
+
+# 공지 발췌문 길이 (글자)
+NOTICE_SNIPPET_CHARS = 300
+
+# 지정하면 압축 전 도구 결과를 JSONL로 저장 (scripts/bench_tool_output.py의 코퍼스로 사용)
+TOOL_OUTPUT_CAPTURE_DIR = get_env("TOOL_OUTPUT_CAPTURE_DIR")
+
+# 화면마다 반복되는 SAP 포털 문구
+SAP_BOILERPLATE = re.compile(
+    r"^(SAP|Copyright.*SAP.*|로딩 중.*|Loading.*|처리 중.*|새 창|도움말|즐겨찾기에 추가|로그오프|"
+    r"Portal Favorites|Personalize|History|Back|Forward|맨 위로|인쇄|닫기)$",
+    re.IGNORECASE,
+)
+
+# interactive element에서 LLM이 요소를 고르는 데 필요한 속성만 남김
+_KEPT_ATTRIBUTES = ("id", "class", "type", "value", "title", "aria-label", "role", "name", "href", "placeholder")
+
+# class는 셀렉터 작성(.class1.class2)에 쓰이므로 앞쪽 몇 개만 남김
+_KEPT_CLASS_TOKENS = 3
+_TAG_PATTERN = re.compile(r"^<\s*([a-zA-Z0-9]+)([^>]*)>")
+_ATTRIBUTE_PATTERN = re.compile(r'([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*"([^"]*)"')
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def _keywords(query: Optional[str]) -> Set[str]:
+    """질문에서 관련도 판단에 쓸 단어 (두 글자 이상)"""
+    if not query:
+        return set()
+    return {word for word in re.findall(r"[0-9A-Za-z가-힣]+", query) if len(word) >= 2}
+
+
+def _relevance(line: str, keywords: Set[str]) -> int:
+    score = sum(3 for word in keywords if word in line)
+    if re.search(r"\d", line):
+        score += 1  # 학점, 날짜, 금액처럼 숫자가 있는 줄
+    return score
+
+
+def _omission_tag(count: int, tokens: int, reason: str) -> str:
+    return f"[생략: {count}줄, 약 {tokens}토큰 - {reason}]"
+
+
+def truncate_by_relevance(lines: List[str], budget: int, query: Optional[str] = None) -> List[str]:
+    """
+    예산 안에 들어갈 만큼 관련도가 높은 줄을 고르고, 원래 순서대로 반환합니다.
+    앞쪽 HEAD_LINES줄(화면 제목, 표 헤더)은 먼저 남기고, 같은 점수면 앞쪽 줄이 우선합니다.
+    """
+    costs = [count_text_tokens(line) + 1 for line in lines]
+    if sum(costs) <= budget:
+        return lines
+
+    keywords = _keywords(query)
+    head = list(range(min(HEAD_LINES, len(lines))))
+    rest = sorted(range(len(head), len(lines)), key=lambda index: (-_relevance(lines[index], keywords), index))
+    order = head + rest
+
+    kept: Set[int] = set()
+    used = 0
+    for index in order:
+        if used + costs[index] > budget:
+            continue
+        kept.add(index)
+        used += costs[index]
+
+    result = [lines[index] for index in sorted(kept)]
+    omitted = [index for index in range(len(lines)) if index not in kept]
+    reason = "질문과 관련도 낮음" if keywords else "토큰 예산 초과"
+    result.append(_omission_tag(len(omitted), sum(costs[index] for index in omitted), reason))
+    return result
+
+
+def _row_to_tsv(line: str) -> str:
+    """세 칸 이상 공백이나 탭으로 나뉜 줄은 표 행으로 보고 TSV로"""
+    cells = [cell.strip() for cell in re.split(r"\t+| {3,}", line)]
+    cells = [cell for cell in cells if cell]
+    return "\t".join(cells) if len(cells) > 1 else " ".join(line.split())
+
+
+def clean_text(text: str) -> List[str]:
+    """공백/빈 줄 정리, SAP 문구와 세 번 이상 반복되는 줄 제거, 표 행은 TSV"""
+    lines = [_row_to_tsv(line) for line in text.splitlines()]
+    lines = [line for line in lines if line and not SAP_BOILERPLATE.match(line)]
+
+    counts = Counter(lines)
+    result = []
+    seen = set()
+    for line in lines:
+        if counts[line] >= 3:
+            if line in seen:
+                continue
+            seen.add(line)
+            line = f"{line} (x{counts[line]})"
+        result.append(line)
+    return result
+
+
+def _compact_element(line: str) -> str:
+    """'[3] <a id=".." class=".." style="..">텍스트</a>' -> '[3] a#.. "텍스트"'"""
+    match = re.match(r"^(\[\d+\])\s*(.*)$", line, re.DOTALL)
+    if not match:
+        return " ".join(line.split())
+    index, html = match.groups()
+
+    tag = _TAG_PATTERN.match(html)
+    if not tag:
+        return f"{index} {' '.join(html.split())}"
+
+    attributes = dict(_ATTRIBUTE_PATTERN.findall(tag.group(2)))
+    if attributes.get("class"):
+        attributes["class"] = " ".join(attributes["class"].split()[:_KEPT_CLASS_TOKENS])
+    parts = [tag.group(1).lower()]
+    parts += [f'{name}="{attributes[name]}"' for name in _KEPT_ATTRIBUTES if attributes.get(name)]
+
+    text = " ".join(_HTML_TAG.sub(" ", html[tag.end():]).split())
+    if text:
+        parts.append(f'"{text[:80]}"')
+    return f"{index} {' '.join(parts)}"
+
+
+def _compact_elements(content: str, budget: int, query: Optional[str]) -> str:
+    lines = [_compact_element(line) for line in re.split(r"\n(?=\[\d+\])", content) if line.strip()]
+    return "\n".join(truncate_by_relevance(lines, budget, query))
+
+
+def _menu_paths(node: Dict, path: List[str]) -> List[str]:
+    paths = []
+    for title, child in node.items():
+        if isinstance(child, dict):
+            paths.extend(_menu_paths(child, path + [title]))
+        else:
+            paths.append(" > ".join(path + [title]))
+    return paths
+
+
+def _compact_menu(content: str, budget: int, query: Optional[str]) -> str:
+    """전체 menu.json은 '상위 > 하위 > 메뉴' 경로 목록으로"""
+    try:
+        menu = json.loads(content)
+    except json.JSONDecodeError:
+        return "\n".join(truncate_by_relevance(clean_text(content), budget, query))
+    return "\n".join(truncate_by_relevance(_menu_paths(menu, []), budget, query))
+
+
+def _snippet(document: str, keywords: Set[str]) -> str:
+    """질문 단어가 처음 나오는 곳 주변을 발췌합니다."""
+    text = " ".join(document.split())
+    positions = [text.find(word) for word in keywords if word in text]
+    start = max(min(positions) - NOTICE_SNIPPET_CHARS // 3, 0) if positions else 0
+    snippet = text[start:start + NOTICE_SNIPPET_CHARS]
+    return ("…" if start > 0 else "") + snippet + ("…" if start + NOTICE_SNIPPET_CHARS < len(text) else "")
+
+
+def _compact_notices(content: str, budget: int, query: Optional[str]) -> str:
+    """공지 검색 결과는 제목/날짜/링크와 발췌문만"""
+    try:
+        results = json.loads(content)
+    except json.JSONDecodeError:
+        return "\n".join(truncate_by_relevance(clean_text(content), budget, query))
+    if not isinstance(results, list):
+        return content
+
+    keywords = _keywords(query)
+    blocks = []
+    for result in results:
+        metadata = result.get("metadata") or {}
+        header = " | ".join(
+            str(value) for value in (metadata.get("title"), metadata.get("date"), metadata.get("url")) if value
+        )
+        blocks.append(f"- {header}\n  {_snippet(result.get('document') or '', keywords)}")
+    return "\n".join(truncate_by_relevance(blocks, budget, query))
+
+
+def compact_tool_output(tool_name: str, content: Any, query: Optional[str] = None) -> str:
+    """도구 결과를 도구별 예산 안으로 줄입니다. query는 관련도 판단에 쓰는 사용자 질문"""
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False, default=str)
+    budget = TOOL_TOKEN_BUDGETS.get(tool_name, DEFAULT_TOOL_TOKEN_BUDGET)
+
+    if tool_name == "get_iframe_interactive_element":
+        return _compact_elements(content, budget, query)
+    if tool_name == "search_menu":
+        return _compact_menu(content, budget, query)
+    if tool_name == "search_ssu_notice":
+        return _compact_notices(content, budget, query)
+    if tool_name == "get_iframe_text_content":
+        return "\n".join(truncate_by_relevance(clean_text(content), budget, query))
+
+    # 이미 구조화된 결과를 반환하는 도구는 예산을 넘을 때만 줄임
+    if count_text_tokens(content) <= budget:
+        return content
+    return "\n".join(truncate_by_relevance(content.splitlines(), budget, query))
+
+
+def capture_tool_output(tool_name: str, content: Any, query: Optional[str]):
+    """TOOL_OUTPUT_CAPTURE_DIR가 있으면 압축 전 결과를 벤치마크 코퍼스로 저장합니다."""
+    if not TOOL_OUTPUT_CAPTURE_DIR:
+        return
+    try:
+        directory = Path(TOOL_OUTPUT_CAPTURE_DIR)
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        record = {"tool": tool_name, "query": query, "content": content, "captured_at": datetime.now().isoformat()}
+        # 실제 계정의 성적/학적 화면이 그대로 담기므로 서버 사용자만 읽을 수 있게 생성
+        fd = os.open(directory / f"{datetime.now():%Y%m%d}.jsonl", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        with os.fdopen(fd, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    except OSError as e:
+        print(f"[ToolOutput] 도구 결과 저장 실패: {e}")
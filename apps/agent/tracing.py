@@ -0,0 +1,37 @@
+import random
+import re
+from os import getcwd
+from pathlib import Path
+from time import time
+
+from playwright.async_api import Page
+
+from lib.env import get_env
+
+# 클릭 등 액션마다 스크린샷을 남길 확률 (0이면 끔, 1이면 매번)
+TRACE_SCREENSHOT_RATE = float(get_env("TRACE_SCREENSHOT_RATE") or 0)
+
+# 디버그 스크린샷 저장 위치
+TRACE_DIR = Path(f"{getcwd()}/traces")
+
+
+def _safe_label(label: str) -> str:
+    return re.sub(r"[^0-9A-Za-z가-힣_-]+", "_", label)[:40]
+
+
+async def capture_trace_screenshot(page: Page, session_id: str, label: str):
+    """TRACE_SCREENSHOT_RATE 확률로 현재 화면을 저장합니다. 실패해도 동작에는 영향 없음"""
+    if TRACE_SCREENSHOT_RATE <= 0 or random.random() >= TRACE_SCREENSHOT_RATE:
+        return None
+
+    trace_dir = TRACE_DIR / _safe_label(session_id)
+    path = trace_dir / f"{int(time() * 1000)}_{_safe_label(label)}.png"
+    try:
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        await page.screenshot(path=path)
+    except Exception as e:
+        print(f"[Trace] 스크린샷 저장 실패: {e}")
+        return None
+
+    print(f"[Trace] 스크린샷 저장: {path}")
+    return path
@@ -1,26 +1,39 @@
 import asyncio
 import json
+from time import time
+from typing import Dict, List, Literal, Optional
 
 from langchain_core.tools import tool
-from playwright.async_api import async_playwright
+from playwright.async_api import Frame, async_playwright
 from pydantic import BaseModel, Field
 
+from apps.agent.fast_mode import record_navigation_hop
+from apps.agent.login_state import delete_login_state
+from apps.agent.navigation import MENU_FILE, MenuEntry, is_same_application, navigation_index
+from apps.agent.page_ready import get_deadline, record_ready_wait, wait_for_frame_stable
 from apps.agent.session import Session, session_manager
+from apps.agent.text_snapshot import content_hash, diff_text
+from apps.agent.tracing import capture_trace_screenshot
 from lib.env import get_env
 
 
-@tool
-async def search_menu() -> str:
-    """유세인트의 전체 메뉴 구조를 JSON 문자열로 반환합니다. 메뉴 이동이 필요할 때 이 도구로 메뉴 구조를 확인하세요."""
-    import os
-    from pathlib import Path
+class SearchMenuArgs(BaseModel):
+    query: Optional[str] = Field(
+        default=None,
+        description="찾을 메뉴명 또는 키워드. 비우면 전체 메뉴 구조를 반환합니다.",
+    )
+
 
-    # 현재 파일의 디렉토리 경로
-    current_dir = Path(__file__).parent
-    menu_file = current_dir / "menu.json"
+@tool(args_schema=SearchMenuArgs)
+async def search_menu(query: Optional[str] = None) -> str:
+    """유세인트 메뉴 구조를 확인합니다. query를 주면 일치하는 메뉴의 전체 경로만 반환합니다."""
+    if query:
+        entries = navigation_index.search(query)
+        if entries:
+            return "\n".join(entry.path_text() for entry in entries)
 
     # menu.json 파일 읽기
-    with open(menu_file, "r", encoding="utf-8") as f:
+    with open(MENU_FILE, "r", encoding="utf-8") as f:
         menu_data = json.load(f)
 
     # JSON을 보기 좋은 문자열로 변환하여 반환
@@ -49,25 +62,161 @@ class SelectNavigationMenuArgs(BaseModel):
 @tool(args_schema=SelectNavigationMenuArgs)
 async def select_navigation_menu(session_id: str, menu_title: str):
     """유세인트 메뉴를 선택합니다."""
-    return await _select_navigation_menu(session_id, menu_title)
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("select_navigation_menu"):
+        return await _select_navigation_menu(session_id, menu_title)
 
 
 async def _select_navigation_menu(session_id: str, menu_title: str):
     """유세인트 메뉴를 선택합니다."""
     session = session_manager.get_session(session_id)
+    started_at = time()
+    before = session.resource_stats.snapshot()
+
     menu = session.page.get_by_role("link", name=menu_title, exact=True)
     print(f"{menu_title}: {menu}")
     await menu.click()
-    await session.page.wait_for_load_state("domcontentloaded", timeout=4 * 1000)
-    await asyncio.sleep(2)
+    await _wait_until_ready(session, f"메뉴 '{menu_title}'")
+
+    # 리프 메뉴에 도착했으면 현재 화면 경로로 기록
+    entry = navigation_index.entries.get(menu_title)
+    if entry is not None:
+        session.navigation_path = list(entry.path)
+
+    record_navigation_hop(
+        session.navigation_metrics,
+        menu_title,
+        started_at,
+        before,
+        session.resource_stats.snapshot(),
+    )
+    return True
+
+
+class NavigateToArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    menu_title: str = Field(
+        description="이동할 최종 메뉴명 또는 별칭 (예: 학기별 성적 조회, 시간표, 장학금수혜내역조회)"
+    )
+
+
+@tool(args_schema=NavigateToArgs)
+async def navigate_to(session_id: str, menu_title: str):
+    """메뉴명만으로 유세인트 화면에 한 번에 이동합니다. 상위 메뉴를 하나씩 클릭할 필요가 없습니다."""
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("navigate_to"):
+        return await _navigate_to(session_id, menu_title)
+
+
+async def _navigate_to(session_id: str, menu_title: str) -> str:
+    """메뉴 색인으로 경로를 찾아 직접 이동하거나, 경로를 LLM 개입 없이 한 번에 재생합니다."""
+    entry = navigation_index.resolve(menu_title)
+    if entry is None:
+        candidates = navigation_index.search(menu_title)
+        if candidates:
+            candidate_text = ", ".join(f"'{candidate.title}'" for candidate in candidates)
+            return f"'{menu_title}' 메뉴를 찾지 못했습니다. 후보: {candidate_text}"
+        return f"'{menu_title}' 메뉴를 찾지 못했습니다. search_menu로 메뉴 구조를 확인하세요."
+
+    session = session_manager.get_session(session_id)
+
+    if not (entry.target and await _jump_to_target(session, entry)):
+        await _replay_menu_path(session_id, entry.path)
+        await _capture_target(session, entry)
+
+    session.navigation_path = list(entry.path)
+    return f"'{entry.path_text()}' 화면으로 이동했습니다."
+
+
+async def _replay_menu_path(session_id: str, path: list):
+    """메뉴 경로를 순서대로 클릭합니다. 이미 펼쳐진 상위 메뉴는 다시 클릭하지 않습니다."""
+    session = session_manager.get_session(session_id)
+
+    for index, title in enumerate(path):
+        next_title = path[index + 1] if index + 1 < len(path) else None
 
+        # 하위 메뉴가 이미 보이면 상위 메뉴를 다시 눌러 폴더가 접히지 않도록 건너뜀
+        if next_title is not None:
+            next_link = session.page.get_by_role("link", name=next_title, exact=True)
+            if await next_link.count() > 0 and await next_link.first.is_visible():
+                continue
+
+        await _select_navigation_menu(session_id, title)
+
+
+async def _jump_to_target(session: Session, entry: MenuEntry) -> bool:
+    """캡처된 화면 URL을 contentAreaFrame에 바로 로드합니다."""
+    started_at = time()
+    before = session.resource_stats.snapshot()
+
+    content_area_frame = await session.page.query_selector("iframe#contentAreaFrame")
+    if content_area_frame is None:
+        return False
+
+    await content_area_frame.evaluate("(el, url) => { el.src = url; }", entry.target)
+    await _wait_until_ready(session, f"바로가기 '{entry.title}'")
+
+    # 로그인 화면이나 다른 애플리케이션으로 넘어가도 work area frame은 있을 수 있으므로 도착한 URL도 확인
+    content_frame = await content_area_frame.content_frame()
+    landed = content_frame is not None and is_same_application(content_frame.url, entry.target)
+    if not landed or await _find_work_area_frame(session) is None:
+        print(f"[Usaint] 바로가기 실패, 경로 재생으로 전환: {entry.title}")
+        navigation_index.forget_target(entry.title)
+        return False
+
+    record_navigation_hop(
+        session.navigation_metrics,
+        f"바로가기 '{entry.title}'",
+        started_at,
+        before,
+        session.resource_stats.snapshot(),
+    )
     return True
 
 
-@tool()
-async def get_iframe_text_content(session_id: str):
-    """iframe에서 내부의 화면 내용을 텍스트로 가져옵니다."""
-    return await _get_iframe_text_content(session_id)
+async def _capture_target(session: Session, entry: MenuEntry):
+    """경로 재생으로 도착한 화면의 URL을 다음 바로가기용으로 기록합니다."""
+    try:
+        content_area_frame = await session.page.query_selector("iframe#contentAreaFrame")
+        frame = await content_area_frame.content_frame() if content_area_frame else None
+        if frame is not None and frame.url.startswith("http"):
+            navigation_index.record_target(entry.title, frame.url)
+    except Exception as e:
+        print(f"[Usaint] 이동 대상 캡처 실패: {entry.title} - {e}")
+
+
+class GetIframeTextContentArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    mode: Literal["full", "diff"] = Field(
+        default="full",
+        description="full: 전체 화면 내용, diff: 같은 화면을 직전에 읽은 뒤 바뀐 줄만 (변화가 없으면 unchanged)",
+    )
+
+
+@tool(args_schema=GetIframeTextContentArgs)
+async def get_iframe_text_content(session_id: str, mode: str = "full"):
+    """
+    iframe에서 내부의 화면 내용을 텍스트로 가져옵니다.
+    같은 화면을 다시 확인할 때는 mode="diff"로 바뀐 부분만 받을 수 있습니다.
+    """
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("get_iframe_text_content"):
+        work_area_frame = await _get_frame(session=session)
+        snapshot_key = _get_snapshot_key(work_area_frame)
+        previous = session.text_snapshots.get(snapshot_key)
+
+        content = await _get_iframe_text_content(session_id)
+        session.text_snapshots.put(snapshot_key, content)
+
+    if mode == "diff" and previous is not None:
+        return diff_text(previous, content)
+
+    return f"(hash: {content_hash(content)})\n{content}"
+
+
+def _get_snapshot_key(frame: Frame) -> str:
+    # 쿼리스트링(sap-wd 상태값 등)은 제외하고 화면 단위로 구분
+    return frame.url.split("?")[0]
 
 
 async def _get_iframe_text_content(session_id: str):
@@ -120,76 +269,139 @@ async def _get_iframe_text_content(session_id: str):
     return combined_text
 
 
+# 인터랙션 가능한 후보 요소
+INTERACTIVE_ELEMENT_SELECTOR = "input, select, textarea, button, a, [role='button'], [role='input']"
+
+# 후보 필터링과 outerHTML 추출을 frame 안에서 한 번에 처리하는 스크립트
+# 요소마다 data-agent-idx를 붙여 두어, 같은 문서 안에서는 다시 조회해도 번호가 유지됩니다.
+_INTERACTIVE_ELEMENT_SCRIPT = """
+(selector) => {
+    window.__agentElementSeq = window.__agentElementSeq || 0;
+    const result = [];
+
+    document.querySelectorAll(selector).forEach((el) => {
+        const tagName = el.tagName.toLowerCase();
+
+        // 1) 숨겨진 input 제외
+        if (tagName === 'input' && (el.getAttribute('type') || '') === 'hidden') return;
+
+        // 2) aria-hidden="true" 또는 display:none 등 숨겨진 요소 제외
+        if (el.getAttribute('aria-hidden') === 'true') return;
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return;
+        if (getComputedStyle(el).visibility === 'hidden') return;
+
+        // 3) 시각적 텍스트/라벨이 없는 버튼류 제거
+        const txt = el.innerText || el.getAttribute('aria-label') || el.title;
+        const hasText = Boolean(txt && txt.trim().length > 0);
+        if (['button', 'div', 'span', 'a'].includes(tagName) && !hasText) return;
+
+        let index = el.getAttribute('data-agent-idx');
+        if (index === null) {
+            index = String(++window.__agentElementSeq);
+            el.setAttribute('data-agent-idx', index);
+        }
+        result.push({ index: Number(index), html: el.outerHTML });
+    });
+
+    return result;
+}
+"""
+
+
 @tool()
 async def get_iframe_interactive_element(session_id: str):
-    """iframe에서 상호작용할 수 있는 HTML 요소들을 가져옵니다."""
-    return await _get_iframe_interactive_element(session_id)
+    """
+    iframe에서 상호작용할 수 있는 HTML 요소들을 가져옵니다.
+    각 요소 앞의 [번호]로 click_element를 호출해 클릭할 수 있습니다.
+    """
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("get_iframe_interactive_element"):
+        return await _get_iframe_interactive_element(session_id)
 
 
 async def _get_iframe_interactive_element(session_id: str):
     session = session_manager.get_session(session_id)
     work_area_frame = await _get_frame(session=session)
 
-    # 인터랙션 가능한 후보 요소 수집
-    interaction_element_list = await work_area_frame.query_selector_all(
-        "input, select, textarea, button, a, [role='button'], [role='input']"
-    )
+    elements = await _extract_interactive_elements(work_area_frame)
+    return "\n".join(f"[{element['index']}] {element['html']}" for element in elements)
 
-    filtered_elements_html = []
 
-    for handle in interaction_element_list:
-        element = handle.as_element()
-        if element is None:
-            continue
+async def _extract_interactive_elements(frame: Frame) -> List[Dict]:
+    """frame 안의 인터랙션 가능한 요소를 한 번의 evaluate로 수집합니다."""
+    return await frame.evaluate(_INTERACTIVE_ELEMENT_SCRIPT, INTERACTIVE_ELEMENT_SELECTOR)
 
-        # 기본 정보 가져오기
-        tag_name = await element.evaluate("(el) => el.tagName.toLowerCase()")
-        element_type = await element.evaluate("(el) => el.getAttribute('type') || ''")
-        aria_hidden = await element.evaluate("(el) => el.getAttribute('aria-hidden')")
-        is_hidden = await element.is_hidden()
 
-        # 1) 숨겨진 input 제외
-        if tag_name == "input" and element_type == "hidden":
-            continue
+async def _find_work_area_frame(session: Session) -> Optional[Frame]:
+    """대기 없이 현재 work area frame을 찾습니다. 아직 없으면 None"""
+    content_area_frame = await session.page.query_selector("iframe#contentAreaFrame")
+    if content_area_frame is None:
+        return None
+
+    frame = await content_area_frame.content_frame()
+    if frame is None:
+        return None
+
+    work_area_frame_element = await frame.query_selector("#isolatedWorkArea")
+    if work_area_frame_element is None:
+        return None
+
+    return await work_area_frame_element.content_frame()
 
-        # 2) aria-hidden="true" 또는 display:none 등 숨겨진 요소 제외
-        if aria_hidden == "true" or is_hidden:
-            continue
 
-        # 3) 시각적 텍스트/라벨이 없는 버튼류 제거
-        has_text = await element.evaluate(
-            """(el) => {
-                const txt = el.innerText || el.getAttribute('aria-label') || el.title;
-                return txt && txt.trim().length > 0;
-            }"""
-        )
-        if tag_name in ["button", "div", "span", "a"] and not has_text:
-            continue
+async def _wait_until_ready(session: Session, label: str, timeout: Optional[float] = None) -> bool:
+    """
+    고정 sleep 대신 페이지가 실제로 안정될 때까지 대기합니다.
+    진행 중인 요청이 없고, work area frame의 DOM 변화와 WebDynpro busy 표시가 멈추면 반환합니다.
+    """
+    started_at = time()
+    deadline = get_deadline(timeout)
+    stable = False
+
+    while time() < deadline:
+        if not await session.network.wait_idle(deadline):
+            break
 
-        # outerHTML 추출
-        outer_html = await element.evaluate("(el) => el.outerHTML")
-        filtered_elements_html.append(outer_html)
+        try:
+            frame = await _find_work_area_frame(session)
+        except Exception:
+            frame = None
 
-    return "\n".join(filtered_elements_html)
+        if frame is not None and not await wait_for_frame_stable(frame, deadline):
+            break
+
+        # frame이 안정되는 동안 새 요청이 시작되지 않았으면 완료
+        if session.network.pending_count() == 0:
+            stable = True
+            break
+
+    record_ready_wait(session.ready_waits, label, started_at, stable)
+    return stable
 
 
 async def _get_frame(session: Session):
+    # 같은 화면에서 반복 호출되면 캐시된 frame을 바로 사용
+    cached_frame = session.work_area_frame
+    if cached_frame is not None and not cached_frame.is_detached():
+        session.frame_cache_stats["hit"] += 1
+        return cached_frame
+    session.frame_cache_stats["miss"] += 1
+
     # iframe 요소 선택
     content_area_frame = await session.page.query_selector("iframe#contentAreaFrame")
-    print(f"frame element: {content_area_frame}")
 
     # iframe의 실제 Frame 객체 얻기
     frame = await content_area_frame.content_frame()
-    print(f"frame: {frame}")
 
     # iframe 안에서 #isolatedWorkArea 선택
     work_area_frame_element = await frame.query_selector("#isolatedWorkArea")
-    print(f"work area element: {work_area_frame_element}")
 
     # isolatedWorkArea도 iframe일 경우, 다시 content_frame() 호출
     work_area_frame = await work_area_frame_element.content_frame()
     await work_area_frame.wait_for_load_state("domcontentloaded", timeout=8 * 1000)
 
+    session.work_area_frame = work_area_frame
     return work_area_frame
 
 
@@ -201,7 +413,9 @@ class ClickArgs(BaseModel):
 @tool(args_schema=ClickArgs)
 async def click_in_iframe(session_id: str, selector: str):
     """iframe안에 있는 HTML 요소를 클릭합니다."""
-    return await _click_in_iframe(session_id, selector)
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("click_in_iframe"):
+        return await _click_in_iframe(session_id, selector)
 
 
 async def _click_in_iframe(session_id: str, selector: str):
@@ -209,13 +423,31 @@ async def _click_in_iframe(session_id: str, selector: str):
     session = session_manager.get_session(session_id)
     work_area_frame = await _get_frame(session)
 
-    await session.page.screenshot(path="screen.png")
+    await capture_trace_screenshot(session.page, session.id, f"click {selector}")
     await work_area_frame.wait_for_selector(selector, timeout=4 * 1000)
     await work_area_frame.click(selector=selector, timeout=4 * 1000)
+    await _wait_until_ready(session, f"클릭 '{selector}'")
 
     return True
 
 
+class ClickElementArgs(BaseModel):
+    session_id: str = Field(description="Session ID for the browser session")
+    index: int = Field(description="get_iframe_interactive_element 결과에서 요소 앞에 표시된 번호")
+
+
+@tool(args_schema=ClickElementArgs)
+async def click_element(session_id: str, index: int):
+    """get_iframe_interactive_element로 조회한 요소를 번호로 클릭합니다."""
+    session = session_manager.get_session(session_id)
+    async with session.action_lock.hold("click_element"):
+        return await _click_in_iframe(session_id, _get_element_selector(index))
+
+
+def _get_element_selector(index: int) -> str:
+    return f'[data-agent-idx="{index}"]'
+
+
 class QuerySelectorArgs(BaseModel):
     session_id: str = Field(description="Session ID for the browser session")
     selector: str = Field(description="CSS selector or XPath of element to click")
@@ -237,31 +469,57 @@ class InsertTextArgs(BaseModel):
 async def insert_text(session_id: str, content: str):
     """simulate keyboard typing"""
     session = session_manager.get_session(session_id)
-    await session.page.keyboard.insert_text(content)
+    async with session.action_lock.hold("insert_text"):
+        await session.page.keyboard.insert_text(content)
 
     return True
 
 
-async def usaint_login(session: Session, id: str, password: str):
-    await session.page.goto("https://saint.ssu.ac.kr/irj/portal")
+USAINT_PORTAL_URL = "https://saint.ssu.ac.kr/irj/portal"
+
 
+async def _is_logged_in(session: Session) -> bool:
+    """포털에 로그인 버튼이 없으면 로그인된 상태로 판단합니다."""
     login_button = await session.page.query_selector('//*[@id="s_btnLogin"]')
-    if login_button is None:
-        return True
+    return login_button is None
 
-    await session.page.click('//*[@id="s_btnLogin"]')
 
-    await session.page.click('//*[@id="userid"]')
-    await session.page.keyboard.insert_text(id)
+async def usaint_login(session: Session, id: str, password: str):
+    # 같은 계정의 다른 탭이 로그인 중이면 끝날 때까지 기다린 뒤 쿠키를 공유
+    async with session.account.login_lock:
+        # 저장된 스냅샷이나 다른 탭으로 로그인된 쿠키가 유효하면 폼 로그인 없이 통과
+        await session.page.goto(USAINT_PORTAL_URL, wait_until="domcontentloaded")
 
-    await session.page.click('//*[@id="pwd"]')
-    await session.page.keyboard.insert_text(password)
+        if await _is_logged_in(session):
+            session.logged_in = True
+            if session.needs_login_state_refresh():
+                await session.save_state()
+            print(f"[Usaint] 저장된 로그인 상태 사용: {session.id}")
+            return True
 
-    await session.page.click('//*[@id="sLogin"]/div/div[1]/form/div/div[2]')
+        await session.page.click('//*[@id="s_btnLogin"]')
 
-    await session.page.wait_for_load_state("domcontentloaded")
-    await asyncio.sleep(1)
-    await session.page.reload(wait_until="domcontentloaded")
+        await session.page.click('//*[@id="userid"]')
+        await session.page.keyboard.insert_text(id)
+
+        await session.page.click('//*[@id="pwd"]')
+        await session.page.keyboard.insert_text(password)
+
+        await session.page.click('//*[@id="sLogin"]/div/div[1]/form/div/div[2]')
+
+        await session.page.wait_for_load_state("domcontentloaded")
+        await _wait_until_ready(session, "로그인")
+        await session.page.reload(wait_until="domcontentloaded")
+
+        # 로그인 성공 시 다음 세션을 위해 스냅샷 저장
+        session.logged_in = await _is_logged_in(session)
+        if session.logged_in:
+            await session.save_state()
+        else:
+            delete_login_state(id)
+            print(f"[Usaint] 로그인 실패: {session.id}")
+
+        return session.logged_in
 
 
 async def main():
@@ -269,30 +527,16 @@ async def main():
     session = session_manager.get_session(session_id)
 
     async with async_playwright() as playwright:
-        await session.start(playwright)
+        await session.start(playwright, usaint_id=get_env("USAINT_ID"))
         await usaint_login(session, get_env("USAINT_ID"), get_env("USAINT_PASSWORD"))
 
         # frame = document.querySelector('iframe#contentAreaFrame')
         # work_area = frame.contentDocument.querySelector('#isolatedWorkArea')
         # work_area.contentDocument.querySelector('table')
 
-        menu = session.page.get_by_role("link", name="학사관리")
-        print(f"학사관리 menu: {menu}")
-        await menu.click()
-        await session.page.wait_for_load_state("domcontentloaded")
-        await asyncio.sleep(2)
-
-        menu = session.page.get_by_role("link", name="수강신청/교과과정")
-        print(f"수강신청/교과과정 menu: {menu}")
-        await menu.click()
-        await session.page.wait_for_load_state("domcontentloaded")
-        await asyncio.sleep(2)
-
-        menu = session.page.get_by_role("link", name="개인수업시간표조회")
-        print(f"개인수업시간표조회 menu: {menu}")
-        await menu.click()
-        await session.page.wait_for_load_state("domcontentloaded")
-        await asyncio.sleep(2)
+        await _select_navigation_menu(session_id, "학사관리")
+        await _select_navigation_menu(session_id, "수강신청/교과과정")
+        await _select_navigation_menu(session_id, "개인수업시간표조회")
 
         content = await _get_iframe_text_content(session_id)
         print(f"content: {content}")
@@ -0,0 +1,168 @@
+import asyncio
+from typing import Dict, Set
+
+from apps.agent.browser_pool import browser_pool
+from apps.agent.session import Session, session_manager
+from apps.agent.usaint import USAINT_PORTAL_URL, _is_logged_in, _navigate_to
+from lib.env import get_env
+
+# 살아 있는 탭을 점검하는 주기
+WATCHDOG_INTERVAL_SECONDS = int(get_env("WATCHDOG_INTERVAL_SECONDS") or 15)
+
+# 이 시간 안에 evaluate 응답이 없으면 멈춘 것으로 판단
+WATCHDOG_PING_TIMEOUT_SECONDS = float(get_env("WATCHDOG_PING_TIMEOUT_SECONDS") or 5)
+
+# 이 횟수만큼 연속으로 ping 타임아웃이 나야 멈춘 것으로 판단 (느린 화면 전환 한 번으로 복구하지 않도록)
+WATCHDOG_MAX_MISSES = int(get_env("WATCHDOG_MAX_MISSES") or 3)
+
+
+class SessionWatchdog:
+    """
+    세션 탭이 죽거나(crash/close) 멈추면(ping 타임아웃) 다시 만들고,
+    로그인 스냅샷과 마지막 메뉴 경로로 이전 화면까지 복원합니다.
+    """
+
+    def __init__(self):
+        self._recovering: Set[str] = set()
+        self._misses: Dict[str, int] = {}  # 세션별 연속 ping 타임아웃 횟수
+        self.stats: Dict[str, int] = {"pings": 0, "hangs": 0, "recoveries": 0, "failures": 0}
+
+    async def ping(self, session: Session) -> bool:
+        """
+        가벼운 evaluate로 탭이 응답하는지 확인합니다.
+        타임아웃이거나 탭이 닫혔을 때만 False이고, 화면 전환 중 실행 컨텍스트가 바뀌어 나는 오류는 응답으로 봅니다.
+        """
+        self.stats["pings"] += 1
+        try:
+            await asyncio.wait_for(session.page.evaluate("1"), timeout=WATCHDOG_PING_TIMEOUT_SECONDS)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except Exception:
+            return not (session.broken_reason or session.page is None or session.page.is_closed())
+
+    async def check_all(self):
+        """살아 있는 모든 세션 탭을 점검합니다."""
+        live_ids = {session_id for session_id, session in session_manager.session_map.items() if session.is_live()}
+        for session_id in list(self._misses):
+            if session_id not in live_ids:
+                self._misses.pop(session_id, None)
+
+        # 도구 호출/복원 중인 탭은 긴 화면 전환 중일 수 있으므로 점검하지 않음
+        sessions = [
+            session
+            for session in list(session_manager.session_map.values())
+            if session.is_live() and session.id not in self._recovering and not session.action_lock.locked()
+        ]
+        if not sessions:
+            return
+
+        results = await asyncio.gather(*[self.ping(session) for session in sessions])
+        for session, alive in zip(sessions, results):
+            if alive:
+                self._misses.pop(session.id, None)
+                continue
+
+            reason = session.broken_reason or "hang"
+            if reason == "hang":
+                misses = self._misses.get(session.id, 0) + 1
+                self._misses[session.id] = misses
+                if misses < WATCHDOG_MAX_MISSES:
+                    print(f"[Watchdog] ping 타임아웃 ({misses}/{WATCHDOG_MAX_MISSES}): {session.id}")
+                    continue
+                self.stats["hangs"] += 1
+                await self._release_hung_session(session)
+
+            self._misses.pop(session.id, None)
+            await self.recover(session, reason)
+
+    async def _release_hung_session(self, session: Session):
+        """
+        멈춘 탭부터 닫고, 안 닫히면 계정 컨텍스트를 버립니다.
+        브라우저를 강제 종료하면 같은 브라우저의 다른 세션도 모두 사라지므로,
+        임시 컨텍스트의 새 탭도 응답하지 않아 브라우저 전체가 멈춘 것이 확인될 때만 종료합니다.
+        """
+        page = session.page
+        if page is not None and not page.is_closed():
+            try:
+                await asyncio.wait_for(page.close(), timeout=WATCHDOG_PING_TIMEOUT_SECONDS)
+                print(f"[Watchdog] 멈춘 탭 닫음: {session.id}")
+                return
+            except Exception:
+                pass
+
+        context = session.context
+        if context is None:
+            return
+
+        if await browser_pool.probe_browser(context, WATCHDOG_PING_TIMEOUT_SECONDS):
+            # 브라우저는 응답하므로 이 계정의 컨텍스트만 버리고 로그인 스냅샷으로 다시 만듦
+            print(f"[Watchdog] 탭이 닫히지 않아 계정 컨텍스트를 다시 만듭니다: {session.id}")
+            try:
+                await asyncio.wait_for(context.close(), timeout=WATCHDOG_PING_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+            if session.account is not None:
+                await session.account.reset_context()
+            return
+
+        # 렌더러/브라우저 전체가 멈춘 경우 프로세스를 종료해야 진행 중인 동작도 풀림
+        await browser_pool.kill_browser(context)
+
+    async def recover(self, session: Session, reason: str):
+        """탭(필요하면 컨텍스트까지)을 다시 만들고 마지막 화면으로 이동합니다."""
+        if session.id in self._recovering or session.playwright is None:
+            return
+
+        self._recovering.add(session.id)
+        print(f"[Watchdog] 세션 복구 시작 ({reason}): {session.id}")
+        try:
+            account = session.account
+            page = session.page
+            if page is not None and not page.is_closed():
+                try:
+                    await asyncio.wait_for(page.close(), timeout=WATCHDOG_PING_TIMEOUT_SECONDS)
+                except Exception:
+                    pass
+
+            # 브라우저가 죽었으면 계정 컨텍스트도 다시 만들어야 함 (로그인 스냅샷으로 복원)
+            if account is not None and account.context is not None:
+                if not browser_pool.is_context_alive(account.context):
+                    await account.reset_context()
+
+            # 복구가 끝날 때까지 다음 도구 호출은 대기
+            async with session.action_lock.hold("watchdog 복구"):
+                navigation_path = list(session.navigation_path)
+                await session.start(
+                    session.playwright,
+                    block_resources=session.block_resources,
+                    usaint_id=account.usaint_id if account else None,
+                )
+                await self._restore_view(session, navigation_path)
+
+            self.stats["recoveries"] += 1
+            print(f"[Watchdog] 세션 복구 완료: {session.id}")
+        except Exception as e:
+            self.stats["failures"] += 1
+            print(f"[Watchdog] 세션 복구 실패: {session.id} - {e}")
+        finally:
+            self._recovering.discard(session.id)
+
+    async def _restore_view(self, session: Session, navigation_path):
+        await session.page.goto(USAINT_PORTAL_URL, wait_until="domcontentloaded")
+        session.logged_in = await _is_logged_in(session)
+
+        if not session.logged_in:
+            # 스냅샷이 없거나 만료됨. 탭을 반납해 다음 대화 턴에서 새로 시작하고 로그인
+            print(f"[Watchdog] 로그인 상태를 복원하지 못했습니다: {session.id}")
+            await session.close()
+            return
+
+        if navigation_path:
+            await _navigate_to(session.id, navigation_path[-1])
+
+
+session_watchdog = SessionWatchdog()
+
+# crash/close 이벤트가 오면 다음 점검을 기다리지 않고 바로 복구
+session_manager.broken_handler = session_watchdog.recover
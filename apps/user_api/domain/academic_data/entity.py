@@ -0,0 +1,51 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+from lib.database import Base
+
+
+class AcademicData(Base):
+    __tablename__ = "academic_data"
+    __table_args__ = (
+        UniqueConstraint("account_key", "data_type", "semester", name="uq_academic_data_entry"),
+    )
+
+    academic_data_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+
+    # 유세인트 계정 해시 (학번이 그대로 남지 않도록)
+    account_key = Column(String(64), nullable=False, index=True)
+
+    # 데이터 종류 (GRADES, GRADE_STATUS, TIMETABLE, ACADEMIC_RECORD, SCHOLARSHIP)
+    data_type = Column(String(50), nullable=False)
+
+    # 학기별 데이터의 학기 (예: '2025-2학기'), 학기와 무관한 데이터는 빈 문자열
+    semester = Column(String(20), nullable=False, default="")
+
+    # 조회 결과 (JSON)
+    payload = Column(Text, nullable=False)
+
+    fetched_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    # Creation
+    @classmethod
+    def create(cls, account_key: str, data_type: str, semester: str, payload: str, fetched_at: datetime, expires_at: datetime):
+        return cls(
+            account_key=account_key,
+            data_type=data_type,
+            semester=semester,
+            payload=payload,
+            fetched_at=fetched_at,
+            expires_at=expires_at,
+        )
+
+    def update(self, payload: str, fetched_at: datetime, expires_at: datetime):
+        self.payload = payload
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+    def is_expired(self, now: datetime) -> bool:
+        return now >= self.expires_at
+
+    # Utility
+    def __str__(self):
+        return f"[AcademicData] id: {self.academic_data_id}, type: {self.data_type}, semester: {self.semester}, expires_at: {self.expires_at}"
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from apps.user_api.domain.academic_data.entity import AcademicData
+from lib.database import transactional
+
+
+def get_academic_data(db: Session, account_key: str, data_type: str, semester: str = "") -> Optional[AcademicData]:
+    """
+    계정의 캐시된 학사 데이터 한 건을 조회합니다. (만료 여부와 무관)
+    - Returns:
+        - AcademicData | None: 저장된 데이터가 없으면 None
+    """
+    return (
+        db.query(AcademicData)
+        .filter(
+            AcademicData.account_key == account_key,
+            AcademicData.data_type == data_type,
+            AcademicData.semester == semester,
+        )
+        .first()
+    )
+
+
+def get_academic_data_list(db: Session, account_key: str, data_type: str) -> List[AcademicData]:
+    """계정의 특정 종류 데이터를 학기와 관계없이 모두 조회합니다."""
+    return (
+        db.query(AcademicData)
+        .filter(AcademicData.account_key == account_key, AcademicData.data_type == data_type)
+        .all()
+    )
+
+
+def save_academic_data(
+    db: Session,
+    account_key: str,
+    data_type: str,
+    semester: str,
+    payload: str,
+    fetched_at: datetime,
+    expires_at: datetime,
+) -> AcademicData:
+    """
+    학사 데이터를 저장합니다. 같은 (계정, 종류, 학기)가 있으면 덮어씁니다.
+    채팅과 스케줄러가 동시에 처음 저장하는 경우 한쪽이 실패하므로 한 번 더 덮어쓰기를 시도합니다.
+    """
+    try:
+        return _upsert_academic_data(db, account_key, data_type, semester, payload, fetched_at, expires_at)
+    except IntegrityError:
+        return _upsert_academic_data(db, account_key, data_type, semester, payload, fetched_at, expires_at)
+
+
+@transactional
+def _upsert_academic_data(
+    db: Session,
+    account_key: str,
+    data_type: str,
+    semester: str,
+    payload: str,
+    fetched_at: datetime,
+    expires_at: datetime,
+) -> AcademicData:
+    entry = get_academic_data(db, account_key, data_type, semester)
+    if entry is None:
+        entry = AcademicData.create(account_key, data_type, semester, payload, fetched_at, expires_at)
+        db.add(entry)
+    else:
+        entry.update(payload, fetched_at, expires_at)
+    return entry
+
+
+@transactional
+def delete_academic_data(db: Session, account_key: str, data_type: str, semester: Optional[str] = None) -> int:
+    """
+    계정의 학사 데이터를 삭제합니다. semester가 없으면 해당 종류 전체를 삭제합니다.
+    - Returns:
+        - int: 삭제된 행 수
+    """
+    query = db.query(AcademicData).filter(
+        AcademicData.account_key == account_key, AcademicData.data_type == data_type
+    )
+    if semester is not None:
+        query = query.filter(AcademicData.semester == semester)
+    return query.delete(synchronize_session=False)
@@ -77,6 +77,11 @@ def register_socket_handlers(sio: AsyncServer):
         try:
             async with sio.session(sid) as session:
                 user_id = session.get("user_id")
+                joined_rooms = session.get("joined_rooms", set())
+
+            # 입장한 채팅방의 예열이 아직 진행 중이면 취소
+            for chat_room_id in joined_rooms:
+                await agent_service.cancel_chat_room_warm_up(chat_room_id)
             print(f"[Socket.io] 사용자 연결 해제: user_id={user_id}, sid={sid}")
         except Exception as e:
             print(f"[Socket.io] 연결 해제 오류: {e} (sid={sid})")
@@ -112,6 +117,20 @@ def register_socket_handlers(sio: AsyncServer):
                     room=sid,
                 )
                 print(f"[Socket.io] 사용자 {user_id}가 채팅방 {chat_room_id}에 입장")
+
+                async with sio.session(sid) as session:
+                    session.setdefault("joined_rooms", set()).add(chat_room_id)
+
+                # 첫 메시지 전에 브라우저와 유세인트 로그인을 미리 준비 (백그라운드)
+                usaint_account = db.query(UsaintAccount).filter(
+                    UsaintAccount.user_id == user_id
+                ).first()
+                if usaint_account:
+                    await agent_service.warm_up_chat_room(
+                        chat_room_id,
+                        usaint_account.id,
+                        decrypt_password(usaint_account.password) if usaint_account.password else None,
+                    )
             finally:
                 db.close()
 
@@ -139,6 +158,10 @@ def register_socket_handlers(sio: AsyncServer):
 
             async with sio.session(sid) as session:
                 user_id = session.get("user_id")
+                session.get("joined_rooms", set()).discard(chat_room_id)
+
+            # 첫 메시지 없이 나갔으면 예열을 취소
+            await agent_service.cancel_chat_room_warm_up(chat_room_id)
             print(f"[Socket.io] 사용자 {user_id}가 채팅방 {chat_room_id}에서 퇴장")
 
         except Exception as e:
@@ -297,6 +320,18 @@ def register_socket_handlers(sio: AsyncServer):
 
                         print(f"[Socket.io] 에이전트 응답 전송 완료")
 
+                    # 브라우저 자리 대기 이벤트 (DB에는 저장하지 않음)
+                    elif event_type == "queue":
+                        await sio.emit(
+                            "agent_queue",
+                            {
+                                "chat_room_id": chat_room_id,
+                                "position": event.get("position"),
+                                "message": event.get("message"),
+                            },
+                            room=sid,
+                        )
+
                     # 에러 이벤트
                     elif event_type == "error":
                         error_message = event.get("message")
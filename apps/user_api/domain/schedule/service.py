@@ -158,8 +158,9 @@ async def run_schedule_agent_task(db: Session, schedule: Schedule):
         new_result = None  # AI가 반환한 핵심 데이터
 
         # task_type에 따라 적절한 파라미터로 함수 호출
-        # agent_service의 세션 관리를 위해 임의의 chat_room_id 생성
-        dummy_chat_room_id = schedule.schedule_id * 10000  # schedule_id 기반으로 고유한 값 생성
+        # agent_service는 이 값으로 스케줄러 전용 탭(schedule_{id})을 만들고,
+        # 브라우저 컨텍스트는 같은 학생의 채팅방과 유세인트 계정 단위로 공유합니다.
+        dummy_chat_room_id = schedule.schedule_id
 
         if schedule.task_type == "CAFETERIA_CHECK":
             # 학식 조회는 restaurant_code 필요
@@ -176,6 +177,7 @@ async def run_schedule_agent_task(db: Session, schedule: Schedule):
             )
         else:
             # 성적 조회, 장학금 공지 조회 등은 기본 파라미터만 필요
+            # (성적은 채팅과 공유하는 학사 데이터 캐시를 먼저 확인하고, 새로 조회한 결과는 캐시에 저장)
             new_result = await agent_data_function(
                 chat_room_id=dummy_chat_room_id,
                 user_id=schedule.user_id
@@ -25,7 +25,34 @@ type EnvKey = Literal[
     "JWT_SECRET",
     "JWT_ALGORITHM",
     "ACCESS_TOKEN_TTL_MINUTES",
-    "ENCRYPTION_KEY"
+    "ENCRYPTION_KEY",
+    "BROWSER_POOL_SIZE",
+    "BROWSER_MAX_CONTEXTS",
+    "USAINT_FAST_MODE",
+    "LOGIN_STATE_MAX_AGE_SECONDS",
+    "LOGIN_STATE_REFRESH_SECONDS",
+    "ACCOUNT_MAX_TABS",
+    "PAGE_READY_TIMEOUT_SECONDS",
+    "PAGE_READY_QUIET_MS",
+    "TRACE_SCREENSHOT_RATE",
+    "MAX_SESSIONS",
+    "BROWSER_MEMORY_BUDGET_MB",
+    "ADMISSION_TIMEOUT_SECONDS",
+    "BROWSER_WORKERS",
+    "PROFILE_DISK_BUDGET_MB",
+    "WATCHDOG_INTERVAL_SECONDS",
+    "WATCHDOG_PING_TIMEOUT_SECONDS",
+    "WATCHDOG_MAX_MISSES",
+    "MAX_CONCURRENT_WARM_UPS",
+    "CHECKPOINT_DATABASE_URL",
+    "CHECKPOINT_KEEP_LATEST",
+    "HISTORY_TOKEN_BUDGET",
+    "HISTORY_KEEP_RECENT_TURNS",
+    "TOOL_OUTPUT_CAPTURE_DIR",
+    "INTENT_ROUTER_ENABLED",
+    "INTENT_ROUTER_MIN_SIMILARITY",
+    "ANSWER_CACHE_ENABLED",
+    "ANSWER_CACHE_MIN_SIMILARITY",
 ]
 
 
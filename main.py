@@ -14,13 +14,18 @@ import apps.user_api.domain.usaint_account.controller as UsaintAccountRouter
 import apps.user_api.domain.user.controller as UserRouter
 import apps.user_api.domain.notification.controller as NotificationRouter
 from apps.agent.agent_service import agent_service
+from apps.agent.browser_worker import browser_worker_farm
+from apps.agent.checkpointer import create_checkpoint_tables
+from apps.agent.profile_gc import collect_profiles
 from apps.agent.session import session_manager
+from apps.agent.watchdog import WATCHDOG_INTERVAL_SECONDS, session_watchdog
 from apps.user_api.domain.chat.socket_handler import register_socket_handlers
 from apps.user_api.domain.schedule.service import check_and_run_due_schedules
 from lib.database import Base, engine
 
 # Import all models for table creation
 from apps.user_api.domain.notification.entity import PushSubscription
+from apps.user_api.domain.academic_data.entity import AcademicData
 
 scheduler = AsyncIOScheduler(timezone="Asia/Seoul")
 
@@ -33,6 +38,33 @@ async def cleanup_inactive_sessions_job():
     except Exception as e:
         print(f"[Scheduler] 세션 정리 작업 중 오류: {e}")
 
+async def refresh_login_states_job():
+    """사용 중인 세션의 유세인트 로그인 스냅샷을 갱신하는 스케줄러 작업"""
+    try:
+        await session_manager.refresh_login_states()
+    except Exception as e:
+        print(f"[Scheduler] 로그인 스냅샷 갱신 중 오류: {e}")
+
+async def profile_gc_job():
+    """닫힌 세션 프로필과 만료된 스냅샷을 정리하는 스케줄러 작업"""
+    try:
+        if browser_worker_farm.enabled:
+            # 워커 모드에서는 계정 컨텍스트가 워커 프로세스에 있으므로 워커마다 사용 중인 키를 받아옴
+            # (응답하지 않는 워커가 있으면 사용 중인 프로필을 지울 수 있으므로 이번 정리는 건너뜀)
+            live_keys = await browser_worker_farm.live_account_keys()
+        else:
+            live_keys = set(session_manager.account_map.keys())
+        await asyncio.to_thread(collect_profiles, live_keys)
+    except Exception as e:
+        print(f"[Scheduler] 프로필 정리 작업 중 오류: {e}")
+
+async def watchdog_job():
+    """멈추거나 죽은 브라우저 탭을 찾아 복구하는 스케줄러 작업"""
+    try:
+        await session_watchdog.check_all()
+    except Exception as e:
+        print(f"[Scheduler] watchdog 점검 중 오류: {e}")
+
 async def check_and_run_due_schedules_job():
     """스케줄러 작업을 위한 비동기 래퍼"""
     try:
@@ -56,6 +88,30 @@ async def lifespan(app: FastAPI):
         coalesce=True,  # 밀린 작업은 한 번만 실행
         max_instances=1,  # 동시 실행 인스턴스 1개로 제한
     )
+    scheduler.add_job(
+        refresh_login_states_job,
+        "interval",
+        minutes=5,
+        id="login_state_refresh_job",
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.add_job(
+        watchdog_job,
+        "interval",
+        seconds=WATCHDOG_INTERVAL_SECONDS,
+        id="watchdog_job",
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.add_job(
+        profile_gc_job,
+        "interval",
+        minutes=30,
+        id="profile_gc_job",
+        coalesce=True,
+        max_instances=1,
+    )
     scheduler.start()
     print("스케줄러가 시작되었습니다.")
 
@@ -113,3 +169,4 @@ app = socketio.ASGIApp(sio, other_asgi_app=app)
 
 # initial table creation
 Base.metadata.create_all(bind=engine)
+create_checkpoint_tables()
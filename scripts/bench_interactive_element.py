@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+get_iframe_interactive_element 마이크로벤치마크
+
+기존 방식(요소마다 여러 번 evaluate 호출)과 frame 안에서 한 번에 처리하는 방식의
+소요 시간을 같은 페이지에서 비교합니다.
+
+사용법:
+    python scripts/bench_interactive_element.py                      # SAP 화면을 흉내 낸 합성 페이지
+    python scripts/bench_interactive_element.py --fixture page.html  # 저장해 둔 유세인트 work area HTML
+
+fixture는 work area frame에서 document.documentElement.outerHTML을 저장한 파일을 사용하면 됩니다.
+(개인정보가 포함되므로 저장소에는 올리지 마세요.)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from playwright.async_api import Frame, async_playwright
+
+from apps.agent.usaint import INTERACTIVE_ELEMENT_SELECTOR, _extract_interactive_elements
+
+
+def build_synthetic_fixture(rows: int) -> str:
+    """WebDynpro 성적/시간표 화면처럼 입력, 링크, 숨은 요소가 섞인 테이블 페이지"""
+    body = []
+    for i in range(rows):
+        body.append(
+            f"""
+            <tr id="WD{i:04X}-row">
+                <td><a id="WD{i:04X}A" href="#" class="lsLink">과목 {i}</a></td>
+                <td><input id="WD{i:04X}I" type="text" value="{i % 5}" class="lsField"></td>
+                <td><input id="WD{i:04X}H" type="hidden" value="sap-{i}"></td>
+                <td><span role="button" id="WD{i:04X}B" class="lsButton">상세</span></td>
+                <td><a id="WD{i:04X}E" href="#" aria-hidden="true"></a></td>
+                <td><button id="WD{i:04X}N" style="display:none">숨김</button></td>
+                <td><select id="WD{i:04X}S"><option>1학기</option><option>2학기</option></select></td>
+            </tr>"""
+        )
+
+    return f"""
+    <html>
+        <body>
+            <div id="ur-loading" style="display:none"></div>
+            <button id="WDPREV">이전학기</button>
+            <button id="WDNEXT">다음학기</button>
+            <table id="WD01F4-contentTBody">{''.join(body)}</table>
+        </body>
+    </html>
+    """
+
+
+async def legacy_extract(frame: Frame):
+    """변경 전 _get_iframe_interactive_element의 요소별 호출 방식"""
+    interaction_element_list = await frame.query_selector_all(INTERACTIVE_ELEMENT_SELECTOR)
+
+    filtered_elements_html = []
+
+    for handle in interaction_element_list:
+        element = handle.as_element()
+        if element is None:
+            continue
+
+        tag_name = await element.evaluate("(el) => el.tagName.toLowerCase()")
+        element_type = await element.evaluate("(el) => el.getAttribute('type') || ''")
+        aria_hidden = await element.evaluate("(el) => el.getAttribute('aria-hidden')")
+        is_hidden = await element.is_hidden()
+
+        if tag_name == "input" and element_type == "hidden":
+            continue
+
+        if aria_hidden == "true" or is_hidden:
+            continue
+
+        has_text = await element.evaluate(
+            """(el) => {
+                const txt = el.innerText || el.getAttribute('aria-label') || el.title;
+                return txt && txt.trim().length > 0;
+            }"""
+        )
+        if tag_name in ["button", "div", "span", "a"] and not has_text:
+            continue
+
+        outer_html = await element.evaluate("(el) => el.outerHTML")
+        filtered_elements_html.append(outer_html)
+
+    return filtered_elements_html
+
+
+async def measure(label: str, func, frame: Frame, repeat: int):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        started_at = perf_counter()
+        result = await func(frame)
+        timings.append(perf_counter() - started_at)
+        count = len(result)
+
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"{label:<10} 요소 {count:>5}개 | 중앙값 {median * 1000:>9.1f}ms | 최소 {timings[0] * 1000:>9.1f}ms")
+    return median
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="interactive element 추출 벤치마크")
+    parser.add_argument("--fixture", help="저장해 둔 work area HTML 파일 경로")
+    parser.add_argument("--rows", type=int, default=200, help="합성 페이지 행 수 (fixture 미지정 시)")
+    parser.add_argument("--repeat", type=int, default=5, help="방식별 반복 횟수")
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, "r", encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = build_synthetic_fixture(args.rows)
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        print("=" * 80)
+        print("get_iframe_interactive_element 벤치마크")
+        print("=" * 80)
+
+        legacy = await measure("legacy", legacy_extract, page.main_frame, args.repeat)
+        current = await measure("evaluate", _extract_interactive_elements, page.main_frame, args.repeat)
+
+        print("-" * 80)
+        print(f"속도 향상: {legacy / current:.1f}배")
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
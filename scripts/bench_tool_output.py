@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+도구 결과 압축 벤치마크
+
+도구별로 LLM에 넘기는 결과의 토큰 수를 압축 전/후로 비교합니다.
+
+사용법:
+    python scripts/bench_tool_output.py                       # 합성 코퍼스 (menu.json, SAP 화면 흉내)
+    python scripts/bench_tool_output.py --corpus data/tool_outputs
+    python scripts/bench_tool_output.py --corpus 20250101.jsonl --show search_ssu_notice
+
+코퍼스는 TOOL_OUTPUT_CAPTURE_DIR를 지정하고 에이전트를 실행하면 쌓이는 JSONL 파일을 사용하면 됩니다.
+(개인정보가 포함되므로 저장소에는 올리지 마세요.)
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from statistics import median
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from apps.agent.tokens import count_text_tokens
+from apps.agent.tool_output import TOOL_TOKEN_BUDGETS, DEFAULT_TOOL_TOKEN_BUDGET, compact_tool_output
+
+MENU_FILE = Path(project_root) / "apps" / "agent" / "menu.json"
+
+
+def build_synthetic_corpus(rows: int) -> list:
+    """실제 화면 구조를 흉내 낸 도구별 샘플"""
+    corpus = []
+
+    with open(MENU_FILE, "r", encoding="utf-8") as f:
+        menu = json.dumps(json.load(f), ensure_ascii=False, indent=2)
+    corpus.append({"tool": "search_menu", "query": "장학금 수혜내역 보여줘", "content": menu})
+
+    elements = []
+    for i in range(rows):
+        elements.append(
+            f'[{i * 3}] <a id="WD{i:04X}A" href="#" class="lsLink urTxtStd" style="white-space:nowrap" '
+            f'ct="LN" lsdata="{{0:\'과목 {i}\'}}" tabindex="0">과목 {i}</a>'
+        )
+        elements.append(
+            f'[{i * 3 + 1}] <input id="WD{i:04X}I" type="text" value="{i % 5}" class="lsField lsField--text" '
+            f'style="width:100%" ct="I" autocomplete="off">'
+        )
+        elements.append(
+            f'[{i * 3 + 2}] <span role="button" id="WD{i:04X}B" class="lsButton urBtnStd" title="상세" '
+            f'ct="B" tabindex="0"><span class="lsButton__text">상세</span></span>'
+        )
+    corpus.append({"tool": "get_iframe_interactive_element", "query": "과목 42 상세 눌러줘", "content": "\n".join(elements)})
+
+    lines = ["SAP", "성적조회", "로딩 중...", "학년도     학기     과목명     학점     성적"]
+    for i in range(rows):
+        lines.append(f"2024     {1 + i % 2}학기     과목 {i}        3.0       {'A+ B0 C+'.split()[i % 3]}")
+        lines.append("")
+        if i % 10 == 0:
+            lines += ["도움말", "즐겨찾기에 추가", "Copyright SAP AG. All Rights Reserved."]
+    corpus.append({"tool": "get_iframe_text_content", "query": "과목 7 성적 알려줘", "content": "\n".join(lines)})
+
+    body = "숭실대학교 학사팀에서 안내드립니다. " * 40
+    notices = [
+        {
+            "document": body + f"2025학년도 {i + 1}학기 수강신청 일정은 다음과 같습니다. " + body,
+            "metadata": {"title": f"2025학년도 {i + 1}학기 수강신청 안내", "date": "2025-01-0" + str(i + 1), "category": "학사"},
+            "score": 0.9 - i * 0.1,
+        }
+        for i in range(3)
+    ]
+    corpus.append({"tool": "search_ssu_notice", "query": "수강신청 일정 알려줘", "content": json.dumps(notices, ensure_ascii=False)})
+    return corpus
+
+
+def load_corpus(path: str) -> list:
+    paths = sorted(Path(path).glob("*.jsonl")) if Path(path).is_dir() else [Path(path)]
+    corpus = []
+    for file in paths:
+        with open(file, "r", encoding="utf-8") as f:
+            corpus.extend(json.loads(line) for line in f if line.strip())
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도구 결과 압축 벤치마크")
+    parser.add_argument("--corpus", help="TOOL_OUTPUT_CAPTURE_DIR에 쌓인 JSONL 파일 또는 디렉터리")
+    parser.add_argument("--rows", type=int, default=200, help="합성 화면 행 수 (corpus 미지정 시)")
+    parser.add_argument("--show", help="이 도구의 첫 번째 샘플 압축 결과를 출력")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_synthetic_corpus(args.rows)
+
+    before = defaultdict(list)
+    after = defaultdict(list)
+    shown = False
+    for record in corpus:
+        tool_name = record["tool"]
+        content = record["content"]
+        compacted = compact_tool_output(tool_name, content, record.get("query"))
+        raw = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False, default=str)
+        before[tool_name].append(count_text_tokens(raw))
+        after[tool_name].append(count_text_tokens(compacted))
+
+        if args.show == tool_name and not shown:
+            print(compacted)
+            print()
+            shown = True
+
+    print("=" * 90)
+    print(f"도구 결과 압축 벤치마크 (샘플 {len(corpus)}개)")
+    print("=" * 90)
+    print(f"{'도구':<32} {'샘플':>5} {'예산':>6} {'압축 전(중앙값)':>14} {'압축 후(중앙값)':>14} {'감소':>7}")
+    print("-" * 90)
+    for tool_name in sorted(before):
+        total_before = sum(before[tool_name])
+        total_after = sum(after[tool_name])
+        reduction = 1 - total_after / total_before if total_before else 0
+        budget = TOOL_TOKEN_BUDGETS.get(tool_name, DEFAULT_TOOL_TOKEN_BUDGET)
+        print(
+            f"{tool_name:<32} {len(before[tool_name]):>5} {budget:>6} "
+            f"{median(before[tool_name]):>14.0f} {median(after[tool_name]):>14.0f} {reduction:>6.1%}"
+        )
+    print("-" * 90)
+    grand_before = sum(map(sum, before.values()))
+    grand_after = sum(map(sum, after.values()))
+    print(f"전체 토큰 {grand_before} -> {grand_after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ from apps.user_api.domain.chat_room.entity import ChatRoom
 from apps.user_api.domain.chat.entity import Chat
 from apps.user_api.domain.schedule.entity import Schedule
 from apps.user_api.domain.notification.entity import PushSubscription, NotificationHistory
+from apps.user_api.domain.academic_data.entity import AcademicData
+from apps.agent.checkpointer import CheckpointBase, get_checkpoint_engine
 
 def reset_database():
     """
@@ -49,11 +51,17 @@ def reset_database():
                 
                 # 트랜잭션 커밋
                 trans.commit()
-                print("DB 초기화 성공")
             except Exception:
                 # 오류 발생 시 롤백
                 trans.rollback()
                 raise
+
+        # 5. 대화 체크포인트 테이블 (로컬은 별도 SQLite 파일일 수 있어 따로 초기화)
+        print("대화 체크포인트 테이블 초기화 중...")
+        checkpoint_engine = get_checkpoint_engine()
+        CheckpointBase.metadata.drop_all(checkpoint_engine)
+        CheckpointBase.metadata.create_all(checkpoint_engine)
+        print("DB 초기화 성공")
     except Exception as e:
         print(f"DB 초기화 중 오류 발생: {e}")
 